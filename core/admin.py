@@ -2,11 +2,14 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.utils.translation import gettext_lazy as _
 
+from .admin_mixins import LargeTableAdminMixin
 from .models import User
 
-class CustomUserAdmin(UserAdmin):
+class CustomUserAdmin(LargeTableAdminMixin, UserAdmin):
     model = User
     list_display = ('email', 'first_name', 'last_name', 'role', 'is_staff', 'is_verified')
+    list_only = list_display
+    email_search_field = 'email'
     list_filter = ('role', 'is_staff', 'is_verified', 'is_active')
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
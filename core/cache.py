@@ -0,0 +1,147 @@
+"""
+Shared caching helpers: namespaced versions, single-flight recomputation
+and whole-page caching for anonymous visitors.
+
+Keys built with ``versioned_key`` embed the current version of every
+namespace they depend on. ``bump_namespace('wishes')`` moves the version
+on, so every dependent entry is missed at once and simply ages out; no
+key scanning, which the Redis and file backends could not do cheaply.
+"""
+import logging
+import time
+from functools import wraps
+
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.translation import get_language
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 60 * 5
+# How long a stale value may still be served while one worker recomputes it
+STALE_GRACE = 60
+LOCK_TIMEOUT = 10
+POLL_INTERVAL = 0.05
+
+
+def _version_key(namespace):
+    return f'ns:{namespace}:version'
+
+
+def namespace_versions(*namespaces):
+    """Return the current version of each namespace, creating missing ones."""
+    keys = {_version_key(namespace): namespace for namespace in namespaces}
+    found = cache.get_many(list(keys))
+    versions = {}
+    for key, namespace in keys.items():
+        if key not in found:
+            # Start from the clock so a version evicted from the cache is
+            # never reused, which could resurrect entries written under it.
+            cache.add(key, int(time.time() * 1000), None)
+            found[key] = cache.get(key)
+        versions[namespace] = found[key]
+    return [versions[namespace] for namespace in namespaces]
+
+
+def bump_namespace(*namespaces):
+    """Invalidate every key built on ``namespaces``."""
+    for namespace in namespaces:
+        try:
+            cache.incr(_version_key(namespace))
+        except ValueError:
+            cache.add(_version_key(namespace), int(time.time() * 1000), None)
+
+
+def versioned_key(name, namespaces=(), *parts):
+    """Build ``name:parts:v<versions>`` for an entry that depends on ``namespaces``."""
+    versions = '.'.join(str(version) for version in namespace_versions(*namespaces))
+    return ':'.join([name, *map(str, parts), f'v{versions}'])
+
+
+def _compute_locked(key, lock_key, compute, timeout, stale_grace):
+    try:
+        value = compute()
+        if value is not None:
+            cache.set(key, (time.time() + timeout, value), timeout + stale_grace)
+        return value
+    finally:
+        cache.delete(lock_key)
+
+
+def get_or_compute(key, compute, timeout=DEFAULT_TIMEOUT, stale_grace=STALE_GRACE, lock_timeout=LOCK_TIMEOUT):
+    """
+    Return the cached value for ``key``, computing it at most once at a time.
+
+    Entries carry a soft expiry. When it passes, the first caller to take
+    the lock recomputes while everyone else keeps getting the stale value;
+    when there is no value at all, the others wait for the winner instead
+    of all hitting the database. ``compute`` may return None to skip caching;
+    a waiter that sees the lock released with nothing stored takes the lock
+    and computes itself.
+    """
+    entry = cache.get(key)
+    if entry is not None and entry[0] > time.time():
+        return entry[1]
+
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, 1, lock_timeout):
+        return _compute_locked(key, lock_key, compute, timeout, stale_grace)
+
+    if entry is not None:
+        return entry[1]
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[1]
+        # The holder finished without storing a value, or its lock expired
+        if cache.add(lock_key, 1, lock_timeout):
+            return _compute_locked(key, lock_key, compute, timeout, stale_grace)
+    logger.warning('Timed out waiting for %s to be computed', key)
+    return compute()
+
+
+def cache_public_page(name, namespaces=(), timeout=DEFAULT_TIMEOUT):
+    """
+    Cache a view's rendered HTML for anonymous GET requests.
+
+    Requests with a query string, pending messages or a logged-in user
+    always reach the view, as do responses that set cookies or use a CSRF
+    token. Use with ``method_decorator(..., name='dispatch')`` on classes.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if (
+                request.method not in ('GET', 'HEAD')
+                or request.GET
+                or request.user.is_authenticated
+                or get_messages(request)
+            ):
+                return view(request, *args, **kwargs)
+
+            rendered = {}
+
+            def render():
+                response = view(request, *args, **kwargs)
+                if hasattr(response, 'render'):
+                    response.render()
+                rendered['response'] = response
+                if (
+                    response.status_code != 200
+                    or response.cookies
+                    or request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+                ):
+                    return None
+                return response.content, response['Content-Type']
+
+            key = versioned_key(f'page:{name}', namespaces, get_language())
+            cached = get_or_compute(key, render, timeout)
+            if 'response' in rendered:
+                return rendered['response']
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+        return wrapped
+    return decorator
@@ -1,8 +1,81 @@
+import functools
+
 from django import forms
+from django.forms.utils import flatatt
+from django.urls import reverse
+from django.utils.choices import BaseChoiceIterator
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language, override
 import pycountry
 from cities_light.models import Country, City
 from django.utils.translation import gettext_lazy as _
 
+COUNTRY_OPTION_ATTRS = {
+    'class': 'bg-background/50 text-white hover:bg-background/70',
+    'style': 'background-color: #012A34; color: white; padding: 0.5rem 1rem;'
+}
+
+
+@functools.lru_cache(maxsize=None)
+def get_country_list():
+    """Return (country_code, country_name) pairs sorted by name, built once per process."""
+    return tuple(sorted(
+        ((country.alpha_2, country.name) for country in pycountry.countries),
+        key=lambda x: x[1]
+    ))
+
+
+@functools.lru_cache(maxsize=None)
+def get_country_codes():
+    """Return the set of valid country codes."""
+    return frozenset(code for code, _name in get_country_list())
+
+
+@functools.lru_cache(maxsize=None)
+def _rendered_country_options(language):
+    """
+    Return the pre-rendered <option> tags for ``language``.
+
+    The result is a tuple of (unselected_html, selected_html) pairs in
+    display order plus a dict mapping each value to its position.
+    """
+    with override(language):
+        placeholder = str(_("Select a country"))
+    options = [(
+        format_html('<option value="">{}</option>', placeholder),
+        format_html('<option value="" selected>{}</option>', placeholder),
+    )]
+    positions = {'': 0}
+    attrs = flatatt(COUNTRY_OPTION_ATTRS)
+    for code, name in get_country_list():
+        positions[code] = len(options)
+        options.append((
+            format_html('<option value="{}"{}>{}</option>', code, attrs, name),
+            format_html('<option value="{}"{} selected>{}</option>', code, attrs, name),
+        ))
+    return tuple(options), positions
+
+
+class CountryChoices(BaseChoiceIterator):
+    """
+    Shared, immutable country choices.
+
+    Django deep-copies a field's choices for every form instance; this
+    iterator is returned as-is so the ~250 tuples are built only once.
+    """
+
+    def __iter__(self):
+        yield ("", _("Select a country"))
+        yield from get_country_list()
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+COUNTRY_CHOICES = CountryChoices()
+
+
 class CountrySelectWidget(forms.Select):
     """Widget for country selection with theme styling."""
     def __init__(self, attrs=None, choices=()):
@@ -14,18 +87,26 @@ class CountrySelectWidget(forms.Select):
             default_attrs.update(attrs)
         super().__init__(attrs=default_attrs, choices=choices)
 
+    def render(self, name, value, attrs=None, renderer=None):
+        if not isinstance(self.choices, CountryChoices):
+            return super().render(name, value, attrs, renderer)
+        # Fast path: splice the selected option into the cached option list
+        # instead of rendering ~250 option templates.
+        options, positions = _rendered_country_options(get_language())
+        values = self.format_value(value)
+        selected = positions.get(values[0] if values else '')
+        final_attrs = self.build_attrs(self.attrs, attrs)
+        parts = [format_html('<select name="{}"{}>', name, flatatt(final_attrs))]
+        for position, (html, selected_html) in enumerate(options):
+            parts.append(selected_html if position == selected else html)
+        parts.append('</select>')
+        return mark_safe('\n'.join(parts))
+
     def create_option(self, name, value, *args, **kwargs):
         option = super().create_option(name, value, *args, **kwargs)
         if value:
-            try:
-                country = pycountry.countries.get(alpha_2=value)
-                option['label'] = country.name
-                option['attrs'] = {
-                    'class': 'bg-background/50 text-white hover:bg-background/70',
-                    'style': 'background-color: #012A34; color: white; padding: 0.5rem 1rem;'
-                }
-            except (KeyError, AttributeError):
-                option['attrs'] = {'class': 'bg-background/50 text-white'}
+            # Keep Django's own attrs, such as selected
+            option['attrs'].update(COUNTRY_OPTION_ATTRS)
         return option
 
 class CountryField(forms.ChoiceField):
@@ -37,14 +118,48 @@ class CountryField(forms.ChoiceField):
         self.choices = self._get_country_choices()
 
     def _get_country_choices(self):
-        """Return a list of tuples of (country_code, country_name) sorted by name."""
-        countries = [(country.alpha_2, country.name) 
-                    for country in pycountry.countries]
-        return [("", _("Select a country"))] + sorted(countries, key=lambda x: x[1])
+        """Return the shared choices of (country_code, country_name) sorted by name."""
+        return COUNTRY_CHOICES
+
+    def valid_value(self, value):
+        return value in get_country_codes()
+
+def format_city_label(name, region_name, country_name):
+    """Format a city as "City, Region, Country"."""
+    return f"{name}, {region_name or 'N/A'}, {country_name}"
+
+
+class CitySelectWidget(forms.Select):
+    """
+    City select that only renders the placeholder and the chosen city.
+
+    The full list for a country is loaded in the browser from the
+    ``core:get_cities`` endpoint named in ``data-cities-url``.
+    """
+
+    def get_context(self, name, value, attrs):
+        attrs = {'data-cities-url': reverse('core:get_cities'), **(attrs or {})}
+        return super().get_context(name, value, attrs)
+
+    def optgroups(self, name, value, attrs=None):
+        city_id = value[0] if value else ''
+        choices = list(self.choices)
+        if city_id and str(city_id).isdigit():
+            city = City.objects.filter(pk=city_id).values_list(
+                'name', 'region__name', 'country__name'
+            ).first()
+            if city:
+                choices.append((city_id, format_city_label(*city)))
+        original, self.choices = self.choices, choices
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = original
+
 
 class CityField(forms.ChoiceField):
     """A form field for selecting a city, filtered by country."""
-    widget = forms.Select(attrs={
+    widget = CitySelectWidget(attrs={
         'class': 'block w-full px-4 py-3 text-sm bg-background/50 border border-border/50 rounded-lg text-white focus:ring-2 focus:ring-primary/50 focus:border-primary',
         'style': 'appearance: none; background-image: url("data:image/svg+xml,%3csvg xmlns=\'http://www.w3.org/2000/svg\' fill=\'none\' viewBox=\'0 0 20 20\'%3e%3cpath stroke=\'%23E5E7EB\' stroke-linecap=\'round\' stroke-linejoin=\'round\' stroke-width=\'1.5\' d=\'M6 8l4 4 4-4\'/%3e%3c/svg%3e"); background-repeat: no-repeat; background-position: right 0.75rem center; background-size: 1.25em 1.25em;',
         'disabled': 'disabled'
@@ -53,26 +168,31 @@ class CityField(forms.ChoiceField):
     def __init__(self, *args, **kwargs):
         country_code = kwargs.pop('country_code', None)
         super().__init__(*args, **kwargs)
-        self.country_code = country_code
-        self.choices = self._get_city_choices()
+        self.set_country(country_code)
 
     def _get_city_choices(self):
-        """Return a list of tuples of (city_id, city_name) for the selected country."""
+        """
+        Return the placeholder choice only.
+
+        Cities are not materialised here: the widget fetches them over AJAX
+        and valid_value() checks a submitted id with a keyed lookup.
+        """
         if not self.country_code:
             return [("", _("Select a country first"))]
-            
-        cities = City.objects.filter(country__code2=self.country_code)\
-                           .order_by('name')\
-                           .values_list('id', 'name', 'region__name', 'country__name')
-        
-        # Format as (id, "City, Region, Country")
-        return [("", _("Select a city"))] + [
-            (city[0], f"{city[1]}, {city[2] or 'N/A'}, {city[3]}")
-            for city in cities
-        ]
+        return [("", _("Select a city"))]
 
     def set_country(self, country_code):
         """Update the choices based on the selected country."""
         self.country_code = country_code
         self.choices = self._get_city_choices()
-        self.widget.attrs['disabled'] = 'disabled' if not country_code else ''
+        self.widget.attrs['data-country-code'] = country_code or ''
+        if country_code:
+            self.widget.attrs.pop('disabled', None)
+        else:
+            self.widget.attrs['disabled'] = 'disabled'
+
+    def valid_value(self, value):
+        """Check that the city exists in the selected country with one indexed lookup."""
+        if not self.country_code or not str(value).isdigit():
+            return False
+        return City.objects.filter(pk=value, country__code2=self.country_code).exists()
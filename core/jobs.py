@@ -0,0 +1,14 @@
+"""
+Image derivatives, generated by the job worker rather than in the request
+that uploaded the image.
+
+``generate_thumbnails`` only writes missing files, so reruns are cheap.
+"""
+from core.services.thumbnails import generate_derivatives
+from jobs.registry import job
+
+
+@job('core.generate_thumbnails', max_attempts=3)
+def generate_thumbnails(image_name):
+    """Write the thumbnails of the stored image ``image_name``."""
+    generate_derivatives(image_name)
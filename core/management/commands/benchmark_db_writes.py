@@ -0,0 +1,126 @@
+import multiprocessing
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, close_old_connections, connection, connections
+
+from core.models import User
+from donations.models import Donation
+from donations.services.grants import grant_wish
+from jobs.models import Job
+from wishchain.database import PROFILES, profile_settings
+from wishes.models import Wish
+from wishes.services.stats import rebuild_counter
+
+# Connection settings a profile may change; cleared before applying one
+PROFILE_KEYS = ('OPTIONS', 'CONN_MAX_AGE', 'CONN_HEALTH_CHECKS')
+
+
+def grant_all(wish_ids, donor_pk):
+    """Run in a worker process: grant each wish as one request would."""
+    donor = User.objects.get(pk=donor_pk)
+    latencies, locked = [], 0
+    for wish_id in wish_ids:
+        started = time.perf_counter()
+        try:
+            grant_wish(wish_id, donor)
+        except OperationalError as exc:
+            if 'locked' not in str(exc):
+                raise
+            locked += 1
+        else:
+            latencies.append(time.perf_counter() - started)
+        # End of "request": closes the connection unless it is persistent
+        close_old_connections()
+    connections.close_all()
+    return latencies, locked
+
+
+class Command(BaseCommand):
+    help = 'Measure concurrent grant throughput (writes/s) under each database profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help='Worker processes writing at once')
+        parser.add_argument('--writes', type=int, default=200, help='Grants per worker')
+        parser.add_argument('--profile', action='append', dest='profiles', choices=PROFILES,
+                            help='Profile to measure; repeat for several (default: all)')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            raise CommandError(f'No database profiles for {connection.vendor}')
+        self.stdout.write(self.style.WARNING(
+            f'Seeding and granting wishes in {connection.settings_dict["NAME"]}; '
+            'everything is deleted again afterwards. Do not run this against production.'
+        ))
+        original = {key: connection.settings_dict.get(key) for key in PROFILE_KEYS}
+        journal_mode = self.journal_mode() if connection.vendor == 'sqlite' else None
+        tag = uuid.uuid4().hex[:8]
+        try:
+            for profile in options['profiles'] or PROFILES:
+                self.run_profile(profile, tag, options)
+        finally:
+            self.use_settings(original)
+            self.cleanup(tag, journal_mode)
+
+    def run_profile(self, profile, tag, options):
+        wisher = User.objects.create_user(email=f'bench-{tag}-{profile}-wisher@example.com', password=None)
+        donors = [
+            User.objects.create_user(email=f'bench-{tag}-{profile}-{i}@example.com', password=None)
+            for i in range(options['workers'])
+        ]
+        wishes = Wish.objects.bulk_create(
+            Wish(title=f'Bench wish {i}', description='Benchmark', user=wisher)
+            for i in range(options['workers'] * options['writes'])
+        )
+        ids = [wish.pk for wish in wishes]
+        slices = [(ids[i::options['workers']], donor.pk) for i, donor in enumerate(donors)]
+
+        settings = profile_settings(connection.vendor, profile)
+        if connection.vendor == 'sqlite' and profile == 'development':
+            # WAL is stored in the file; undo an earlier production run
+            settings = {'OPTIONS': {'init_command': 'PRAGMA journal_mode=DELETE'}}
+        self.use_settings(settings)
+
+        # Children must open their own connections
+        connections.close_all()
+        started = time.perf_counter()
+        with multiprocessing.get_context('fork').Pool(options['workers']) as pool:
+            results = pool.starmap(grant_all, slices)
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for worker_latencies, _ in results for latency in worker_latencies)
+        locked = sum(count for _, count in results)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000 if latencies else 0
+        p50 = statistics.median(latencies) * 1000 if latencies else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'{profile:<12} {options["workers"]} workers  {len(latencies):>6} grants  {locked:>5} locked  '
+            f'{len(latencies) / elapsed:8.1f} writes/s  p50 {p50:7.2f} ms  p99 {p99:7.2f} ms'
+        ))
+
+    def use_settings(self, settings):
+        for key in PROFILE_KEYS:
+            connection.settings_dict.pop(key, None)
+        connection.settings_dict.update({'OPTIONS': {}, 'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False})
+        connection.settings_dict.update({key: value for key, value in settings.items() if value is not None})
+        connection.close()
+
+    def journal_mode(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            return cursor.fetchone()[0]
+
+    def cleanup(self, tag, journal_mode):
+        users = User.objects.filter(email__startswith=f'bench-{tag}-')
+        donation_ids = list(Donation.objects.filter(donor__in=users).values_list('pk', flat=True))
+        Job.objects.filter(
+            key__in=[f'{prefix}:{pk}' for pk in donation_ids for prefix in ('record-donation', 'notify-wisher')]
+        ).delete()
+        users.delete()
+        # The seeded wishes bypassed the counters, so recount
+        rebuild_counter()
+        if journal_mode:
+            with connection.cursor() as cursor:
+                cursor.execute(f'PRAGMA journal_mode={journal_mode}')
+        self.stdout.write('Benchmark data deleted.')
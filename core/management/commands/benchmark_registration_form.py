@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.urls import reverse
+
+from core.forms import DonorRegistrationForm, WisherRegistrationForm
+from core.views import DonorRegisterView
+
+
+class Command(BaseCommand):
+    help = 'Time construction and rendering of the registration forms'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200, help='Iterations per measurement')
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        invalid_post = {'email': 'not-an-email', 'country': 'FR', 'full_name': 'Ada'}
+        view = DonorRegisterView.as_view()
+        factory = RequestFactory()
+
+        def render_get():
+            request = factory.get(reverse('core:register_donor'))
+            request.user = None
+            view(request).render()
+
+        measurements = [
+            ('construct donor form', lambda: DonorRegistrationForm()),
+            ('render country field', lambda: str(DonorRegistrationForm()['country'])),
+            ('render wisher form', lambda: str(WisherRegistrationForm())),
+            ('re-render failed POST', lambda: str(DonorRegistrationForm(data=invalid_post)['country'])),
+            ('GET /register/donor/', render_get),
+        ]
+        for label, func in measurements:
+            func()
+            started = time.perf_counter()
+            for _ in range(repeat):
+                func()
+            elapsed_ms = (time.perf_counter() - started) * 1000 / repeat
+            self.stdout.write(self.style.SUCCESS(f'{label:<24} {elapsed_ms:8.3f} ms'))
@@ -0,0 +1,36 @@
+import shutil
+import subprocess
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+SOURCE = 'assets/css/app.css'
+OUTPUT = 'static/dist/app.css'
+
+
+class Command(BaseCommand):
+    help = 'Build the purged Tailwind stylesheet (static/dist/app.css), optionally then collectstatic'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--watch', action='store_true', help='Rebuild on template changes (development)')
+        parser.add_argument('--collect', action='store_true',
+                            help='Run collectstatic afterwards: hashed names and .gz/.br copies with STATIC_MANIFEST=1')
+
+    def handle(self, *args, **options):
+        npx = shutil.which('npx')
+        if npx is None:
+            raise CommandError('npx not found; install Node.js, then run `npm install` in the project root')
+        command = [npx, '--no-install', 'tailwindcss', '-c', 'tailwind.config.js', '-i', SOURCE, '-o', OUTPUT]
+        command.append('--watch' if options['watch'] else '--minify')
+        self.stdout.write(' '.join(command[1:]))
+        try:
+            subprocess.run(command, cwd=settings.BASE_DIR, check=True)
+        except subprocess.CalledProcessError as exc:
+            raise CommandError(f'Tailwind build failed (exit {exc.returncode}); did you run `npm install`?')
+        except KeyboardInterrupt:
+            return
+        size = (settings.BASE_DIR / OUTPUT).stat().st_size
+        self.stdout.write(self.style.SUCCESS(f'{OUTPUT}: {size / 1024:.1f} KB'))
+        if options['collect']:
+            call_command('collectstatic', interactive=False, verbosity=options['verbosity'])
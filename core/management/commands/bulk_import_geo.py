@@ -0,0 +1,61 @@
+import os
+
+from cities_light.settings import DATA_DIR
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.cities import invalidate_city_cache
+from core.services.geo_import import DEFAULT_CHUNK_SIZE, GeoImporter, open_dump
+
+# (table, importer method, candidate dump files) in dependency order
+STEPS = [
+    ('countries', 'import_countries', ['countryInfo.txt']),
+    ('regions', 'import_regions', ['admin1CodesASCII.txt']),
+    ('subregions', 'import_subregions', ['admin2Codes.txt']),
+    ('cities', 'import_cities', ['cities15000.zip', 'cities15000.txt', 'cities5000.zip', 'cities5000.txt',
+                                 'cities1000.zip', 'cities1000.txt', 'cities500.zip', 'cities500.txt',
+                                 'allCountries.zip', 'allCountries.txt']),
+]
+
+
+class Command(BaseCommand):
+    help = 'Stream local GeoNames dumps into cities_light with chunked bulk writes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--data-dir', default=DATA_DIR, help='Directory holding the GeoNames dumps')
+        parser.add_argument('--cities-file', help='Cities dump to use instead of the first one found')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows per bulk write')
+        parser.add_argument('--only', choices=[name for name, _, _ in STEPS], action='append',
+                            help='Import only these tables (repeatable)')
+        parser.add_argument('--full', action='store_true',
+                            help='Rewrite every existing row instead of only the changed ones')
+
+    def handle(self, *args, **options):
+        data_dir = options['data_dir']
+        if not data_dir or not os.path.isdir(data_dir):
+            raise CommandError(f'Data directory not found: {data_dir}')
+
+        importer = GeoImporter(
+            chunk_size=max(options['chunk_size'], 1),
+            incremental=not options['full'],
+            progress=lambda stats: self.stdout.write(f'  {stats}', ending='\r'),
+        )
+        only = options['only']
+        for name, method, candidates in STEPS:
+            if only and name not in only:
+                continue
+            if name == 'cities' and options['cities_file']:
+                candidates = [options['cities_file']]
+            path = next(
+                (os.path.join(data_dir, candidate) for candidate in candidates
+                 if os.path.exists(os.path.join(data_dir, candidate))),
+                None,
+            )
+            if path is None:
+                self.stdout.write(self.style.WARNING(f'No {name} dump in {data_dir}, skipping'))
+                continue
+            self.stdout.write(f'Importing {name} from {path}')
+            with open_dump(path) as lines:
+                stats = getattr(importer, method)(lines)
+            self.stdout.write(self.style.SUCCESS(str(stats)))
+        # Bulk writes send no model signals, so drop the city cache here.
+        invalidate_city_cache()
@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.models import User
+from core.services.thumbnails import generate_derivatives, queue_derivatives
+from partners.models import Partner
+
+
+def image_names():
+    """Every distinct stored profile image and partner logo."""
+    names = set()
+    for queryset, field in ((User.objects, 'profile_image'), (Partner.objects, 'logo')):
+        names.update(queryset.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+                     .values_list(field, flat=True).distinct().iterator())
+    return sorted(names)
+
+
+class Command(BaseCommand):
+    help = 'Generate missing thumbnails of profile images and partner logos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate thumbnails that already exist')
+        parser.add_argument('--enqueue', action='store_true', help='Queue a job per image instead of working inline')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        names = image_names()
+        if options['enqueue']:
+            for name in names:
+                queue_derivatives(name)
+            self.stdout.write(self.style.SUCCESS(f'Queued thumbnails for {len(names)} images'))
+            return
+        written = failed = 0
+        for name in names:
+            try:
+                written += generate_derivatives(name, force=options['force'])
+            except (OSError, ValueError) as exc:
+                failed += 1
+                self.stderr.write(f'{name}: {exc}')
+        self.stdout.write(self.style.SUCCESS(
+            f'{written} thumbnails written for {len(names)} images in {time.perf_counter() - started:.2f}s'
+            + (f', {failed} failed' if failed else '')
+        ))
@@ -2,6 +2,7 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 from cities_light.models import Country, City
 from cities_light.management.commands.cities_light import Command as CitiesLightCommand
+from core.services.cities import deferred_invalidation, invalidate_city_cache
 
 class Command(BaseCommand):
     help = 'Import cities_light data with progress and error handling'
@@ -11,7 +12,9 @@ class Command(BaseCommand):
         
         # Import data using cities_light's command
         cmd = CitiesLightCommand()
-        cmd.handle(**{**options, 'force_import': True, 'progress': True})
+        with deferred_invalidation():
+            cmd.handle(**{**options, 'force_import': True, 'progress': True})
+        invalidate_city_cache()
         
         # Verify the import
         country_count = Country.objects.count()
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from core.services.cities import deferred_invalidation
 from cities_light.models import Country
 
 class Command(BaseCommand):
@@ -15,7 +16,7 @@ class Command(BaseCommand):
             {'name': 'France', 'code2': 'FR', 'code3': 'FRA'},
         ]
 
-        with transaction.atomic():
+        with deferred_invalidation(), transaction.atomic():
             for country_data in countries:
                 country, created = Country.objects.get_or_create(
                     code2=country_data['code2'],
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from core.services.cities import deferred_invalidation
 from cities_light.models import Country, City
 
 class Command(BaseCommand):
@@ -15,7 +16,7 @@ class Command(BaseCommand):
             'FR': ['Paris', 'Marseille', 'Lyon', 'Toulouse', 'Nice']
         }
 
-        with transaction.atomic():
+        with deferred_invalidation(), transaction.atomic():
             for country_code, cities in country_cities.items():
                 try:
                     country = Country.objects.get(code2=country_code)
@@ -0,0 +1,201 @@
+"""
+Compare the read-only JSON endpoints across running servers.
+
+Start the same code under both servers, then point this command at them::
+
+    gunicorn wishchain.wsgi -w 4 -b 127.0.0.1:8000
+    uvicorn wishchain.asgi:application --workers 4 --port 8001
+    python manage.py load_test --login donor@example.com
+
+Each target gets the same closed-loop load: ``--concurrency`` keep-alive
+connections issuing requests back to back for ``--duration`` seconds per
+endpoint. ``--slow-clients`` adds connections that dribble their request
+headers out, which is what ties up sync workers.
+"""
+import asyncio
+import time
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from core.models import User
+
+DEFAULT_TARGETS = ['wsgi=http://127.0.0.1:8000', 'asgi=http://127.0.0.1:8001']
+
+
+class Result:
+    """Latencies (seconds) and failures for one endpoint on one target."""
+
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.seconds = 0.0
+
+    @property
+    def rate(self):
+        return len(self.latencies) / self.seconds if self.seconds else 0
+
+    def percentile(self, percentile):
+        if not self.latencies:
+            return 0.0
+        values = sorted(self.latencies)
+        return values[min(len(values) - 1, int(len(values) * percentile / 100))] * 1000
+
+
+class Connection:
+    """A minimal HTTP/1.1 keep-alive client; enough for JSON GETs."""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def get(self, path, headers):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f'GET {path} HTTP/1.1', f'Host: {self.host}:{self.port}', *headers, '', '']
+        self.writer.write('\r\n'.join(lines).encode())
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError('Server closed the connection')
+        status = int(status_line.split()[1])
+        length, chunked, close = None, False, False
+        while True:
+            line = (await self.reader.readline()).decode('latin-1').strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            name, value = name.lower(), value.strip().lower()
+            if name == 'content-length':
+                length = int(value)
+            elif name == 'transfer-encoding':
+                chunked = 'chunked' in value
+            elif name == 'connection':
+                close = value == 'close'
+
+        if chunked:
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                await self.reader.readexactly(size + 2)
+                if not size:
+                    break
+        elif length is not None:
+            await self.reader.readexactly(length)
+        else:
+            await self.reader.read()
+            close = True
+        if close:
+            self.close()
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class Command(BaseCommand):
+    help = 'Load-test the wish feed and city endpoints on WSGI and ASGI servers: requests/s and p99'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target', action='append', dest='targets', metavar='NAME=URL',
+            help=f'Server to test; repeat for each (default: {" ".join(DEFAULT_TARGETS)})',
+        )
+        parser.add_argument('--concurrency', type=int, default=50, help='Concurrent connections per endpoint')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds of load per endpoint')
+        parser.add_argument('--slow-clients', type=int, default=0, help='Extra connections that send headers slowly')
+        parser.add_argument('--country', default='FR', help='Country code for the city endpoint')
+        parser.add_argument('--login', metavar='EMAIL', help='Donor to sign the feed requests in as')
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options['targets'] or DEFAULT_TARGETS:
+            name, _, url = target.partition('=')
+            parts = urlsplit(url)
+            if not url or parts.scheme != 'http':
+                raise CommandError(f'Expected NAME=http://host:port, got {target!r}')
+            targets.append((name, parts.hostname, parts.port or 80))
+
+        headers = ['Accept: application/json']
+        endpoints = [('cities', reverse('core:get_cities') + '?' + urlencode({'country_code': options['country']}))]
+        if options['login']:
+            headers.append(f'Cookie: {settings.SESSION_COOKIE_NAME}={self.session_for(options["login"])}')
+            endpoints.append(('feed', reverse('donations:donate_feed') + '?limit=24'))
+        else:
+            self.stdout.write('No --login given: skipping the feed, which needs a signed-in donor.')
+
+        self.stdout.write(f'{"target":<8} {"endpoint":<8} {"requests":>9} {"errors":>7} '
+                          f'{"req/s":>9} {"p50 ms":>9} {"p99 ms":>9}')
+        for name, host, port in targets:
+            for label, path in endpoints:
+                result = asyncio.run(self.run_load(host, port, path, headers, options))
+                self.stdout.write(self.style.SUCCESS(
+                    f'{name:<8} {label:<8} {len(result.latencies):>9} {result.errors:>7} '
+                    f'{result.rate:>9.1f} {result.percentile(50):>9.2f} {result.percentile(99):>9.2f}'
+                ))
+
+    def session_for(self, email):
+        """Create a session for ``email`` shared by both servers through the database."""
+        try:
+            user = User.objects.get(email=email)
+        except User.DoesNotExist:
+            raise CommandError(f'No user with email {email}')
+        session = SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = 'django.contrib.auth.backends.ModelBackend'
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.create()
+        return session.session_key
+
+    async def run_load(self, host, port, path, headers, options):
+        result = Result()
+        deadline = time.monotonic() + options['duration']
+
+        async def client():
+            connection = Connection(host, port)
+            try:
+                while time.monotonic() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        status = await connection.get(path, headers)
+                    except (OSError, ConnectionError, ValueError, asyncio.IncompleteReadError):
+                        connection.close()
+                        result.errors += 1
+                        await asyncio.sleep(0.01)
+                        continue
+                    if status == 200:
+                        result.latencies.append(time.perf_counter() - started)
+                    else:
+                        result.errors += 1
+            finally:
+                connection.close()
+
+        async def slow_client():
+            # Hold a connection open by sending the request a header at a time
+            while time.monotonic() < deadline:
+                try:
+                    reader, writer = await asyncio.open_connection(host, port)
+                    for line in [f'GET {path} HTTP/1.1', f'Host: {host}:{port}', *headers, 'X-Slow: 1']:
+                        writer.write(f'{line}\r\n'.encode())
+                        await writer.drain()
+                        await asyncio.sleep(1)
+                    writer.write(b'Connection: close\r\n\r\n')
+                    await reader.read()
+                    writer.close()
+                except OSError:
+                    await asyncio.sleep(0.1)
+
+        slow = [asyncio.create_task(slow_client()) for _ in range(options['slow_clients'])]
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(options['concurrency'])))
+        result.seconds = time.perf_counter() - started
+        for task in slow:
+            task.cancel()
+        await asyncio.gather(*slow, return_exceptions=True)
+        return result
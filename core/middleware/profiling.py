@@ -0,0 +1,216 @@
+"""
+Per-request SQL, template and wall-time profiling.
+
+``ProfilingMiddleware`` counts queries and times template rendering and
+wall time for the request in a context variable, and keeps a rolling
+window of samples per URL name in ``profile_store``. Views can
+declare a query budget with ``@query_budget(n)`` (or ``QUERY_BUDGETS`` in
+settings); exceeding it raises ``QueryBudgetExceeded`` when
+QUERY_BUDGET_RAISE is on, as it is for the test suite, and logs a
+warning otherwise.
+"""
+import logging
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.utils import CursorWrapper
+from django.template.backends.django import Template
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 200
+PERCENTILES = (50, 95, 99)
+
+_current = ContextVar('request_profile', default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view ran more SQL queries than its declared budget."""
+
+
+def query_budget(max_queries):
+    """
+    Declare the most queries a view may run per request.
+
+    Works on function views and on class-based views (decorate the class).
+    """
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+
+class RequestProfile:
+    """Costs accumulated while serving one request."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.wall_time = 0.0
+        self._template_depth = 0
+
+    def server_timing(self):
+        return ', '.join([
+            f'db;dur={self.sql_time * 1000:.1f};desc="{self.queries} queries"',
+            f'tpl;dur={self.template_time * 1000:.1f}',
+            f'total;dur={self.wall_time * 1000:.1f}',
+        ])
+
+
+class ProfileStore:
+    """Rolling window of request profiles per URL name."""
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def add(self, url_name, profile):
+        with self._lock:
+            self._samples[url_name].append(
+                (profile.wall_time, profile.sql_time, profile.template_time, profile.queries)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self):
+        """Return ``{url_name: {'count', 'wall_p95', 'queries_p50', ...}}`` (times in ms)."""
+        with self._lock:
+            samples = {name: list(rows) for name, rows in self._samples.items()}
+        summary = {}
+        for name, rows in samples.items():
+            stats = {'count': len(rows)}
+            for index, metric in enumerate(('wall', 'sql', 'template', 'queries')):
+                values = sorted(row[index] for row in rows)
+                for percentile in PERCENTILES:
+                    # Nearest-rank percentile
+                    value = values[max(0, math.ceil(len(values) * percentile / 100) - 1)]
+                    stats[f'{metric}_p{percentile}'] = value if metric == 'queries' else round(value * 1000, 2)
+            summary[name] = stats
+        return summary
+
+
+profile_store = ProfileStore(getattr(settings, 'PROFILING_WINDOW', DEFAULT_WINDOW))
+
+
+def _instrument_templates():
+    """Time top-level template renders for the active request profile."""
+    if getattr(Template.render, 'profiled', False):
+        return
+    render = Template.render
+
+    def profiled_render(self, *args, **kwargs):
+        profile = _current.get()
+        if profile is None or profile._template_depth:
+            return render(self, *args, **kwargs)
+        profile._template_depth += 1
+        started = time.perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            profile.template_time += time.perf_counter() - started
+            profile._template_depth -= 1
+
+    profiled_render.profiled = True
+    Template.render = profiled_render
+
+
+def _instrument_queries():
+    """Count and time queries for the active request profile, on any thread."""
+    if getattr(CursorWrapper.execute, 'profiled', False):
+        return
+
+    def instrument(method):
+        def profiled(self, *args, **kwargs):
+            profile = _current.get()
+            if profile is None:
+                return method(self, *args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                profile.sql_time += time.perf_counter() - started
+                profile.queries += 1
+
+        profiled.profiled = True
+        return profiled
+
+    # CursorDebugWrapper calls these through super(), so each query counts once
+    CursorWrapper.execute = instrument(CursorWrapper.execute)
+    CursorWrapper.executemany = instrument(CursorWrapper.executemany)
+
+
+def get_budget(resolver_match):
+    if resolver_match is None:
+        return None
+    budgets = getattr(settings, 'QUERY_BUDGETS', {})
+    if resolver_match.view_name in budgets:
+        return budgets[resolver_match.view_name]
+    func = resolver_match.func
+    budget = getattr(func, 'query_budget', None)
+    if budget is None:
+        budget = getattr(getattr(func, 'view_class', None), 'query_budget', None)
+    return budget
+
+
+class ProfilingMiddleware:
+    """Record query count, SQL time, template time and wall time per URL name."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.server_timing = getattr(settings, 'PROFILING_SERVER_TIMING', settings.DEBUG)
+        _instrument_queries()
+        _instrument_templates()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        profile = RequestProfile()
+        token = _current.set(profile)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            profile.wall_time = time.perf_counter() - started
+            _current.reset(token)
+        return self.process_profile(request, response, profile)
+
+    async def __acall__(self, request):
+        profile = RequestProfile()
+        token = _current.set(profile)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            profile.wall_time = time.perf_counter() - started
+            _current.reset(token)
+        return self.process_profile(request, response, profile)
+
+    def process_profile(self, request, response, profile):
+        resolver_match = getattr(request, 'resolver_match', None)
+        url_name = resolver_match.view_name if resolver_match else 'unresolved'
+        profile_store.add(url_name, profile)
+        request.profile = profile
+        if self.server_timing:
+            response['Server-Timing'] = profile.server_timing()
+
+        budget = get_budget(resolver_match)
+        if budget is not None and profile.queries > budget:
+            message = f'{url_name} ran {profile.queries} queries, budget is {budget}'
+            if getattr(settings, 'QUERY_BUDGET_RAISE', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
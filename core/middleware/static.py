@@ -0,0 +1,114 @@
+"""
+Serve collected static files from STATIC_ROOT, ahead of the URL resolver.
+
+Names from the staticfiles manifest carry a content hash, so they are sent
+with a one-year ``immutable`` Cache-Control and browsers never revalidate
+them; anything else (an unhashed name, or a tree collected without the
+manifest storage) gets STATIC_MAX_AGE. A client that accepts brotli or
+gzip is sent the ``.br``/``.gz`` copy written at collectstatic time, never
+compressed per request. Responses stream the file.
+
+Under ``runserver`` with DEBUG, the staticfiles app serves STATIC_URL
+first and this middleware never sees those requests.
+"""
+import mimetypes
+import os
+import re
+from functools import cached_property
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestFilesMixin, staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_etags, quote_etag
+
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+DEFAULT_MAX_AGE = 60
+# Preferred first
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+
+def accepted_encodings(header):
+    """The content codings ``header`` (Accept-Encoding) allows, ignoring q=0."""
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        if coding and not re.search(r'q\s*=\s*0(\.0*)?\s*$', params):
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class StaticFilesMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.STATIC_ROOT or not settings.STATIC_URL:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.root = os.fspath(settings.STATIC_ROOT)
+        self.prefix = settings.STATIC_URL if settings.STATIC_URL.startswith('/') else f'/{settings.STATIC_URL}'
+        self.max_age = getattr(settings, 'STATIC_MAX_AGE', DEFAULT_MAX_AGE)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.serve(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        # serve() only stats files; the body is streamed by the server
+        return self.serve(request) or await self.get_response(request)
+
+    @cached_property
+    def immutable_names(self):
+        """Hashed names from the manifest, read once per process."""
+        if not isinstance(staticfiles_storage, ManifestFilesMixin):
+            return frozenset()
+        return frozenset(staticfiles_storage.hashed_files.values())
+
+    def serve(self, request):
+        """The response for a static file, or None to let the request through."""
+        if request.method not in ('GET', 'HEAD') or not request.path.startswith(self.prefix):
+            return None
+        name = request.path[len(self.prefix):]
+        try:
+            path = safe_join(self.root, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+
+        headers = {
+            'Cache-Control': (
+                f'public, max-age={IMMUTABLE_MAX_AGE}, immutable' if name in self.immutable_names
+                else f'public, max-age={self.max_age}'
+            ),
+            'Vary': 'Accept-Encoding',
+        }
+        accepted = accepted_encodings(request.headers.get('Accept-Encoding', ''))
+        for coding, suffix in ENCODINGS:
+            if coding in accepted and os.path.isfile(path + suffix):
+                path += suffix
+                headers['Content-Encoding'] = coding
+                break
+
+        stat = os.stat(path)
+        # Per file variant, so a gzip ETag never validates the brotli body
+        headers['ETag'] = quote_etag(f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+        headers['Last-Modified'] = http_date(stat.st_mtime)
+        if headers['ETag'] in parse_etags(request.headers.get('If-None-Match', '')):
+            return HttpResponseNotModified(headers=headers)
+
+        content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type in ('application/javascript', 'image/svg+xml'):
+            content_type += '; charset=utf-8'
+        response = FileResponse(open(path, 'rb'), content_type=content_type, headers=headers)
+        # FileResponse names the download after the open file; assets are not downloads
+        del response['Content-Disposition']
+        if request.method == 'HEAD':
+            response.streaming_content = []
+        return response
@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-10-18 16:53
+
+import core.storage
+import core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='profile_image',
+            field=models.ImageField(blank=True, null=True, storage=core.storage.document_storage, upload_to='profiles/', validators=[core.validators.UploadValidator(('image/jpeg', 'image/png', 'image/gif', 'image/webp'))]),
+        ),
+    ]
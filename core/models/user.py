@@ -3,6 +3,9 @@ from django.db import models
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.utils.translation import gettext_lazy as _
 
+from core.storage import document_storage
+from core.validators import IMAGE_TYPES, UploadValidator
+
 class UserManager(BaseUserManager):
     """Custom user model manager where email is the unique identifier"""
     def create_user(self, email, password=None, **extra_fields):
@@ -45,7 +48,13 @@ class User(AbstractUser):
     city = models.CharField(max_length=100, blank=True, null=True)
     phone_number = models.CharField(max_length=20, blank=True, null=True)
     is_verified = models.BooleanField(default=False)
-    profile_image = models.ImageField(upload_to='profiles/', blank=True, null=True)
+    profile_image = models.ImageField(
+        upload_to='profiles/',
+        storage=document_storage,
+        validators=[UploadValidator(IMAGE_TYPES)],
+        blank=True,
+        null=True,
+    )
     bio = models.TextField(blank=True, null=True)
     language_preference = models.CharField(max_length=20, default='en')
     date_joined = models.DateTimeField(auto_now_add=True)
@@ -0,0 +1,5 @@
+from .cities import (
+    aget_city_index, aresolve_country, get_city_index, invalidate_city_cache, resolve_country,
+)
+
+__all__ = ['aget_city_index', 'aresolve_country', 'get_city_index', 'invalidate_city_cache', 'resolve_country']
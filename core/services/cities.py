@@ -0,0 +1,231 @@
+import bisect
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db.models import Case, IntegerField, Q, Value, When
+from cities_light.models import City, Country
+
+VERSION_KEY = 'cities:version'
+CACHE_TIMEOUT = 60 * 60 * 24
+LOCAL_CACHE_SIZE = 32
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+_local = OrderedDict()
+_local_lock = threading.Lock()
+_deferred = threading.local()
+
+
+class CityIndex:
+    """Pre-serialized cities of one country plus a prefix-search index."""
+
+    def __init__(self, country, rows):
+        self.country = country
+        self.cities = [{'id': city_id, 'name': name} for city_id, name, _ in rows]
+        self.payload = self._render(self.cities)
+        self.etag = payload_etag(self.payload)
+        # Sorted (search key, position) pairs; every city is reachable by
+        # its display name and its ASCII name.
+        keys = set()
+        for position, (_, name, name_ascii) in enumerate(rows):
+            keys.add((name.casefold(), position))
+            keys.add((name_ascii.casefold(), position))
+        self.search_keys = sorted(keys)
+
+    def search(self, prefix, limit=DEFAULT_SEARCH_LIMIT):
+        """Return up to ``limit`` cities whose name starts with ``prefix``."""
+        prefix = prefix.casefold()
+        start = bisect.bisect_left(self.search_keys, (prefix,))
+        positions = set()
+        for i in range(start, len(self.search_keys)):
+            key, position = self.search_keys[i]
+            if not key.startswith(prefix):
+                break
+            positions.add(position)
+        return [self.cities[position] for position in sorted(positions)[:limit]]
+
+    def search_payload(self, prefix, limit=DEFAULT_SEARCH_LIMIT):
+        return self._render(self.search(prefix, limit))
+
+    def _render(self, cities):
+        return _dumps({
+            'cities': cities,
+            'debug': {
+                'country': self.country['name'],
+                'code2': self.country['code2'],
+                'total_cities': len(cities),
+            },
+        })
+
+
+def _dumps(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def payload_etag(payload):
+    """Return a strong ETag for a serialized payload."""
+    return '"%s"' % hashlib.md5(payload, usedforsecurity=False).hexdigest()
+
+
+def get_version():
+    """Return the current cache generation for city data."""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+async def aget_version():
+    """Async version of ``get_version``."""
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, 1, None)
+        version = await cache.aget(VERSION_KEY, 1)
+    return version
+
+
+def invalidate_city_cache():
+    """Drop every cached city list, locally and in the shared cache."""
+    if getattr(_deferred, 'depth', 0):
+        _deferred.pending = True
+        return
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 2, None)
+    with _local_lock:
+        _local.clear()
+
+
+@contextmanager
+def deferred_invalidation():
+    """
+    Collapse the invalidations raised inside the block into a single one.
+
+    Imports save thousands of rows, each of which would otherwise bump the
+    cache version.
+    """
+    _deferred.depth = getattr(_deferred, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _deferred.depth -= 1
+        if not _deferred.depth and getattr(_deferred, 'pending', False):
+            _deferred.pending = False
+            invalidate_city_cache()
+
+
+def _country_key(code_or_name, version):
+    return f'cities:{version}:country:{code_or_name.upper()}'
+
+
+def _country_query(code_or_name):
+    return Country.objects.filter(
+        Q(code2=code_or_name) | Q(name__iexact=code_or_name) | Q(name_ascii__iexact=code_or_name)
+    ).annotate(
+        match_rank=Case(
+            When(code2=code_or_name, then=Value(0)),
+            When(name__iexact=code_or_name, then=Value(1)),
+            default=Value(2),
+            output_field=IntegerField(),
+        )
+    ).order_by('match_rank').values('id', 'name', 'code2')
+
+
+def resolve_country(code_or_name, version=None):
+    """
+    Find a country by ISO code, name or ASCII name in one query.
+
+    Returns a dict with the country's id, name and code2, or None.
+    """
+    version = version or get_version()
+    key = _country_key(code_or_name, version)
+    country = cache.get(key)
+    if country is None:
+        country = _country_query(code_or_name).first()
+        # Cache misses too, as an empty dict
+        cache.set(key, country or {}, CACHE_TIMEOUT)
+    return country or None
+
+
+async def aresolve_country(code_or_name, version=None):
+    """Async version of ``resolve_country``."""
+    version = version or await aget_version()
+    key = _country_key(code_or_name, version)
+    country = await cache.aget(key)
+    if country is None:
+        country = await _country_query(code_or_name).afirst()
+        await cache.aset(key, country or {}, CACHE_TIMEOUT)
+    return country or None
+
+
+def _city_query(country):
+    return City.objects.filter(country_id=country['id']).order_by('name').values_list(
+        'id', 'name', 'name_ascii', 'region__name'
+    )
+
+
+def _city_rows(rows):
+    return [
+        (city_id, f"{name}, {region}" if region else name, name_ascii or name)
+        for city_id, name, name_ascii, region in rows
+    ]
+
+
+def _get_local(local_key):
+    with _local_lock:
+        index = _local.get(local_key)
+        if index is not None:
+            _local.move_to_end(local_key)
+        return index
+
+
+def _put_local(local_key, country, rows):
+    index = CityIndex(country, rows)
+    with _local_lock:
+        _local[local_key] = index
+        while len(_local) > LOCAL_CACHE_SIZE:
+            _local.popitem(last=False)
+    return index
+
+
+def get_city_index(country, version=None):
+    """
+    Return the CityIndex for a resolved country.
+
+    Looks in the per-process LRU first, then the shared cache, and only
+    queries the database when both miss.
+    """
+    version = version or get_version()
+    local_key = (version, country['code2'])
+    index = _get_local(local_key)
+    if index is not None:
+        return index
+
+    shared_key = f"cities:{version}:list:{country['code2']}"
+    rows = cache.get(shared_key)
+    if rows is None:
+        rows = _city_rows(_city_query(country))
+        cache.set(shared_key, rows, CACHE_TIMEOUT)
+    return _put_local(local_key, country, rows)
+
+
+async def aget_city_index(country, version=None):
+    """Async version of ``get_city_index``."""
+    version = version or await aget_version()
+    local_key = (version, country['code2'])
+    index = _get_local(local_key)
+    if index is not None:
+        return index
+
+    shared_key = f"cities:{version}:list:{country['code2']}"
+    rows = await cache.aget(shared_key)
+    if rows is None:
+        rows = _city_rows([row async for row in _city_query(country)])
+        await cache.aset(shared_key, rows, CACHE_TIMEOUT)
+    return _put_local(local_key, country, rows)
@@ -0,0 +1,329 @@
+"""
+Chunked, streaming import of GeoNames dumps into the cities_light tables.
+
+Each file is read line by line and applied in chunks: one query fetches
+the rows already stored for the chunk's geoname ids, new rows go in with a
+single ``bulk_create(ignore_conflicts=True)`` and existing rows are only
+written when one of their fields actually changed.
+"""
+import io
+import logging
+import time
+import zipfile
+import zoneinfo
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from cities_light.abstract_models import to_ascii, to_search
+from cities_light.models import City, Country, Region, SubRegion
+from cities_light.settings import ICity, ICountry, INCLUDE_CITY_TYPES, INCLUDE_COUNTRIES, IRegion, ISubRegion
+from django.db import IntegrityError, transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 2000
+COORDINATE = Decimal('0.00001')
+
+COUNTRY_FIELDS = ['name', 'name_ascii', 'slug', 'code2', 'code3', 'continent', 'tld', 'phone']
+REGION_FIELDS = ['name', 'name_ascii', 'slug', 'display_name', 'geoname_code', 'country_id']
+SUBREGION_FIELDS = REGION_FIELDS + ['region_id']
+CITY_FIELDS = [
+    'name', 'name_ascii', 'slug', 'display_name', 'search_names', 'latitude', 'longitude',
+    'population', 'feature_code', 'timezone', 'country_id', 'region_id', 'subregion_id',
+]
+
+
+@dataclass
+class ImportStats:
+    """Row counts and timing for one imported file."""
+    label: str
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def rows(self):
+        return self.created + self.updated + self.unchanged + self.skipped
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    @property
+    def rate(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (
+            f'{self.label}: {self.rows} rows ({self.created} new, {self.updated} updated, '
+            f'{self.unchanged} unchanged, {self.skipped} skipped) in {self.elapsed:.1f}s, '
+            f'{self.rate:.0f} rows/s'
+        )
+
+
+@contextmanager
+def open_dump(path):
+    """Open a GeoNames ``.txt`` dump, or the ``.txt`` inside a ``.zip``, as text."""
+    if str(path).endswith('.zip'):
+        with zipfile.ZipFile(path) as archive:
+            member = next(name for name in archive.namelist() if name.endswith('.txt'))
+            with archive.open(member) as raw:
+                yield io.TextIOWrapper(raw, encoding='utf-8')
+    else:
+        with open(path, encoding='utf-8') as handle:
+            yield handle
+
+
+def read_rows(lines):
+    """Yield tab-separated rows, skipping comments and blank lines."""
+    for line in lines:
+        if not line.strip() or line.startswith('#'):
+            continue
+        yield line.rstrip('\n').split('\t')
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _coordinate(value):
+    try:
+        return Decimal(value).quantize(COORDINATE)
+    except InvalidOperation:
+        return None
+
+
+class GeoImporter:
+    """
+    Sync GeoNames dumps into cities_light.
+
+    With ``incremental`` (the default) existing rows are compared field by
+    field and only the changed ones are written; otherwise every existing
+    row in the dump is rewritten.
+    """
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE, incremental=True, progress=None):
+        self.chunk_size = chunk_size
+        self.incremental = incremental
+        self.progress = progress
+        self._timezones = zoneinfo.available_timezones()
+        self._slugify = City._meta.get_field('slug').slugify
+
+    def slug(self, model, name_ascii):
+        slug_field = model._meta.get_field('slug')
+        return self._slugify(name_ascii)[:slug_field.max_length] or model._meta.model_name
+
+    def import_countries(self, lines):
+        def build(items):
+            if len(items) <= ICountry.geonameid or not items[ICountry.geonameid]:
+                return None
+            if INCLUDE_COUNTRIES and items[ICountry.code2] not in INCLUDE_COUNTRIES:
+                return None
+            name = items[ICountry.name]
+            name_ascii = to_ascii(name).strip()
+            return int(items[ICountry.geonameid]), {
+                'name': name,
+                'name_ascii': name_ascii,
+                'slug': self.slug(Country, name_ascii),
+                'code2': items[ICountry.code2],
+                'code3': items[ICountry.code3],
+                'continent': items[ICountry.continent],
+                'tld': items[ICountry.tld][1:],
+                'phone': items[ICountry.phone].replace('+', ''),
+            }
+
+        # Countries created by hand have no geoname id yet; adopt them by code.
+        unclaimed = dict(Country.objects.filter(geoname_id__isnull=True).values_list('code2', 'pk'))
+        return self._sync(Country, lines, build, COUNTRY_FIELDS,
+                          claim=lambda values: unclaimed.pop(values['code2'], None))
+
+    def import_regions(self, lines):
+        countries = self._countries()
+
+        def build(items):
+            if len(items) <= IRegion.geonameid or not items[IRegion.geonameid]:
+                return None
+            code2, geoname_code = items[IRegion.code].split('.', 1)
+            if code2 not in countries:
+                return None
+            country_id, country_name = countries[code2]
+            name = items[IRegion.name] or items[IRegion.asciiName]
+            name_ascii = items[IRegion.asciiName] or to_ascii(name).strip()
+            return int(items[IRegion.geonameid]), {
+                'name': name,
+                'name_ascii': name_ascii,
+                'slug': self.slug(Region, name_ascii),
+                'display_name': f'{name}, {country_name}',
+                'geoname_code': geoname_code,
+                'country_id': country_id,
+            }
+
+        return self._sync(Region, lines, build, REGION_FIELDS)
+
+    def import_subregions(self, lines):
+        countries = self._countries()
+        regions = self._regions()
+
+        def build(items):
+            if len(items) <= ISubRegion.geonameid or not items[ISubRegion.geonameid]:
+                return None
+            code2, admin1, geoname_code = items[ISubRegion.code].split('.', 2)
+            if code2 not in countries:
+                return None
+            country_id, country_name = countries[code2]
+            name = items[ISubRegion.name] or items[ISubRegion.asciiName]
+            name_ascii = items[ISubRegion.asciiName] or to_ascii(name).strip()
+            region_id, _ = regions.get((code2, admin1), (None, None))
+            return int(items[ISubRegion.geonameid]), {
+                'name': name,
+                'name_ascii': name_ascii,
+                'slug': self.slug(SubRegion, name_ascii),
+                'display_name': f'{name}, {country_name}',
+                'geoname_code': geoname_code,
+                'country_id': country_id,
+                'region_id': region_id,
+            }
+
+        return self._sync(SubRegion, lines, build, SUBREGION_FIELDS)
+
+    def import_cities(self, lines):
+        countries = self._countries()
+        regions = self._regions()
+        subregions = {
+            (code2, admin1, geoname_code): pk
+            for pk, code2, admin1, geoname_code in SubRegion.objects.values_list(
+                'pk', 'country__code2', 'region__geoname_code', 'geoname_code'
+            )
+        }
+
+        def build(items):
+            if len(items) <= ICity.timezone or not items[ICity.geonameid]:
+                return None
+            if items[ICity.featureCode] not in INCLUDE_CITY_TYPES:
+                return None
+            code2 = items[ICity.countryCode]
+            if code2 not in countries:
+                return None
+            country_id, country_name = countries[code2]
+            admin1 = items[ICity.admin1Code]
+            region_id, region_name = regions.get((code2, admin1), (None, None))
+            name = items[ICity.name]
+            name_ascii = items[ICity.asciiName] or to_ascii(name).strip()
+            timezone = items[ICity.timezone]
+            search_names = {to_search(name + country_name)}
+            if region_name:
+                search_names.add(to_search(name + region_name + country_name))
+                display_name = f'{name}, {region_name}, {country_name}'
+            else:
+                display_name = f'{name}, {country_name}'
+            return int(items[ICity.geonameid]), {
+                'name': name,
+                'name_ascii': name_ascii,
+                'slug': self.slug(City, name_ascii),
+                'display_name': display_name[:200],
+                'search_names': ' '.join(sorted(search_names)),
+                'latitude': _coordinate(items[ICity.latitude]),
+                'longitude': _coordinate(items[ICity.longitude]),
+                'population': int(items[ICity.population] or 0),
+                'feature_code': items[ICity.featureCode],
+                'timezone': timezone if timezone in self._timezones else None,
+                'country_id': country_id,
+                'region_id': region_id,
+                'subregion_id': subregions.get((code2, admin1, items[ICity.admin2Code])),
+            }
+
+        # Cities added by hand (see import_test_cities) are adopted by name.
+        unclaimed = {
+            (country_id, name): pk
+            for pk, country_id, name in City.objects.filter(geoname_id__isnull=True)
+            .values_list('pk', 'country_id', 'name')
+        }
+        return self._sync(City, lines, build, CITY_FIELDS,
+                          claim=lambda values: unclaimed.pop((values['country_id'], values['name']), None))
+
+    def _countries(self):
+        return {
+            code2: (pk, name)
+            for pk, code2, name in Country.objects.values_list('pk', 'code2', 'name')
+        }
+
+    def _regions(self):
+        return {
+            (code2, geoname_code): (pk, name)
+            for pk, code2, geoname_code, name in Region.objects.values_list(
+                'pk', 'country__code2', 'geoname_code', 'name'
+            )
+        }
+
+    def _sync(self, model, lines, build, fields, claim=None):
+        stats = ImportStats(model._meta.verbose_name_plural)
+        for chunk in chunked(read_rows(lines), self.chunk_size):
+            parsed = {}
+            for items in chunk:
+                row = build(items)
+                if row is None:
+                    stats.skipped += 1
+                else:
+                    parsed[row[0]] = row[1]
+            self._apply_chunk(model, parsed, fields, claim, stats)
+            if self.progress:
+                self.progress(stats)
+        return stats
+
+    def _apply_chunk(self, model, parsed, fields, claim, stats):
+        existing = {
+            row['geoname_id']: row
+            for row in model.objects.filter(geoname_id__in=list(parsed)).values('pk', 'geoname_id', *fields)
+        }
+        new, changed = [], []
+        for geoname_id, values in parsed.items():
+            current = existing.get(geoname_id)
+            if current is not None:
+                if self.incremental and all(current[name] == values[name] for name in fields):
+                    stats.unchanged += 1
+                    continue
+                changed.append(model(pk=current['pk'], geoname_id=geoname_id, **values))
+                continue
+            pk = claim(values) if claim else None
+            if pk is not None:
+                changed.append(model(pk=pk, geoname_id=geoname_id, **values))
+            else:
+                new.append(model(geoname_id=geoname_id, **values))
+
+        with transaction.atomic():
+            # Rows clashing with another unique constraint (GeoNames has
+            # duplicate names within a region) are dropped, as cities_light does.
+            model.objects.bulk_create(new, ignore_conflicts=True)
+            # bulk_create does not say which rows it dropped, so count what landed
+            created = model.objects.filter(geoname_id__in=[obj.geoname_id for obj in new]).count() if new else 0
+            stats.created += created
+            stats.skipped += len(new) - created
+            updated = self._update(model, changed, ['geoname_id', *fields])
+        stats.updated += updated
+        stats.skipped += len(changed) - updated
+
+    def _update(self, model, objs, fields):
+        if not objs:
+            return 0
+        try:
+            with transaction.atomic():
+                model.objects.bulk_update(objs, fields)
+            return len(objs)
+        except IntegrityError:
+            pass
+        # Fall back to row-by-row so one clashing rename does not sink the chunk.
+        updated = 0
+        for obj in objs:
+            try:
+                with transaction.atomic():
+                    model.objects.filter(pk=obj.pk).update(**{name: getattr(obj, name) for name in fields})
+                updated += 1
+            except IntegrityError:
+                logger.warning('Skipping %s %s: %s', model._meta.model_name, obj.geoname_id, obj.name)
+        return updated
@@ -0,0 +1,142 @@
+"""
+Fixed-size derivatives of uploaded images (profile images, partner logos).
+
+Each source image gets a square WebP and JPEG per entry in SIZES, written
+to the default storage as::
+
+    thumbnails/<source name without extension>/<size>.<webp|jpg>
+
+Sources live in content-addressed storage, so a name always means the
+same pixels and a derivative, once written, never goes stale. They are
+generated off the request path by the ``core.generate_thumbnails`` job
+(queued when an image field changes) or the ``generate_thumbnails``
+command; EXIF orientation is applied to the pixels and all metadata is
+dropped. Until they exist, templates show the original instead.
+"""
+import posixpath
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from core.storage import document_storage
+
+# Edge length in pixels of each square derivative
+SIZES = {'small': 64, 'medium': 256, 'large': 512}
+FORMATS = {'webp': ('WEBP', {'quality': 80, 'method': 4}), 'jpg': ('JPEG', {'quality': 82, 'optimize': True})}
+# Sources past this many pixels are not decoded at all
+MAX_SOURCE_PIXELS = 40_000_000
+READY_TIMEOUT = 60 * 60 * 24
+# A "not yet" is cached briefly too, so pending images cost no storage calls per render
+PENDING_TIMEOUT = 30
+
+
+def derivative_name(name, size, extension):
+    stem = posixpath.splitext(name)[0]
+    return f'thumbnails/{stem}/{size}.{extension}'
+
+
+def derivative_names(name):
+    return [derivative_name(name, size, extension) for size in SIZES for extension in FORMATS]
+
+
+def _ready_key(name):
+    return f'thumbnails:ready:{name}'
+
+
+def derivatives_ready(name):
+    """
+    Whether every derivative of ``name`` exists.
+
+    A yes is cached for READY_TIMEOUT, a no for PENDING_TIMEOUT;
+    ``generate_derivatives`` records the yes as soon as it finishes.
+    """
+    if not name:
+        return False
+    ready = cache.get(_ready_key(name))
+    if ready is None:
+        ready = all(default_storage.exists(derivative) for derivative in derivative_names(name))
+        cache.set(_ready_key(name), ready, READY_TIMEOUT if ready else PENDING_TIMEOUT)
+    return ready
+
+
+def _open_source(name):
+    with document_storage().open(name, 'rb') as source:
+        image = Image.open(source)
+        if image.width * image.height > MAX_SOURCE_PIXELS:
+            raise ValueError(f'{name} is {image.width}x{image.height}, too large to thumbnail')
+        image.load()
+    # Rotate the pixels as the camera recorded, since the EXIF is not kept
+    image = ImageOps.exif_transpose(image)
+    return image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+
+
+def _flatten(image):
+    if image.mode != 'RGBA':
+        return image
+    background = Image.new('RGB', image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+def generate_derivatives(name, force=False):
+    """Write the missing derivatives of ``name``; returns how many were written."""
+    missing = [
+        (size, extension) for size in SIZES for extension in FORMATS
+        if force or not default_storage.exists(derivative_name(name, size, extension))
+    ]
+    if not missing:
+        return 0
+    image = _open_source(name)
+    for size, extension in missing:
+        fitted = ImageOps.fit(image, (SIZES[size], SIZES[size]), Image.Resampling.LANCZOS)
+        image_format, options = FORMATS[extension]
+        if image_format == 'JPEG':
+            fitted = _flatten(fitted)
+        buffer = BytesIO()
+        # No exif= or icc_profile= argument, so no metadata is written
+        fitted.save(buffer, image_format, **options)
+        target = derivative_name(name, size, extension)
+        if force:
+            default_storage.delete(target)
+        default_storage.save(target, ContentFile(buffer.getvalue()))
+    cache.set(_ready_key(name), True, READY_TIMEOUT)
+    return len(missing)
+
+
+def queue_derivatives(name):
+    """Queue derivative generation for ``name`` unless it is already done."""
+    from core.jobs import generate_thumbnails
+
+    if name and not derivatives_ready(name):
+        generate_thumbnails.enqueue(key=f'thumbnails:{name}', image_name=name)
+
+
+def pick_size(width):
+    """The smallest derivative at least ``width`` CSS pixels wide at 2x density."""
+    for size, edge in sorted(SIZES.items(), key=lambda item: item[1]):
+        if edge >= width * 2:
+            return size
+    return max(SIZES, key=SIZES.get)
+
+
+def thumbnail_sources(name, width):
+    """
+    URLs for showing ``name`` at ``width`` CSS pixels, or None while pending.
+
+    Returns ``{'webp': srcset, 'jpg': srcset, 'src': fallback jpg URL}``
+    with every size in each srcset, so the browser picks by density.
+    """
+    if not derivatives_ready(name):
+        return None
+    srcsets = {
+        extension: ', '.join(
+            f'{default_storage.url(derivative_name(name, size, extension))} {edge}w'
+            for size, edge in SIZES.items()
+        )
+        for extension in FORMATS
+    }
+    srcsets['src'] = default_storage.url(derivative_name(name, pick_size(width), 'jpg'))
+    return srcsets
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from cities_light.models import City, Country
+
+from core.models import User
+from core.services.cities import invalidate_city_cache
+from core.services.thumbnails import queue_derivatives
+
+
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=City)
+@receiver(post_save, sender=Country)
+@receiver(post_delete, sender=Country)
+def city_data_changed(sender, **kwargs):
+    invalidate_city_cache()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Logins save last_login only; skip those
+    if raw or (update_fields is not None and 'profile_image' not in update_fields):
+        return
+    queue_derivatives(instance.profile_image.name)
@@ -0,0 +1,99 @@
+"""
+Storage backends.
+
+``ContentAddressedStorage`` keeps uploaded documents and images once per
+distinct content, under the upload_to directory as
+``<dir>/<first two hex digits>/<sha256><ext>``; saving identical bytes
+again returns the existing name without writing anything. Uploads arrive
+already hashed by ``core.uploads.HashingUploadHandler`` and are moved into
+place; other files are hashed in one chunked pass before being written.
+One stored file can back several rows, so do not delete through a field
+(``FieldFile.delete``) while other rows may share it.
+
+``CompressedManifestStaticFilesStorage`` is collectstatic's storage in
+production: hashed names from the manifest, plus ``.gz`` and (with the
+``brotli`` package) ``.br`` copies of each hashed text asset for
+``core.middleware.static.StaticFilesMiddleware`` to serve.
+"""
+import gzip
+import hashlib
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import FileSystemStorage, storages
+
+try:
+    import brotli
+except ImportError:  # optional; gzip alone is still served
+    brotli = None
+
+# Extensions worth compressing; images and fonts are compressed already
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.map', '.svg', '.json', '.txt', '.html', '.xml', '.ico'}
+# Keep a compressed copy only if it is at least this much smaller
+MIN_COMPRESSION_RATIO = 0.95
+
+
+def file_digest(content):
+    """SHA-256 hex digest of ``content``, read a chunk at a time."""
+    digest = getattr(content, 'sha256', None)
+    if digest:
+        return digest
+    hasher = hashlib.sha256()
+    for chunk in content.chunks():
+        hasher.update(chunk.encode() if isinstance(chunk, str) else chunk)
+    return hasher.hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def __init__(self, **kwargs):
+        # Equal names mean equal bytes, so a concurrent save of the same
+        # content may safely replace the file
+        kwargs.setdefault('allow_overwrite', True)
+        super().__init__(**kwargs)
+
+    def content_name(self, name, digest):
+        directory, filename = os.path.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        return os.path.join(directory, digest[:2], f'{digest}{extension}').replace('\\', '/')
+
+    def _save(self, name, content):
+        if getattr(content, 'rejection', None):
+            raise SuspiciousFileOperation(f'Refusing to store a rejected upload: {content.rejection}')
+        name = self.content_name(name, file_digest(content))
+        if self.exists(name):
+            return name
+        return super()._save(name, content)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for name in set(self.hashed_files.values()):
+            if os.path.splitext(name)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+                for compressed_name in self.compress(name):
+                    yield name, compressed_name, True
+
+    def compress(self, name):
+        """Write ``name.gz`` and ``name.br`` where they pay off; returns the names written."""
+        path = self.path(name)
+        with open(path, 'rb') as source:
+            content = source.read()
+        variants = [('.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', lambda data: brotli.compress(data, quality=11)))
+        written = []
+        for suffix, compress in variants:
+            compressed = compress(content)
+            if len(compressed) < len(content) * MIN_COMPRESSION_RATIO:
+                with open(path + suffix, 'wb') as target:
+                    target.write(compressed)
+                written.append(name + suffix)
+        return written
+
+
+def document_storage():
+    """The ``documents`` storage; a callable so fields resolve it at runtime."""
+    return storages['documents']
@@ -0,0 +1,44 @@
+"""
+Template helpers for image derivatives.
+
+    {% load thumbnails %}
+    {% thumbnail user.profile_image 32 alt=user.first_name class="h-8 w-8 rounded-full" %}
+    <img src="{{ partner.logo|thumbnail_url:64 }}">
+
+Both pick the derivative for the display width and fall back to the
+original image while its derivatives are still being generated.
+"""
+from django import template
+
+from core.services.thumbnails import thumbnail_sources
+
+register = template.Library()
+
+
+@register.inclusion_tag('core/partials/thumbnail.html')
+def thumbnail(image, width, alt='', placeholder=None, **attrs):
+    """
+    A ``<picture>`` of ``image`` at ``width`` CSS pixels (square).
+
+    Renders the original while derivatives are pending, ``placeholder``
+    (a URL) when there is no image, and nothing when neither is available.
+    """
+    name = getattr(image, 'name', None)
+    return {
+        'sources': thumbnail_sources(name, width) if name else None,
+        'original': image.url if name else placeholder,
+        'width': width,
+        'alt': alt,
+        'css_class': attrs.get('class', ''),
+    }
+
+
+@register.filter
+def thumbnail_url(image, width):
+    """URL of the JPEG derivative of ``image`` for ``width`` CSS pixels, or of the original."""
+    name = getattr(image, 'name', None)
+    if not name:
+        return ''
+    sources = thumbnail_sources(name, int(width))
+    return sources['src'] if sources else image.url
+
@@ -0,0 +1,78 @@
+"""Test helpers shared by the app test suites."""
+from django.db import connection
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+from core.models import User
+
+
+def query_plan(queryset):
+    """
+    Return the database's plan for ``queryset`` as text.
+
+    Test tables hold a handful of rows, so PostgreSQL would happily pick a
+    sequential scan; it is switched off while planning so the plan shows
+    which index the query can use.
+    """
+    if connection.vendor != 'postgresql':
+        return queryset.explain()
+    with connection.cursor() as cursor:
+        cursor.execute('SET enable_seqscan = off')
+        try:
+            return queryset.explain()
+        finally:
+            cursor.execute('RESET enable_seqscan')
+
+
+def make_user(email, role='donor'):
+    """Create a user named after the local part of ``email``, with no usable password."""
+    return User.objects.create_user(
+        email=email, password=None, first_name=email.split('@')[0], country='US', role=role
+    )
+
+
+def index_name(model, *columns, unique=False):
+    """
+    Name of the index on exactly ``columns`` of ``model``'s table.
+
+    For indexes whose name the backend generates, such as the one behind
+    ``unique_together``.
+    """
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+    for name, constraint in constraints.items():
+        if constraint['index'] and constraint['columns'] == list(columns) and constraint['unique'] == unique:
+            return name
+    raise LookupError(f'No index on {model._meta.db_table}({", ".join(columns)})')
+
+
+class QueryPlanAssertions:
+    """Mixin for TestCase: assert hot queries are served by an index."""
+
+    def assertUsesIndex(self, queryset, *index_names):
+        """Fail unless the plan for ``queryset`` uses one of ``index_names``."""
+        plan = query_plan(queryset)
+        if not any(name in plan for name in index_names):
+            self.fail(f'Expected one of {", ".join(index_names)} in query plan:\n{plan}')
+        return plan
+
+    def assertNoSort(self, queryset):
+        """Fail if the plan sorts rows instead of reading them in index order."""
+        plan = query_plan(queryset)
+        markers = ['USE TEMP B-TREE FOR ORDER BY'] if connection.vendor == 'sqlite' else ['Sort Key']
+        for marker in markers:
+            self.assertNotIn(marker, plan, f'Query plan sorts rows:\n{plan}')
+        return plan
+
+
+class BudgetTestRunner(DiscoverRunner):
+    """The default runner, with QUERY_BUDGET_RAISE on so a view over its budget fails its test."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.budgets = override_settings(QUERY_BUDGET_RAISE=True)
+        self.budgets.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.budgets.disable()
+        super().teardown_test_environment(**kwargs)
@@ -1,3 +1,654 @@
-from django.test import TestCase
+import gzip
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from PIL import Image
+
+from cities_light.models import City, Country, Region
+from django import forms
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.http import JsonResponse
+from django.template import Context, Template
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import include, path, reverse
+
+from core.admin_mixins import EstimatedCountPaginator, estimate_count
+from core.cache import bump_namespace, get_or_compute, namespace_versions, versioned_key
+from core.forms.fields import CityField, CountryField, CountrySelectWidget, get_country_list
+from core.middleware.profiling import QueryBudgetExceeded, profile_store
+from core.models import User
+from core.services.thumbnails import SIZES, derivative_name
+from core.storage import document_storage
+from core.validators import DOCUMENT_TYPES, UploadValidator
+from core.views.home import HomeView
+from core.views.registration.views import RegistrationTypeView
+from core.views.registration.views_ajax import AsyncGetCitiesView
+from donations.services.grants import grant_wish
+from donations.services.impact import refresh_impact_snapshot
+from jobs.worker import run_pending
+from partners.models import Partner
+from wishchain.database import database_from_url
+from wishes.models import Wish, WisherProfile
+
+
+def store_document(request):
+    upload = request.FILES['document']
+    try:
+        UploadValidator(DOCUMENT_TYPES)(upload)
+    except ValidationError as exc:
+        return JsonResponse({'error': exc.messages[0], 'received': upload.size}, status=400)
+    name = document_storage().save(f'id_documents/{upload.name}', upload)
+    return JsonResponse({'name': name, 'sha256': upload.sha256, 'type': upload.detected_type})
+
+
+# The async city lookup next to the site's own URLs, as routed under ASGI
+urlpatterns = [
+    path('async/get-cities/', AsyncGetCitiesView.as_view(), name='async_get_cities'),
+    path('store-document/', store_document),
+    path('', include('wishchain.urls')),
+]
+
+
+class GetCitiesViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.country = Country.objects.create(name='France', name_ascii='France', code2='FR', code3='FRA')
+        for name in ['Paris', 'Marseille', 'Lyon', 'Lille', 'Le Havre']:
+            City.objects.create(name=name, name_ascii=name, slug=name.lower(), country=self.country)
+        self.url = reverse('core:get_cities')
+
+    def test_lists_cities_from_cache_after_first_request(self):
+        response = self.client.get(self.url, {'country_code': 'fr'})
+        self.assertEqual([city['name'] for city in response.json()['cities']],
+                         ['Le Havre', 'Lille', 'Lyon', 'Marseille', 'Paris'])
+        self.assertIn('max-age', response['Cache-Control'])
+        with self.assertNumQueries(0):
+            self.client.get(self.url, {'country_code': 'FR'})
+
+    def test_country_can_be_given_by_name(self):
+        response = self.client.get(self.url, {'country_code': 'france'})
+        self.assertEqual(len(response.json()['cities']), 5)
+
+    def test_prefix_search_with_limit(self):
+        response = self.client.get(self.url, {'country_code': 'FR', 'q': 'l', 'limit': 2})
+        self.assertEqual([city['name'] for city in response.json()['cities']], ['Le Havre', 'Lille'])
+
+    def test_etag_revalidation(self):
+        etag = self.client.get(self.url, {'country_code': 'FR'})['ETag']
+        response = self.client.get(self.url, {'country_code': 'FR'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_saving_a_city_invalidates_the_cache(self):
+        self.client.get(self.url, {'country_code': 'FR'})
+        City.objects.create(name='Nice', name_ascii='Nice', slug='nice', country=self.country)
+        response = self.client.get(self.url, {'country_code': 'FR'})
+        self.assertEqual(len(response.json()['cities']), 6)
+
+
+@override_settings(ROOT_URLCONF='core.tests')
+class AsyncGetCitiesViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        profile_store.clear()
+        self.country = Country.objects.create(name='France', name_ascii='France', code2='FR', code3='FRA')
+        for name in ['Paris', 'Lyon', 'Lille']:
+            City.objects.create(name=name, name_ascii=name, slug=name.lower(), country=self.country)
+
+    async def test_serves_the_same_payload_as_the_sync_view(self):
+        response = await self.async_client.get('/async/get-cities/', {'country_code': 'france'})
+        sync_response = await self.async_client.get('/get-cities/', {'country_code': 'france'})
+        self.assertEqual(response.content, sync_response.content)
+        self.assertEqual(response['ETag'], sync_response['ETag'])
+        search = await self.async_client.get('/async/get-cities/', {'country_code': 'FR', 'q': 'l'})
+        self.assertEqual([city['name'] for city in search.json()['cities']], ['Lille', 'Lyon'])
+        missing = await self.async_client.get('/async/get-cities/')
+        self.assertEqual(missing.status_code, 400)
+
+    async def test_profiling_counts_async_orm_queries(self):
+        response = await self.async_client.get('/async/get-cities/', {'country_code': 'FR'})
+        self.assertIn('desc="2 queries"', response['Server-Timing'])
+        await self.async_client.get('/async/get-cities/', {'country_code': 'FR'})
+        summary = profile_store.summary()['async_get_cities']
+        self.assertEqual((summary['count'], summary['queries_p99'], summary['queries_p50']), (2, 2, 0))
+
+
+class CountryFieldTests(SimpleTestCase):
+    def render(self, value, attrs=None, name='country'):
+        return CountryField().widget.render(name, value, attrs)
+
+    def test_renders_every_country_after_the_placeholder(self):
+        html = self.render(None)
+        self.assertEqual(html.count('<option'), len(get_country_list()) + 1)
+        self.assertIn('<option value="" selected>Select a country</option>', html)
+        self.assertEqual(html.count(' selected'), 1)
+
+    def test_marks_only_the_selected_country(self):
+        html = self.render('FR')
+        self.assertEqual(html.count(' selected'), 1)
+        self.assertRegex(html, r'<option value="FR"[^>]* selected>France</option>')
+        self.assertIn('<option value="">Select a country</option>', html)
+        # An unknown value selects nothing rather than falling back to the placeholder
+        self.assertNotIn(' selected', self.render('XX'))
+
+    def test_names_and_attributes_are_escaped(self):
+        html = self.render('CI', attrs={'id': 'id_country', 'data-note': '"quoted" <b>'}, name='a"b')
+        self.assertTrue(html.startswith('<select name="a&quot;b"'))
+        self.assertIn('id="id_country"', html)
+        self.assertIn('data-note="&quot;quoted&quot; &lt;b&gt;"', html)
+        self.assertIn('bg-background/50', html)
+        self.assertIn('selected>Côte d&#x27;Ivoire</option>', html)
+
+    def test_falls_back_to_django_rendering_for_other_choices(self):
+        widget = CountrySelectWidget(choices=[('FR', 'France & co')])
+        html = widget.render('country', 'FR')
+        self.assertIn('France &amp; co', html)
+        self.assertIn('selected', html)
+
+    def test_valid_value_checks_the_code_set(self):
+        field = CountryField()
+        self.assertTrue(field.valid_value('FR'))
+        for value in ('fr', 'XX', '', 'France'):
+            self.assertFalse(field.valid_value(value), value)
+        self.assertEqual(field.clean('FR'), 'FR')
+        with self.assertRaises(ValidationError):
+            field.clean('XX')
+
+
+class CityFieldTests(TestCase):
+    class CityForm(forms.Form):
+        city = CityField()
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.fields['city'].set_country('FR')
+
+    def setUp(self):
+        country = Country.objects.create(name='France', name_ascii='France', code2='FR', code3='FRA')
+        other = Country.objects.create(name='Spain', name_ascii='Spain', code2='ES', code3='ESP')
+        self.paris = City.objects.create(name='Paris', name_ascii='Paris', slug='paris', country=country)
+        self.madrid = City.objects.create(name='Madrid', name_ascii='Madrid', slug='madrid', country=other)
+        City.objects.bulk_create([
+            City(name=f'Town {i}', name_ascii=f'Town {i}', slug=f'town-{i}', country=country)
+            for i in range(50)
+        ])
+
+    def test_construction_runs_no_queries(self):
+        with self.assertNumQueries(0):
+            self.CityForm()
+
+    def test_validation_is_a_single_lookup(self):
+        with self.assertNumQueries(1):
+            form = self.CityForm(data={'city': str(self.paris.pk)})
+            self.assertTrue(form.is_valid())
+
+    def test_rejects_city_from_another_country(self):
+        form = self.CityForm(data={'city': str(self.madrid.pk)})
+        self.assertFalse(form.is_valid())
+
+    def test_renders_only_the_selected_city(self):
+        html = str(self.CityForm(data={'city': str(self.paris.pk)})['city'])
+        self.assertEqual(html.count('<option'), 2)
+        self.assertIn('Paris, N/A, France', html)
+
+
+class BulkImportGeoTests(TestCase):
+    COUNTRIES = '# ISO\tISO3\n' + '\t'.join([
+        'FR', 'FRA', '250', 'FR', 'France', 'Paris', '547030', '64768389', 'EU', '.fr', 'EUR', 'Euro',
+        '33', '#####', '', 'fr-FR', '3017382', 'CH,DE', '',
+    ]) + '\n'
+    REGIONS = 'FR.11\tÎle-de-France\tIle-de-France\t3012874\n'
+
+    def city_line(self, geoname_id, name, population, feature_code='PPL'):
+        return '\t'.join([
+            str(geoname_id), name, name, '', '48.85341', '2.3488', 'P', feature_code, 'FR', '', '11', '75',
+            '', '', str(population), '', '42', 'Europe/Paris', '2024-01-01',
+        ]) + '\n'
+
+    def write_dumps(self, cities):
+        for filename, content in [('countryInfo.txt', self.COUNTRIES), ('admin1CodesASCII.txt', self.REGIONS),
+                                  ('cities15000.txt', ''.join(cities))]:
+            with open(os.path.join(self.data_dir, filename), 'w', encoding='utf-8') as handle:
+                handle.write(content)
+
+    def run_import(self):
+        out = StringIO()
+        call_command('bulk_import_geo', data_dir=self.data_dir, chunk_size=2, stdout=out)
+        return out.getvalue()
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.data_dir = tmp.name
+        # Hand-made rows without geoname ids are adopted rather than duplicated
+        self.france = Country.objects.create(name='France', name_ascii='France', code2='FR', code3='FRA')
+        City.objects.create(name='Paris', name_ascii='Paris', slug='paris', country=self.france)
+
+    def test_imports_and_adopts_existing_rows(self):
+        self.write_dumps([
+            self.city_line(2988507, 'Paris', 2138551, 'PPLC'),
+            self.city_line(2996944, 'Lyon', 522969),
+            self.city_line(6455259, 'Paris 01 Louvre', 0, 'PPLX'),
+        ])
+        output = self.run_import()
+
+        self.assertIn('rows/s', output)
+        self.assertEqual(Country.objects.get().geoname_id, 3017382)
+        region = Region.objects.get()
+        self.assertEqual(region.display_name, 'Île-de-France, France')
+        paris = City.objects.get(name='Paris')
+        self.assertEqual(paris.geoname_id, 2988507)
+        self.assertEqual(paris.region, region)
+        self.assertEqual(paris.display_name, 'Paris, Île-de-France, France')
+        self.assertIn('parisfrance', paris.search_names)
+        self.assertEqual(City.objects.count(), 2)
+
+    def test_reimport_only_touches_changed_rows(self):
+        self.write_dumps([self.city_line(2988507, 'Paris', 2138551), self.city_line(2996944, 'Lyon', 522969)])
+        self.run_import()
+        self.write_dumps([self.city_line(2988507, 'Paris', 2138552), self.city_line(2996944, 'Lyon', 522969)])
+
+        output = self.run_import()
+
+        self.assertIn('cities: 2 rows (0 new, 1 updated, 1 unchanged, 0 skipped)', output)
+        self.assertIn('countries: 1 rows (0 new, 0 updated, 1 unchanged', output)
+        self.assertEqual(City.objects.get(name='Paris').population, 2138552)
+
+    def test_rows_dropped_on_conflict_count_as_skipped(self):
+        # Same name in the same region and subregion as Lyon, so its insert is ignored
+        self.write_dumps([self.city_line(2996944, 'Lyon', 522969), self.city_line(9999999, 'Lyon', 1000),
+                          self.city_line(2988507, 'Paris', 2138551)])
+        with open(os.path.join(self.data_dir, 'admin2Codes.txt'), 'w', encoding='utf-8') as handle:
+            handle.write('FR.11.75\tParis\tParis\t2968815\n')
+        output = self.run_import()
+        self.assertIn('cities: 3 rows (1 new, 1 updated, 0 unchanged, 1 skipped)', output)
+        self.assertEqual(City.objects.count(), 2)
+
+
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        profile_store.clear()
+        Country.objects.create(name='France', name_ascii='France', code2='FR', code3='FRA')
+        self.url = reverse('core:get_cities')
+
+    def test_records_queries_and_emits_server_timing(self):
+        response = self.client.get(self.url, {'country_code': 'FR'})
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('desc="2 queries"', response['Server-Timing'])
+        self.client.get(self.url, {'country_code': 'FR'})
+
+        summary = profile_store.summary()['core:get_cities']
+        self.assertEqual(summary['count'], 2)
+        self.assertEqual(summary['queries_p99'], 2)
+        self.assertEqual(summary['queries_p50'], 0)
+
+    def test_times_template_rendering(self):
+        self.client.get(reverse('core:home'))
+        self.assertGreater(profile_store.summary()['core:home']['template_p50'], 0)
+
+    @override_settings(QUERY_BUDGETS={'core:get_cities': 1})
+    def test_exceeding_budget_fails(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'core:get_cities ran 2 queries, budget is 1'):
+            self.client.get(self.url, {'country_code': 'FR'})
+
+    @override_settings(QUERY_BUDGETS={'core:get_cities': 1}, QUERY_BUDGET_RAISE=False)
+    def test_exceeding_budget_only_warns_unless_configured_to_raise(self):
+        with self.assertLogs('core.middleware.profiling', 'WARNING') as logs:
+            response = self.client.get(self.url, {'country_code': 'FR'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('core:get_cities ran 2 queries, budget is 1', logs.output[0])
+
+
+@override_settings(ROOT_URLCONF='core.tests', UPLOAD_MAX_SIZE=200 * 1024)
+class DocumentUploadTests(SimpleTestCase):
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        documents = {'BACKEND': 'core.storage.ContentAddressedStorage', 'OPTIONS': {'location': location}}
+        storages_override = self.settings(STORAGES={**settings.STORAGES, 'documents': documents})
+        storages_override.enable()
+        self.addCleanup(storages_override.disable)
+        self.location = location
+
+    def upload(self, name, content):
+        return self.client.post('/store-document/', {'document': ContentFile(content, name=name)})
+
+    def stored_files(self):
+        return [os.path.join(root, name) for root, _, names in os.walk(self.location) for name in names]
+
+    def test_uploads_are_hashed_while_streaming_and_stored_once(self):
+        content = b'%PDF-1.7\n' + os.urandom(150 * 1024)
+        digest = hashlib.sha256(content).hexdigest()
+        first = self.upload('passport.pdf', content).json()
+        self.assertEqual(first, {'name': f'id_documents/{digest[:2]}/{digest}.pdf', 'sha256': digest,
+                                 'type': 'application/pdf'})
+        self.assertEqual(self.upload('passport-again.PDF', content).json()['name'], first['name'])
+        self.assertEqual(len(self.stored_files()), 1)
+
+    def test_oversized_and_mistyped_uploads_are_rejected(self):
+        response = self.upload('huge.pdf', b'%PDF-1.7\n' + bytes(300 * 1024))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('larger than 200.0', response.json()['error'])
+        self.assertEqual(response.json()['received'], 300 * 1024 + 9)
+        response = self.upload('id.pdf', b'MZ\x90\x00 not really a pdf')
+        self.assertEqual(response.json()['error'], 'Upload a PDF, JPEG, PNG file.')
+        self.assertEqual(self.stored_files(), [])
+
+    def test_files_saved_directly_are_deduplicated(self):
+        storage = document_storage()
+        name = storage.save('partner_docs/a.png', ContentFile(b'\x89PNG\r\n\x1a\nsame'))
+        self.assertEqual(storage.save('partner_docs/b.png', ContentFile(b'\x89PNG\r\n\x1a\nsame')), name)
+        self.assertNotEqual(storage.save('partner_docs/c.png', ContentFile(b'\x89PNG\r\n\x1a\nother')), name)
+
+
+class StoredFileValidationTests(TestCase):
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        documents = {'BACKEND': 'core.storage.ContentAddressedStorage', 'OPTIONS': {'location': location}}
+        storages_override = self.settings(STORAGES={**settings.STORAGES, 'documents': documents})
+        storages_override.enable()
+        self.addCleanup(storages_override.disable)
+        self.user = User.objects.create_user(email='wisher@example.com', password=None, first_name='W',
+                                             country='US', role='wisher')
+
+    def test_stored_files_are_not_read_back(self):
+        docx = document_storage().save('id_documents/id.docx', ContentFile(b'PK\x03\x04 word document'))
+        legacy = WisherProfile.objects.create(user=self.user, id_document=docx)
+        legacy.full_clean()
+        missing = WisherProfile(user=self.user, id_document='id_documents/ab/missing.pdf')
+        missing.full_clean(validate_unique=False)
+        partner = Partner(user=self.user, organization_name='Helpers', logo='partner_logos/ab/missing.png')
+        partner.full_clean(validate_unique=False)
+
+    def test_new_files_are_still_checked(self):
+        profile = WisherProfile(user=self.user, id_document=ContentFile(b'PK\x03\x04 word', name='id.docx'))
+        with self.assertRaisesMessage(ValidationError, 'Upload a PDF, JPEG, PNG file.'):
+            profile.full_clean(validate_unique=False)
+        profile.id_document = ContentFile(b'%PDF-1.7\n', name='id.pdf')
+        profile.full_clean(validate_unique=False)
+
+
+class ThumbnailTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        storages_override = self.settings(MEDIA_ROOT=location, STORAGES={
+            **settings.STORAGES,
+            'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage',
+                        'OPTIONS': {'location': location, 'base_url': '/media/'}},
+            'documents': {'BACKEND': 'core.storage.ContentAddressedStorage',
+                          'OPTIONS': {'location': location, 'base_url': '/media/'}},
+        })
+        storages_override.enable()
+        self.addCleanup(storages_override.disable)
+        self.location = location
+        self.user = User.objects.create_user(email='pic@example.com', password=None, first_name='Pic', country='US')
+
+    def photo(self):
+        # Top half red, bottom half blue, stored sideways: EXIF orientation 6
+        # means "rotate 90 degrees clockwise to display"
+        image = Image.new('RGB', (300, 100), (0, 0, 255))
+        image.paste((255, 0, 0), (0, 0, 300, 50))
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        exif[0x010F] = 'PhoneCam'
+        buffer = BytesIO()
+        image.save(buffer, 'JPEG', exif=exif)
+        return ContentFile(buffer.getvalue(), name='me.jpg')
+
+    def render(self):
+        template = Template('{% load thumbnails %}{% thumbnail user.profile_image 32 alt="Me" class="avatar" %}')
+        return template.render(Context({'user': self.user}))
+
+    def test_derivatives_are_generated_by_the_job_without_exif(self):
+        self.user.profile_image = self.photo()
+        self.user.save()
+        name = self.user.profile_image.name
+        self.assertIn(f'src="/media/{name}"', self.render())
+
+        self.assertEqual(run_pending(), 1)
+        html = self.render()
+        self.assertIn(f'/media/{derivative_name(name, "small", "webp")} 64w', html)
+        self.assertIn(f'src="/media/{derivative_name(name, "small", "jpg")}"', html)
+
+        for size, edge in SIZES.items():
+            for extension in ('webp', 'jpg'):
+                with Image.open(os.path.join(self.location, derivative_name(name, size, extension))) as thumb:
+                    self.assertEqual(thumb.size, (edge, edge))
+                    self.assertEqual(dict(thumb.getexif()), {})
+                    thumb = thumb.convert('RGB')
+                    # Rotated upright: the red top is now the right-hand side
+                    left, right = thumb.getpixel((2, edge // 2)), thumb.getpixel((edge - 3, edge // 2))
+                    self.assertGreater(left[2], left[0])
+                    self.assertGreater(right[0], right[2])
+
+        # Saving the same image again queues nothing
+        self.user.save()
+        self.assertEqual(run_pending(), 0)
+
+    def test_command_fills_in_missing_derivatives(self):
+        User.objects.filter(pk=self.user.pk).update(
+            profile_image=document_storage().save('profiles/me.jpg', self.photo()),
+        )
+        out = StringIO()
+        call_command('generate_thumbnails', stdout=out)
+        self.assertIn(f'{len(SIZES) * 2} thumbnails written for 1 images', out.getvalue())
+        self.user.refresh_from_db()
+        self.assertIn('<picture>', self.render())
+
+    def test_pending_images_are_checked_once_per_pending_timeout(self):
+        User.objects.filter(pk=self.user.pk).update(
+            profile_image=document_storage().save('profiles/me.jpg', self.photo()),
+        )
+        self.user.refresh_from_db()
+        with mock.patch('django.core.files.storage.FileSystemStorage.exists', autospec=True,
+                        return_value=False) as exists:
+            for _ in range(5):
+                self.assertNotIn('<picture>', self.render())
+        self.assertEqual(exists.call_count, 1)
+
+
+class StaticPipelineTests(SimpleTestCase):
+    def setUp(self):
+        source, root = tempfile.mkdtemp(), tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, source)
+        self.addCleanup(shutil.rmtree, root)
+        os.makedirs(os.path.join(source, 'dist'))
+        self.css = b''.join(b'.c%d{margin:%dpx}' % (i, i % 7) for i in range(500))
+        with open(os.path.join(source, 'dist', 'app.css'), 'wb') as f:
+            f.write(self.css)
+        static_override = self.settings(
+            STATIC_ROOT=root, STATICFILES_DIRS=[source],
+            STORAGES={**settings.STORAGES,
+                      'staticfiles': {'BACKEND': 'core.storage.CompressedManifestStaticFilesStorage'}},
+        )
+        static_override.enable()
+        self.addCleanup(static_override.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+        self.url = Template("{% load static %}{% static 'dist/app.css' %}").render(Context())
+
+    def test_hashed_files_are_precompressed_and_cached_for_a_year(self):
+        self.assertRegex(self.url, r'^/static/dist/app\.[0-9a-f]{12}\.css$')
+        response = self.client.get(self.url, headers={'Accept-Encoding': 'br;q=0, gzip, deflate'})
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css; charset=utf-8')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        # SecurityMiddleware runs first; assets are not downloads
+        self.assertEqual(response['X-Content-Type-Options'], 'nosniff')
+        self.assertNotIn('Content-Disposition', response)
+        body = b''.join(response.streaming_content)
+        self.assertLess(len(body), len(self.css) / 4)
+        self.assertEqual(gzip.decompress(body), self.css)
+
+        response = self.client.get(self.url, headers={'If-None-Match': response['ETag'],
+                                                      'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 304)
+
+    def test_unhashed_names_get_a_short_lifetime_and_identity_encoding(self):
+        response = self.client.get('/static/dist/app.css')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=60')
+        self.assertNotIn('Content-Encoding', response)
+        self.assertEqual(b''.join(response.streaming_content), self.css)
+        self.assertEqual(self.client.get('/static/../manage.py').status_code, 404)
+
+
+class DatabaseProfileTests(SimpleTestCase):
+    def test_sqlite_production_profile(self):
+        config = database_from_url('sqlite:///db.sqlite3', 'production', base_dir='/srv/wishchain')
+        self.assertEqual(config['NAME'], '/srv/wishchain/db.sqlite3')
+        self.assertEqual(config['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+        self.assertIn('journal_mode=WAL', config['OPTIONS']['init_command'])
+        self.assertEqual(database_from_url('sqlite:////var/db.sqlite3')['NAME'], '/var/db.sqlite3')
+
+    def test_postgres_persistent_connections_or_pool(self):
+        config = database_from_url('postgres://wish:p%40ss@db:5433/wishchain', 'production')
+        self.assertEqual((config['USER'], config['PASSWORD'], config['HOST'], config['PORT']),
+                         ('wish', 'p@ss', 'db', '5433'))
+        self.assertEqual((config['CONN_MAX_AGE'], config['CONN_HEALTH_CHECKS']), (60, True))
+        with mock.patch.dict(os.environ, {'DB_POOL_SIZE': '20'}):
+            config = database_from_url('postgres://db/wishchain', 'production')
+        self.assertEqual(config['OPTIONS']['pool']['max_size'], 20)
+        self.assertNotIn('CONN_MAX_AGE', config)
+        self.assertNotIn('OPTIONS', database_from_url('postgres://db/wishchain'))
+
+    def test_unknown_profile_is_rejected(self):
+        with self.assertRaises(ValueError):
+            database_from_url('sqlite:///db.sqlite3', 'fast')
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def test_counts_exactly_up_to_the_limit_then_estimates(self):
+        for i in range(5):
+            User.objects.create_user(email=f'user{i}@example.com', password=None, country='US')
+        self.assertEqual(EstimatedCountPaginator(User.objects.all(), 2).count, 5)
+        with mock.patch('core.admin_mixins.COUNT_LIMIT', 3), \
+                mock.patch('core.admin_mixins.estimate_count', return_value=2_000_000):
+            self.assertEqual(EstimatedCountPaginator(User.objects.all(), 2).count, 2_000_000)
+            # Filtered lists are capped instead
+            self.assertEqual(EstimatedCountPaginator(User.objects.filter(country='US'), 2).count, 3)
+        self.assertGreaterEqual(estimate_count(User), 5)
+
+
+class CacheHelperTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_bumping_a_namespace_changes_dependent_keys(self):
+        key = versioned_key('page:home', ('wishes', 'donations'), 'en')
+        self.assertEqual(key, versioned_key('page:home', ('wishes', 'donations'), 'en'))
+        bump_namespace('donations')
+        self.assertNotEqual(key, versioned_key('page:home', ('wishes', 'donations'), 'en'))
+
+    def test_wish_and_donation_writes_bump_their_namespace_once(self):
+        def bumps(action):
+            before = namespace_versions('wishes', 'donations')
+            action()
+            return [after - old for old, after in zip(before, namespace_versions('wishes', 'donations'))]
+
+        wisher = User.objects.create_user(email='w@example.com', password=None, first_name='W', country='US')
+        donor = User.objects.create_user(email='d@example.com', password=None, first_name='D', country='US')
+        wish = Wish.objects.create(title='Books', description='School books', user=wisher)
+        self.assertEqual(bumps(lambda: Wish.objects.create(title='Pens', description='Pens', user=wisher)), [1, 0])
+
+        def edit():
+            wish.title = 'New books'
+            wish.save()
+
+        self.assertEqual(bumps(edit), [1, 0])
+        # The conditional update() sends wish_status_changed itself
+        self.assertEqual(bumps(lambda: grant_wish(wish.pk, donor)), [1, 1])
+        self.assertEqual(bumps(lambda: wish.donations.all().delete()), [0, 1])
+        self.assertEqual(bumps(wish.delete), [1, 0])
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+        results = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return 'value'
+
+        threads = [
+            threading.Thread(target=lambda: results.append(get_or_compute('slow', compute)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['value'] * 8)
+
+    def test_waiters_stop_waiting_when_the_holder_caches_nothing(self):
+        results = []
+
+        def compute():
+            time.sleep(0.1)
+            return None
+
+        threads = [
+            threading.Thread(target=lambda: results.append(get_or_compute('uncacheable', compute)))
+            for _ in range(4)
+        ]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Each waiter takes the released lock in turn instead of sitting out LOCK_TIMEOUT
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(results, [None] * 4)
+
+    def test_stale_value_is_served_while_another_worker_recomputes(self):
+        get_or_compute('stats', lambda: 'old', timeout=-1)
+        cache.add('stats:lock', 1)
+        self.assertEqual(get_or_compute('stats', lambda: 'new'), 'old')
+        cache.delete('stats:lock')
+        self.assertEqual(get_or_compute('stats', lambda: 'new'), 'new')
+
+
+class HomePageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_anonymous_home_is_rendered_once_until_the_snapshot_changes(self):
+        with mock.patch.object(HomeView, 'get_context_data', autospec=True,
+                               side_effect=HomeView.get_context_data) as context:
+            first = self.client.get('/')
+            second = self.client.get('/')
+            self.assertEqual(context.call_count, 1)
+            self.assertEqual(first.content, second.content)
+
+            wisher = User.objects.create_user(email='w@example.com', password=None, first_name='W', country='US')
+            Wish.objects.create(title='Books', description='School books', user=wisher)
+            self.client.get('/')
+            self.assertEqual(context.call_count, 1)
+            refresh_impact_snapshot()
+            self.assertContains(self.client.get('/'), 'Wished by W')
+            self.assertEqual(context.call_count, 2)
+
+            self.client.force_login(wisher)
+            self.client.get('/')
+            self.assertEqual(context.call_count, 3)
+
+    def test_anonymous_register_choice_is_cached(self):
+        url = reverse('core:register')
+        first = self.client.get(url)
+        with self.assertNumQueries(0), mock.patch.object(RegistrationTypeView, 'get_context_data') as context:
+            second = self.client.get(url)
+        context.assert_not_called()
+        self.assertEqual(first.content, second.content)
@@ -0,0 +1,103 @@
+"""
+Upload handling that never holds a whole file in memory.
+
+``HashingUploadHandler`` replaces Django's memory and temporary-file
+handlers. Every upload is written to a temporary file a chunk at a time
+while the chunks feed a SHA-256 digest, and the first chunk is sniffed
+for the real content type. The finished file carries both as ``sha256``
+and ``detected_type``, so ``ContentAddressedStorage`` can name it and
+``UploadValidator`` can check it without reading it again.
+
+An upload that grows past UPLOAD_MAX_SIZE is dropped as soon as it does:
+its temporary file is deleted, the rest of the stream is discarded, and
+the form sees a ``RejectedUpload`` whose ``rejection`` says why.
+"""
+import hashlib
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile, UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+from django.template.defaultfilters import filesizeformat
+
+# Leading bytes that identify the types we accept; enough for all of them
+SNIFF_BYTES = 12
+SIGNATURES = [
+    (b'%PDF-', 'application/pdf'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+]
+
+
+def sniff_content_type(head):
+    """The content type the leading bytes ``head`` identify, or None."""
+    for signature, content_type in SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    return None
+
+
+class RejectedUpload(UploadedFile):
+    """Stands in for an upload that was dropped while streaming; it has no content."""
+
+    sha256 = None
+    detected_type = None
+
+    def __init__(self, name, content_type, size, rejection):
+        super().__init__(BytesIO(), name, content_type, size)
+        self.rejection = rejection
+
+
+class HashingUploadHandler(FileUploadHandler):
+    chunk_size = 64 * 2 ** 10
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.max_size = settings.UPLOAD_MAX_SIZE
+        self.received = 0
+        self.digest = hashlib.sha256()
+        self.detected_type = None
+        self.rejection = None
+        self.file = TemporaryUploadedFile(
+            self.file_name, self.content_type, 0, self.charset, self.content_type_extra
+        )
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.rejection:
+            return None
+        if start == 0:
+            self.detected_type = sniff_content_type(raw_data[:SNIFF_BYTES])
+        if self.received > self.max_size:
+            self.rejection = f'The file is larger than {filesizeformat(self.max_size)}.'
+            self.discard()
+            return None
+        self.digest.update(raw_data)
+        self.file.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if self.rejection:
+            return RejectedUpload(self.file_name, self.content_type, file_size, self.rejection)
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.sha256 = self.digest.hexdigest()
+        self.file.detected_type = self.detected_type
+        return self.file
+
+    def upload_interrupted(self):
+        if hasattr(self, 'file'):
+            self.discard()
+
+    def discard(self):
+        temp_location = self.file.temporary_file_path()
+        try:
+            self.file.close()
+            os.remove(temp_location)
+        except FileNotFoundError:
+            pass
@@ -1,13 +1,16 @@
+from django.conf import settings
 from django.urls import path, include
 from django.contrib.auth import views as auth_views
 from ..views import (
-    HomeView, LoginView, logout_view, profile,
+    HomeView, LoginView, logout_view, profile, ProfilingSummaryView,
     DonorRegisterView, WisherRegisterView, RegistrationTypeView
 )
-from ..views.registration.views_ajax import GetCitiesView
+from ..views.registration.views_ajax import AsyncGetCitiesView, GetCitiesView
 
 app_name = 'core'
 
+cities_view = AsyncGetCitiesView if settings.ASYNC_VIEWS else GetCitiesView
+
 urlpatterns = [
     path('', HomeView.as_view(), name='home'),
     
@@ -19,10 +22,13 @@ urlpatterns = [
     path('logout/', logout_view, name='logout'),
     
     # AJAX Endpoints
-    path('get-cities/', GetCitiesView.as_view(), name='get_cities'),
+    path('get-cities/', cities_view.as_view(), name='get_cities'),
     
     # Profile
     path('profile/', profile, name='profile'),
+
+    # Staff-only request profiling summary
+    path('profiling/', ProfilingSummaryView.as_view(), name='profiling_summary'),
     
     # Password Reset
     path('password_reset/', 
@@ -0,0 +1,17 @@
+"""Small helpers shared by the apps' management commands."""
+from contextlib import contextmanager
+
+from django.db import transaction
+
+
+@contextmanager
+def rolled_back(using=None):
+    """
+    Run the block in a transaction that is always rolled back.
+
+    Benchmark commands seed their synthetic data inside it, so measuring
+    leaves the database as it was.
+    """
+    with transaction.atomic(using=using):
+        yield
+        transaction.set_rollback(True, using=using)
@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models.fields.files import FieldFile
+from django.template.defaultfilters import filesizeformat
+from django.utils.deconstruct import deconstructible
+
+from core.uploads import SNIFF_BYTES, sniff_content_type
+
+DOCUMENT_TYPES = ('application/pdf', 'image/jpeg', 'image/png')
+IMAGE_TYPES = ('image/jpeg', 'image/png', 'image/gif', 'image/webp')
+
+
+def fresh_upload(file):
+    """
+    The new file behind ``file``, or None if it is already in storage.
+
+    A model's FieldFile is validated on every ``full_clean``; once its file
+    is committed it was checked on the way in, and reading it back would
+    fail on a missing file or block edits to rows with older types.
+    """
+    if isinstance(file, FieldFile):
+        return None if file._committed else file.file
+    return file
+
+
+def detected_type(file):
+    """The sniffed content type of ``file``; reads only its first bytes if not already known."""
+    if hasattr(file, 'detected_type'):
+        return file.detected_type
+    position = file.tell() if not file.closed else None
+    file.open('rb')
+    file.seek(0)
+    head = file.read(SNIFF_BYTES)
+    file.seek(position or 0)
+    return sniff_content_type(head)
+
+
+@deconstructible
+class UploadValidator:
+    """
+    Check an uploaded file's size and real content type.
+
+    Both come from the upload handler, which measured and sniffed the
+    stream; the file's name and the browser's Content-Type are not trusted.
+    """
+
+    def __init__(self, content_types, max_size=None):
+        self.content_types = tuple(content_types)
+        self.max_size = max_size
+
+    def __call__(self, file):
+        file = fresh_upload(file)
+        if file is None:
+            return
+        rejection = getattr(file, 'rejection', None)
+        if rejection:
+            raise ValidationError(rejection, code='rejected')
+        max_size = self.max_size or settings.UPLOAD_MAX_SIZE
+        if file.size > max_size:
+            raise ValidationError(f'The file is larger than {filesizeformat(max_size)}.', code='file_too_large')
+        if detected_type(file) not in self.content_types:
+            allowed = ', '.join(content_type.split('/')[1].upper() for content_type in self.content_types)
+            raise ValidationError(f'Upload a {allowed} file.', code='invalid_file_type')
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, UploadValidator)
+            and self.content_types == other.content_types
+            and self.max_size == other.max_size
+        )
@@ -1,5 +1,6 @@
 from .home import HomeView
 from .auth_views import LoginView, RegisterView, logout_view, profile
+from .profiling import ProfilingSummaryView
 from .registration.views import DonorRegisterView, WisherRegisterView, RegistrationTypeView
 
 __all__ = [
@@ -8,6 +9,7 @@ __all__ = [
     'RegisterView',
     'logout_view',
     'profile',
+    'ProfilingSummaryView',
     'DonorRegisterView',
     'WisherRegisterView',
     'RegistrationTypeView'
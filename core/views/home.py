@@ -1,20 +1,24 @@
 from django.views.generic import TemplateView
-from django.db.models import Count
+from django.utils.decorators import method_decorator
 
+from core.cache import cache_public_page
+from core.middleware.profiling import query_budget
+from donations.services.impact import NAMESPACE as IMPACT_NAMESPACE, get_impact_snapshot
+
+
+@query_budget(3)
+@method_decorator(cache_public_page('home', namespaces=(IMPACT_NAMESPACE,)), name='dispatch')
 class HomeView(TemplateView):
     template_name = 'core/home.html'
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Get some stats for the homepage
+        # Stats and featured wishes come from one row kept by refresh_impact_snapshot
+        snapshot = get_impact_snapshot()
         context.update({
-            'featured_wishes': [],  # Will be populated when we have the Wish model
-            'stats': {
-                'wishes_granted': 0,  # Will be updated when we have data
-                'donors_count': 0,    # Will be updated when we have users
-                'countries_count': 0,  # Will be updated with location data
-            },
+            'featured_wishes': snapshot.featured_wishes,
+            'stats': snapshot.stats,
             'how_it_works': [
                 {
                     'title': 'Make a Wish',
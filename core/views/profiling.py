@@ -0,0 +1,14 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+
+from core.middleware.profiling import profile_store
+
+
+@method_decorator(staff_member_required, name='dispatch')
+class ProfilingSummaryView(View):
+    """Rolling per-URL percentiles collected by ProfilingMiddleware in this process."""
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse({'views': profile_store.summary()})
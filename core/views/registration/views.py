@@ -3,6 +3,8 @@ from django.views.generic import CreateView, TemplateView
 from django.urls import reverse_lazy, reverse
 from django.contrib.auth import login
 from django.contrib import messages
+from django.utils.decorators import method_decorator
+from core.cache import cache_public_page
 # Direct import with the full module path
 from core.forms.auth_forms import DonorRegistrationForm, WisherRegistrationForm
 
@@ -218,6 +220,7 @@ class WisherRegisterView(BaseRegisterView):
         
         return super().form_invalid(form)
 
+@method_decorator(cache_public_page('register'), name='dispatch')
 class RegistrationTypeView(TemplateView):
     """
     View to select registration type (Donor or Wisher).
@@ -1,55 +1,81 @@
 import logging
-from django.http import JsonResponse
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse
+from django.utils.cache import patch_cache_control
 from django.views import View
 from django.utils.translation import gettext_lazy as _
-from cities_light.models import City, Country
+from core.middleware.profiling import query_budget
+from core.services.cities import (
+    DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, aget_city_index, aget_version, aresolve_country,
+    get_city_index, get_version, payload_etag, resolve_country
+)
 
 logger = logging.getLogger(__name__)
 
+@query_budget(2)
 class GetCitiesView(View):
-    """View to get cities for a given country code or name."""
+    """
+    View to get cities for a given country code or name.
+
+    Optional ``q`` narrows the list to cities whose name starts with it,
+    returning at most ``limit`` results.
+    """
+    cache_max_age = 60 * 60
+
     def get(self, request, *args, **kwargs):
-        country_code = request.GET.get('country_code', '').upper()
-        
+        country_code = request.GET.get('country_code', '').strip().upper()
+
         if not country_code:
             return JsonResponse({'error': _('Country code is required')}, status=400)
-        
-        logger.info(f"Looking up cities for country code: {country_code}")
-        
-        # Try to find the country by different fields
-        country = (
-            Country.objects.filter(code2=country_code).first() or
-            Country.objects.filter(name__iexact=country_code).first() or
-            Country.objects.filter(name_ascii__iexact=country_code).first()
-        )
-        
+
+        version = get_version()
+        country = resolve_country(country_code, version)
+
         if not country:
             logger.warning(f"Country not found for code/name: {country_code}")
             return JsonResponse({'cities': []})
-        
-        logger.info(f"Found country: {country.name} (code2: {country.code2}, code3: {getattr(country, 'code3', 'N/A')})")
-        
-        # Get cities for the country
-        cities = City.objects.filter(country=country)\
-                           .order_by('name')\
-                           .values('id', 'name', 'region__name')
-        
-        logger.info(f"Found {cities.count()} cities for {country.name}")
-        
-        # Format cities as (id, display_name)
-        city_choices = [
-            {
-                'id': city['id'],
-                'name': f"{city['name']}, {city['region__name']}" if city['region__name'] else city['name']
-            }
-            for city in cities
-        ]
-        
-        return JsonResponse({
-            'cities': city_choices,
-            'debug': {
-                'country': country.name,
-                'code2': country.code2,
-                'total_cities': len(city_choices)
-            }
-        })
+
+        return cities_response(request, get_city_index(country, version), self.cache_max_age)
+
+
+@query_budget(2)
+class AsyncGetCitiesView(View):
+    """Async version of GetCitiesView, routed in its place under ASGI."""
+    cache_max_age = GetCitiesView.cache_max_age
+
+    async def get(self, request, *args, **kwargs):
+        country_code = request.GET.get('country_code', '').strip().upper()
+
+        if not country_code:
+            return JsonResponse({'error': _('Country code is required')}, status=400)
+
+        version = await aget_version()
+        country = await aresolve_country(country_code, version)
+
+        if not country:
+            logger.warning(f"Country not found for code/name: {country_code}")
+            return JsonResponse({'cities': []})
+
+        index = await aget_city_index(country, version)
+        return cities_response(request, index, self.cache_max_age)
+
+
+def cities_response(request, index, cache_max_age):
+    """Serve the country's city list, or the ``q`` prefix matches, with an ETag."""
+    query = request.GET.get('q', '').strip()
+    if query:
+        try:
+            limit = min(int(request.GET.get('limit', DEFAULT_SEARCH_LIMIT)), MAX_SEARCH_LIMIT)
+        except ValueError:
+            limit = DEFAULT_SEARCH_LIMIT
+        payload = index.search_payload(query, max(limit, 1))
+        etag = payload_etag(payload)
+    else:
+        payload, etag = index.payload, index.etag
+
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(payload, content_type='application/json')
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=cache_max_age)
+    return response
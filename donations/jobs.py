@@ -0,0 +1,51 @@
+"""
+Follow-up work for a grant, run by the job worker after the grant commits.
+
+Both jobs are idempotent: ``record_donation`` recounts rather than
+increments, and ``notify_wisher`` claims the donation's
+``wisher_notified_at`` before sending.
+"""
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import IntegrityError, transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from donations.models.donation import Donation
+from jobs.registry import job
+from partners.models import DonorProfile
+from partners.services.scoring import score_donors
+
+
+@job('donations.record_donation')
+def record_donation(donor_id):
+    """Bring the donor's profile counters and impact score up to date."""
+    total = Donation.objects.filter(donor_id=donor_id).count()
+    if not DonorProfile.objects.filter(user_id=donor_id).update(total_donations=total):
+        try:
+            with transaction.atomic():
+                DonorProfile.objects.create(user_id=donor_id, total_donations=total)
+        except IntegrityError:
+            # Created concurrently, e.g. by the donor saving their profile
+            DonorProfile.objects.filter(user_id=donor_id).update(total_donations=total)
+    score_donors(user_ids=[donor_id])
+
+
+@job('donations.notify_wisher')
+def notify_wisher(donation_id):
+    """Email the wisher that their wish was granted, once."""
+    claimed = Donation.objects.filter(pk=donation_id, wisher_notified_at__isnull=True).update(
+        wisher_notified_at=timezone.now(),
+    )
+    if not claimed:
+        return
+    donation = Donation.objects.select_related('wish__user').get(pk=donation_id)
+    wisher = donation.wish.user
+    context = {'wish': donation.wish, 'wisher': wisher}
+    # A failed send raises, rolling back the claim so the retry sends again
+    send_mail(
+        render_to_string('donations/emails/wish_granted_subject.txt', context).strip(),
+        render_to_string('donations/emails/wish_granted_email.txt', context),
+        settings.DEFAULT_FROM_EMAIL,
+        [wisher.email],
+    )
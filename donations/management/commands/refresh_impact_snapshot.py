@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from donations.services.impact import BATCH_SIZE, get_impact_snapshot, refresh_impact_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Fold new donations into the homepage impact statistics (run it from cron every few minutes)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recount every donation instead of only new ones')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Donations read per query')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        processed = refresh_impact_snapshot(full=options['full'], batch_size=max(options['batch_size'], 1))
+        snapshot = get_impact_snapshot()
+        self.stdout.write(self.style.SUCCESS(
+            f'{processed} donations processed in {time.perf_counter() - started:.2f}s: '
+            f'{snapshot.wishes_granted} wishes granted, {snapshot.donors_count} donors, '
+            f'{snapshot.countries_count} countries (watermark {snapshot.last_donation_id})'
+        ))
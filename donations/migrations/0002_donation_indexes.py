@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-18 15:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['donor', '-created_at'], name='donation_donor_created_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-10-18 16:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0002_donation_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImpactSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(default='global', max_length=64, unique=True)),
+                ('wishes_granted', models.IntegerField(default=0)),
+                ('donors_count', models.IntegerField(default=0)),
+                ('countries', models.JSONField(default=list, help_text='Distinct countries of wishers whose wishes were granted')),
+                ('featured_wishes', models.JSONField(default=list, help_text='Card data for the newest pending wishes')),
+                ('last_donation_id', models.BigIntegerField(default=0, help_text='Watermark: donations up to this id are counted')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Impact Snapshot',
+                'verbose_name_plural': 'Impact Snapshots',
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-18 16:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0003_impactsnapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='donation',
+            name='donation_donor_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['donor', '-created_at', '-id'], name='donation_donor_created_idx'),
+        ),
+    ]
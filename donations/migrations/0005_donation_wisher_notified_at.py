@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 16:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0004_donation_history_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='donation',
+            name='wisher_notified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 17:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0005_donation_wisher_notified_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='impactsnapshot',
+            name='recent_donation_ids',
+            field=models.JSONField(default=list, help_text='Donations counted within the overlap window below the watermark'),
+        ),
+    ]
@@ -1,4 +1,4 @@
 from .donation import Donation
+from .impact_snapshot import ImpactSnapshot
 
-__all__ = ['Donation']
-
+__all__ = ['Donation', 'ImpactSnapshot']
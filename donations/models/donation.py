@@ -2,6 +2,16 @@ from django.db import models
 from django.conf import settings
 from wishes.models.wish import Wish
 
+
+class DonationQuerySet(models.QuerySet):
+    # Columns rendered by donations/dashboard.html
+    HISTORY_FIELDS = ('id', 'created_at', 'notes', 'donor_id', 'wish__id', 'wish__title', 'wish__status')
+
+    def for_history(self):
+        """Donor history rows with the wish joined in, one query per page."""
+        return self.select_related('wish').only(*self.HISTORY_FIELDS)
+
+
 class Donation(models.Model):
     """Model to track donations/grants of wishes"""
     wish = models.ForeignKey(
@@ -21,12 +31,20 @@ class Donation(models.Model):
         null=True,
         help_text='Optional notes about the donation'
     )
+    # Set by the notify_wisher job when it sends the email
+    wisher_notified_at = models.DateTimeField(null=True, blank=True)
+
+    objects = DonationQuerySet.as_manager()
     
     class Meta:
         verbose_name = 'Donation'
         verbose_name_plural = 'Donations'
         ordering = ['-created_at']
-        unique_together = ['wish', 'donor']  # Prevent duplicate donations
+        unique_together = ['wish', 'donor']  # Prevent duplicate donations; also indexes (wish, donor)
+        indexes = [
+            # Donor dashboard history, paged by (created_at, id)
+            models.Index(fields=['donor', '-created_at', '-id'], name='donation_donor_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.donor.email} granted '{self.wish.title}'"
@@ -0,0 +1,46 @@
+from django.db import models
+
+
+class ImpactSnapshot(models.Model):
+    """Materialized homepage statistics, refreshed by refresh_impact_snapshot"""
+    GLOBAL_KEY = 'global'
+
+    key = models.CharField(max_length=64, unique=True, default=GLOBAL_KEY)
+    wishes_granted = models.IntegerField(default=0)
+    donors_count = models.IntegerField(default=0)
+    countries = models.JSONField(
+        default=list,
+        help_text='Distinct countries of wishers whose wishes were granted'
+    )
+    featured_wishes = models.JSONField(
+        default=list,
+        help_text='Card data for the newest pending wishes'
+    )
+    last_donation_id = models.BigIntegerField(
+        default=0,
+        help_text='Watermark: donations up to this id are counted'
+    )
+    recent_donation_ids = models.JSONField(
+        default=list,
+        help_text='Donations counted within the overlap window below the watermark'
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Impact Snapshot'
+        verbose_name_plural = 'Impact Snapshots'
+
+    def __str__(self):
+        return f"{self.key}: {self.wishes_granted} wishes granted"
+
+    @property
+    def countries_count(self):
+        return len(self.countries)
+
+    @property
+    def stats(self):
+        return {
+            'wishes_granted': self.wishes_granted,
+            'donors_count': self.donors_count,
+            'countries_count': self.countries_count,
+        }
@@ -0,0 +1,15 @@
+from .grants import AlreadyGranted, GrantError, WishNotFound, WishUnavailable, grant_wish
+from .history import HistoryPage, get_donation_history
+from .impact import get_impact_snapshot, refresh_impact_snapshot
+
+__all__ = [
+    'AlreadyGranted',
+    'GrantError',
+    'HistoryPage',
+    'WishNotFound',
+    'WishUnavailable',
+    'get_donation_history',
+    'get_impact_snapshot',
+    'grant_wish',
+    'refresh_impact_snapshot',
+]
@@ -0,0 +1,74 @@
+from django.db import transaction
+from django.utils import timezone
+
+from donations.jobs import notify_wisher, record_donation
+from donations.models.donation import Donation
+from wishes.models.wish import Wish
+from wishes.signals import wish_status_changed
+
+
+class GrantError(Exception):
+    """Raised when a wish cannot be granted; carries a user-facing message."""
+    status_code = 400
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+class WishNotFound(GrantError):
+    status_code = 404
+
+
+class WishUnavailable(GrantError):
+    pass
+
+
+class AlreadyGranted(GrantError):
+    pass
+
+
+def grant_wish(wish_id, donor):
+    """
+    Mark a pending wish as fulfilled by ``donor`` and return the Donation.
+
+    Everything runs in one transaction. The status flip is a conditional
+    ``UPDATE ... WHERE status = 'pending'``: the database row lock it takes
+    guarantees that of several concurrent grants exactly one matches, and
+    the rest see zero updated rows. The donor's profile and score and the
+    wisher's email are jobs queued in the same transaction (see
+    donations/jobs.py), so they happen only if the grant commits.
+    """
+    with transaction.atomic():
+        updated = Wish.objects.filter(pk=wish_id, status='pending').update(
+            status='fulfilled',
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            raise _explain_failed_grant(wish_id, donor)
+
+        wish = Wish.objects.only('id', 'title', 'user_id').get(pk=wish_id)
+        donation = Donation.objects.create(wish=wish, donor=donor)
+        record_donation.enqueue(key=f'record-donation:{donation.pk}', donor_id=str(donor.pk))
+        notify_wisher.enqueue(key=f'notify-wisher:{donation.pk}', donation_id=donation.pk)
+        wish_status_changed.send(
+            sender=Wish,
+            wish_id=wish.pk,
+            user_id=wish.user_id,
+            old_status='pending',
+            new_status='fulfilled',
+        )
+    return donation
+
+
+def _explain_failed_grant(wish_id, donor):
+    """Work out why the conditional update matched nothing."""
+    status = Wish.objects.filter(pk=wish_id).values_list('status', flat=True).first()
+    if status is None:
+        return WishNotFound('This wish does not exist.')
+    if Donation.objects.filter(wish_id=wish_id, donor=donor).exists():
+        return AlreadyGranted('You have already granted this wish.')
+    if status == 'fulfilled':
+        return WishUnavailable('This wish has already been fulfilled.')
+    return WishUnavailable('This wish is no longer available.')
+
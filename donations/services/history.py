@@ -0,0 +1,54 @@
+from django.db.models import Q
+
+from core.cache import get_or_compute, versioned_key
+from donations.models.donation import Donation
+from wishes.services.feed import DEFAULT_PAGE_SIZE, FIRST_PAGE_TIMEOUT, decode_cursor, encode_cursor
+
+
+class HistoryPage:
+    """One page of a donor's history plus the cursor for the page after it."""
+
+    def __init__(self, donations, next_cursor=None):
+        self.donations = donations
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.donations)
+
+    def __len__(self):
+        return len(self.donations)
+
+
+def get_donation_history(donor, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Return a HistoryPage of ``donor``'s donations, newest first.
+
+    Same keyset scheme as the wish feed: the cursor holds the (created_at,
+    id) of the last row shown, and every page is one range scan of
+    donation_donor_created_idx with the wish joined in. Raises
+    InvalidCursor for a cursor that cannot be decoded. The first page is
+    cached until a wish or donation changes.
+    """
+    if not cursor:
+        key = versioned_key('history', ('wishes', 'donations'), donor.pk, limit)
+        return get_or_compute(key, lambda: _load_history(donor, None, limit), FIRST_PAGE_TIMEOUT)
+    return _load_history(donor, cursor, limit)
+
+
+def _load_history(donor, cursor, limit):
+    queryset = Donation.objects.for_history().filter(donor=donor)
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+        )
+
+    donations = list(queryset.order_by('-created_at', '-id')[:limit + 1])
+    if len(donations) > limit:
+        donations = donations[:limit]
+        return HistoryPage(donations, next_cursor=encode_cursor(donations[-1]))
+    return HistoryPage(donations)
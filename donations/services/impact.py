@@ -0,0 +1,124 @@
+"""
+Homepage impact statistics, materialized in the ImpactSnapshot row.
+
+``refresh_impact_snapshot`` only reads donations newer than the row's
+watermark, less an overlap window, so a periodic refresh costs the same
+however long the site has been running. Ids are allocated before commit,
+so a donation can become visible after a higher id was already counted;
+the window catches it, and ``recent_donation_ids`` keeps the ones inside
+it from being counted twice. ``get_impact_snapshot`` is what pages read: one indexed
+lookup, with the featured wishes already rendered into the row.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import Truncator
+
+from core.cache import bump_namespace
+from donations.models.donation import Donation
+from donations.models.impact_snapshot import ImpactSnapshot
+from wishes.models.wish import Wish
+
+BATCH_SIZE = 5_000
+FEATURED_COUNT = 6
+FEATURED_DESCRIPTION_WORDS = 30
+# Ids below the watermark re-read on each refresh for late commits
+OVERLAP_IDS = 1_000
+# Cache namespace of pages rendered from the snapshot
+NAMESPACE = 'impact'
+
+
+def get_impact_snapshot():
+    """Return the snapshot row, or an empty unsaved one before the first refresh."""
+    snapshot = ImpactSnapshot.objects.filter(key=ImpactSnapshot.GLOBAL_KEY).first()
+    return snapshot or ImpactSnapshot()
+
+
+def _first_seen(field, ids, before, counted):
+    """Return the ``field`` values in ``ids`` with no counted donation: below id ``before`` or in ``counted``."""
+    if not ids:
+        return set()
+    seen = Donation.objects.filter(
+        Q(pk__lt=before) | Q(pk__in=counted), **{f'{field}__in': ids}
+    ).values_list(field, flat=True).distinct()
+    return set(ids) - set(seen)
+
+
+def featured_wishes(count=FEATURED_COUNT):
+    """Card data for the newest pending wishes, ready to store as JSON."""
+    wishes = Wish.objects.for_cards().filter(status='pending').order_by('-created_at', '-id')[:count]
+    return [
+        {
+            'id': wish.pk,
+            'title': wish.title,
+            'description': Truncator(wish.description).words(FEATURED_DESCRIPTION_WORDS),
+            'author': wish.user.first_name,
+            'created_at': wish.created_at.isoformat(),
+        }
+        for wish in wishes
+    ]
+
+
+def _lock_snapshot():
+    try:
+        with transaction.atomic():
+            ImpactSnapshot.objects.get_or_create(key=ImpactSnapshot.GLOBAL_KEY)
+    except IntegrityError:
+        # Another refresh created the row first
+        pass
+    return ImpactSnapshot.objects.select_for_update().get(key=ImpactSnapshot.GLOBAL_KEY)
+
+
+def refresh_impact_snapshot(full=False, batch_size=BATCH_SIZE):
+    """
+    Fold donations made since the last refresh into the snapshot.
+
+    New donations are read in id order, ``batch_size`` at a time, from
+    OVERLAP_IDS below the watermark; ones already counted are skipped. A
+    wish or donor counts once, the first time it appears; countries are
+    kept as a set in the row. Deleted donations are not subtracted, so pass
+    ``full=True`` now and then to recount from scratch. Returns the number
+    of donations processed.
+    """
+    with transaction.atomic():
+        snapshot = _lock_snapshot()
+        before = snapshot.stats, snapshot.featured_wishes
+        if full:
+            snapshot.wishes_granted = snapshot.donors_count = snapshot.last_donation_id = 0
+            snapshot.countries = snapshot.recent_donation_ids = []
+
+        countries = set(snapshot.countries)
+        counted = set(snapshot.recent_donation_ids)
+        cursor = max(0, snapshot.last_donation_id - OVERLAP_IDS)
+        processed = 0
+        while True:
+            rows = list(
+                Donation.objects.filter(pk__gt=cursor)
+                .order_by('pk')
+                .values_list('pk', 'wish_id', 'donor_id', 'wish__user__country')[:batch_size]
+            )
+            if not rows:
+                break
+            new = [row for row in rows if row[0] not in counted]
+            if new:
+                # Everything below this batch is counted by now; from its
+                # first row on, only the ids recorded in the window
+                start = rows[0][0]
+                later = [pk for pk in counted if pk >= start]
+                snapshot.wishes_granted += len(_first_seen('wish_id', {row[1] for row in new}, start, later))
+                snapshot.donors_count += len(_first_seen('donor_id', {row[2] for row in new}, start, later))
+                countries.update(country for *_, country in new if country)
+                counted.update(row[0] for row in new)
+                processed += len(new)
+            cursor = rows[-1][0]
+
+        snapshot.last_donation_id = max(snapshot.last_donation_id, cursor)
+        snapshot.recent_donation_ids = sorted(
+            pk for pk in counted if pk > snapshot.last_donation_id - OVERLAP_IDS
+        )
+        snapshot.countries = sorted(countries)
+        snapshot.featured_wishes = featured_wishes()
+        snapshot.save()
+
+    if (snapshot.stats, snapshot.featured_wishes) != before:
+        bump_namespace(NAMESPACE)
+    return processed
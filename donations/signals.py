@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import bump_namespace
+from donations.models import Donation
+
+
+@receiver(post_save, sender=Donation)
+@receiver(post_delete, sender=Donation)
+def donation_changed(sender, **kwargs):
+    bump_namespace('donations')
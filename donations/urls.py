@@ -1,12 +1,20 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 from .views import grant_wish
 
 app_name = 'donations'
 
+if settings.ASYNC_VIEWS:
+    feed_view, recommended_view = views.AsyncWishFeedView, views.AsyncRecommendedFeedView
+else:
+    feed_view, recommended_view = views.WishFeedView, views.RecommendedFeedView
+
 urlpatterns = [
     # Donation page
     path('donate/', views.DonateView.as_view(), name='donate'),
+    path('donate/feed/', feed_view.as_view(), name='donate_feed'),
+    path('donate/recommended/', recommended_view.as_view(), name='recommended_feed'),
     
     # Donor dashboard
     path('dashboard/', views.DonorDashboardView.as_view(), name='dashboard'),
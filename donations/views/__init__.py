@@ -1,10 +1,16 @@
 # Import views to make them available when importing from donations.views
-from donations.views.donate import DonateView
+from donations.views.donate import (
+    AsyncRecommendedFeedView, AsyncWishFeedView, DonateView, RecommendedFeedView, WishFeedView,
+)
 from donations.views.dashboard import DonorDashboardView
 from donations.views.grant_wish import grant_wish
 
 __all__ = [
     'DonateView',
+    'WishFeedView',
+    'RecommendedFeedView',
+    'AsyncWishFeedView',
+    'AsyncRecommendedFeedView',
     'DonorDashboardView',
     'grant_wish'
 ]
\ No newline at end of file
@@ -1,12 +1,45 @@
 from django.views.generic import TemplateView
 from django.contrib.auth.mixins import LoginRequiredMixin
+from core.middleware.profiling import query_budget
+from donations.services.history import get_donation_history
+from partners.models import DonorProfile
+from wishes.services.feed import InvalidCursor, clamp_page_size
+from wishes.services.recommendations import get_recommended_wishes
+from wishes.services.stats import get_status_counts
 
+RECOMMENDED_COUNT = 6
+
+
+@query_budget(6)
 class DonorDashboardView(LoginRequiredMixin, TemplateView):
     """View for the donor's dashboard."""
     template_name = 'donations/dashboard.html'
-    
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # Add any context data needed for the dashboard
-        # context['donations'] = self.request.user.donations.all()
+        user = self.request.user
+        limit = clamp_page_size(self.request.GET.get('limit'))
+        cursor = self.request.GET.get('cursor')
+
+        try:
+            page = get_donation_history(user, cursor=cursor, limit=limit)
+        except InvalidCursor:
+            # A stale or hand-edited cursor just restarts the history
+            cursor = None
+            page = get_donation_history(user, limit=limit)
+
+        # Totals come from the profile counters kept by the record_donation job, not a recount
+        profile = DonorProfile.objects.filter(user=user).values(
+            'total_donations', 'impact_score', 'giving_focus', 'preferred_categories',
+        ).first() or {}
+        focus_areas = set(profile.get('giving_focus') or []) | set(profile.get('preferred_categories') or [])
+        context.update({
+            'donations': page.donations,
+            'next_cursor': page.next_cursor,
+            'is_first_page': not cursor,
+            'total_donations': profile.get('total_donations', 0),
+            'impact_score': profile.get('impact_score', 0),
+            'recommended_wishes': get_recommended_wishes(focus_areas, limit=RECOMMENDED_COUNT).wishes,
+            'available_wishes_count': get_status_counts()['pending'],
+        })
         return context
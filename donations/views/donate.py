@@ -1,21 +1,173 @@
-from django.views.generic import TemplateView
+from django.views.generic import TemplateView, View
 from django.contrib.auth.mixins import LoginRequiredMixin
-from wishes.models.wish import Wish
+from django.contrib.auth.views import redirect_to_login
+from django.http import JsonResponse
+from django.template.loader import render_to_string
+from core.middleware.profiling import query_budget
+from wishes.services.feed import InvalidCursor, aget_wish_feed, clamp_page_size, get_wish_feed
+from wishes.services.recommendations import (
+    adonor_focus_areas, aget_recommended_wishes, donor_focus_areas, get_recommended_wishes,
+)
+from wishes.services.search import asearch_wishes, search_wishes
+from wishes.services.stats import get_status_counts
 
-class DonateView(LoginRequiredMixin, TemplateView):
+
+class WishFeedMixin:
+    """Reads the feed filters from the query string and loads one page."""
+
+    def get_feed_filters(self):
+        return {
+            'status': self.request.GET.get('status', ''),
+            'query': self.request.GET.get('q', '').strip(),
+        }
+
+    def get_feed_page(self, cursor=None):
+        """
+        Load one page: newest first, or best match first when searching.
+
+        Search results are ranked, so their cursor is just the page number.
+        """
+        filters = self.get_feed_filters()
+        limit = clamp_page_size(self.request.GET.get('limit'))
+        if filters['query']:
+            page = self.search_page_number(cursor)
+            return search_wishes(filters['query'], filters['status'], page=page, limit=limit)
+        return get_wish_feed(status=filters['status'], cursor=cursor, limit=limit)
+
+    async def aget_feed_page(self, cursor=None):
+        """Async version of ``get_feed_page``."""
+        filters = self.get_feed_filters()
+        limit = clamp_page_size(self.request.GET.get('limit'))
+        if filters['query']:
+            page = self.search_page_number(cursor)
+            return await asearch_wishes(filters['query'], filters['status'], page=page, limit=limit)
+        return await aget_wish_feed(status=filters['status'], cursor=cursor, limit=limit)
+
+    @staticmethod
+    def search_page_number(cursor):
+        try:
+            return int(cursor or 1)
+        except ValueError:
+            raise InvalidCursor(cursor)
+
+
+class AsyncLoginRequiredMixin:
+    """LoginRequiredMixin for async views; loads the user with ``request.auser()``."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await super().dispatch(request, *args, **kwargs)
+
+
+@query_budget(6)
+class DonateView(LoginRequiredMixin, WishFeedMixin, TemplateView):
     """View for the donation page."""
     template_name = 'donations/donate.html'
-    
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        
-        # Get all wishes, prioritizing pending ones
-        wishes = Wish.objects.all().order_by('-created_at')
-        
+        filters = self.get_feed_filters()
+
+        try:
+            page = self.get_feed_page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            # A stale or hand-edited cursor just restarts the feed
+            page = self.get_feed_page()
+
+        counts = get_status_counts()
         context.update({
-            'wishes': wishes,
-            'pending_wishes_count': Wish.objects.filter(status='pending').count(),
-            'fulfilled_wishes_count': Wish.objects.filter(status='fulfilled').count(),
-            'total_wishes_count': Wish.objects.count(),
+            'wishes': page.wishes,
+            'next_cursor': page.next_cursor,
+            'search_query': filters['query'],
+            'status_filter': filters['status'],
+            'pending_wishes_count': counts['pending'],
+            'fulfilled_wishes_count': counts['fulfilled'],
+            'total_wishes_count': counts['total'],
         })
         return context
+
+
+@query_budget(4)
+class WishFeedView(LoginRequiredMixin, WishFeedMixin, View):
+    """JSON variant of the donate feed used for infinite scroll."""
+
+    def get(self, request, *args, **kwargs):
+        try:
+            page = self.get_feed_page(request.GET.get('cursor'))
+        except InvalidCursor:
+            return JsonResponse({'error': 'Invalid cursor'}, status=400)
+
+        return feed_response(request, page)
+
+
+@query_budget(4)
+class RecommendedFeedView(LoginRequiredMixin, View):
+    """JSON feed of pending wishes in the donor's focus areas."""
+
+    def get(self, request, *args, **kwargs):
+        try:
+            page = get_recommended_wishes(
+                donor_focus_areas(request.user),
+                cursor=request.GET.get('cursor'),
+                limit=clamp_page_size(request.GET.get('limit')),
+            )
+        except InvalidCursor:
+            return JsonResponse({'error': 'Invalid cursor'}, status=400)
+        return feed_response(request, page)
+
+
+@query_budget(4)
+class AsyncWishFeedView(AsyncLoginRequiredMixin, WishFeedMixin, View):
+    """Async version of WishFeedView, routed in its place under ASGI."""
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            page = await self.aget_feed_page(request.GET.get('cursor'))
+        except InvalidCursor:
+            return JsonResponse({'error': 'Invalid cursor'}, status=400)
+
+        return feed_response(request, page)
+
+
+@query_budget(4)
+class AsyncRecommendedFeedView(AsyncLoginRequiredMixin, View):
+    """Async version of RecommendedFeedView, routed in its place under ASGI."""
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            page = await aget_recommended_wishes(
+                await adonor_focus_areas(await request.auser()),
+                cursor=request.GET.get('cursor'),
+                limit=clamp_page_size(request.GET.get('limit')),
+            )
+        except InvalidCursor:
+            return JsonResponse({'error': 'Invalid cursor'}, status=400)
+        return feed_response(request, page)
+
+
+def feed_response(request, page):
+    """Serialize a page of wish cards for the infinite-scroll script."""
+    html = render_to_string(
+        'donations/partials/wish_cards.html',
+        {'wishes': page.wishes},
+        request=request,
+    )
+    return JsonResponse({
+        'wishes': [
+            {
+                'id': wish.id,
+                'title': wish.title,
+                'description': wish.description,
+                'status': wish.status,
+                'category': wish.category,
+                'created_at': wish.created_at.isoformat(),
+                'author': wish.user.first_name,
+            }
+            for wish in page.wishes
+        ],
+        'html': html,
+        'next_cursor': page.next_cursor,
+        'has_next': page.has_next,
+    })
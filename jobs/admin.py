@@ -0,0 +1,25 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from core.admin_mixins import EstimatedCountMixin, ProjectedListMixin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(EstimatedCountMixin, ProjectedListMixin, admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'max_attempts', 'run_at', 'finished_at', 'created_at')
+    # Leaves out payload and last_error
+    list_only = list_display
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'key')
+    readonly_fields = ('created_at', 'updated_at', 'finished_at', 'locked_by', 'locked_until', 'last_error')
+    date_hierarchy = 'created_at'
+    actions = ['retry_jobs']
+
+    @admin.action(description='Retry selected jobs now')
+    def retry_jobs(self, request, queryset):
+        updated = queryset.exclude(status=Job.RUNNING).update(
+            status=Job.QUEUED, run_at=timezone.now(), attempts=0, finished_at=None,
+        )
+        self.message_user(request, f'{updated} jobs queued again.')
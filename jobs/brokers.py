@@ -0,0 +1,119 @@
+"""
+Job brokers: where queued jobs live between ``enqueue`` and a worker.
+
+Pick one with the ``JOBS_BROKER`` setting (a dotted path). The default,
+``DatabaseBroker``, keeps jobs in the Job table, so it needs no outside
+service and a job enqueued inside a transaction is only visible once that
+transaction commits. Any other broker implements the ``Broker`` methods;
+the jobs it hands out need ``name``, ``payload``, ``attempts`` and
+``max_attempts`` attributes.
+"""
+from datetime import timedelta
+from functools import cache
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from jobs.models import Job
+
+DEFAULT_BROKER = 'jobs.brokers.DatabaseBroker'
+# How long a worker owns a job before others may assume it died
+DEFAULT_LEASE = 5 * 60
+
+
+class Broker:
+    """Interface used by ``enqueue`` and the worker."""
+
+    # True when enqueue() writes through the caller's database transaction.
+    # Other brokers are handed jobs only once that transaction commits.
+    transactional = False
+
+    def enqueue(self, name, payload, key=None, run_at=None, max_attempts=None):
+        raise NotImplementedError
+
+    def reserve(self, worker, limit):
+        """Claim up to ``limit`` due jobs for ``worker``, counting an attempt on each."""
+        raise NotImplementedError
+
+    def complete(self, job):
+        raise NotImplementedError
+
+    def retry(self, job, error, run_at):
+        raise NotImplementedError
+
+    def fail(self, job, error):
+        raise NotImplementedError
+
+    def purge(self, before):
+        """Forget finished jobs older than ``before``; returns how many."""
+        return 0
+
+
+class DatabaseBroker(Broker):
+    """Jobs as rows in the Job table, claimed with conditional UPDATEs."""
+
+    transactional = True
+
+    def __init__(self, lease=None):
+        self.lease = timedelta(seconds=lease or getattr(settings, 'JOBS_LEASE', DEFAULT_LEASE))
+
+    def enqueue(self, name, payload, key=None, run_at=None, max_attempts=None):
+        job = Job(name=name, payload=payload, key=key, run_at=run_at or timezone.now())
+        if max_attempts is not None:
+            job.max_attempts = max_attempts
+        if key is None:
+            job.save()
+            return job
+        try:
+            with transaction.atomic():
+                job.save()
+        except IntegrityError:
+            # Already enqueued under this key
+            return Job.objects.get(key=key)
+        return job
+
+    def reserve(self, worker, limit):
+        # Works the same on every backend: each candidate is claimed by an
+        # UPDATE that only matches while it is still ready, so of several
+        # workers racing for a job exactly one gets it.
+        now = timezone.now()
+        candidates = Job.objects.ready(now).order_by('run_at', 'id').values_list('pk', flat=True)[:limit * 2]
+        claimed = []
+        for pk in candidates:
+            if Job.objects.ready(now).filter(pk=pk).update(
+                status=Job.RUNNING,
+                locked_by=worker,
+                locked_until=now + self.lease,
+                attempts=F('attempts') + 1,
+                updated_at=now,
+            ):
+                claimed.append(pk)
+                if len(claimed) == limit:
+                    break
+        return list(Job.objects.filter(pk__in=claimed).order_by('run_at', 'id'))
+
+    def complete(self, job):
+        self._finish(job, status=Job.DONE, finished_at=timezone.now(), last_error='')
+
+    def retry(self, job, error, run_at):
+        self._finish(job, status=Job.QUEUED, run_at=run_at, last_error=error)
+
+    def fail(self, job, error):
+        self._finish(job, status=Job.FAILED, finished_at=timezone.now(), last_error=error)
+
+    def purge(self, before):
+        # Purged keys may be enqueued again, so keep jobs longer than any retry window
+        deleted, _ = Job.objects.filter(status=Job.DONE, finished_at__lt=before).delete()
+        return deleted
+
+    def _finish(self, job, **fields):
+        Job.objects.filter(pk=job.pk).update(locked_by='', locked_until=None, updated_at=timezone.now(), **fields)
+
+
+@cache
+def get_broker():
+    """The broker named by ``JOBS_BROKER``, created once per process."""
+    return import_string(getattr(settings, 'JOBS_BROKER', DEFAULT_BROKER))()
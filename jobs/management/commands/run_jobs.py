@@ -0,0 +1,36 @@
+import signal
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.brokers import get_broker
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = 'Run a background job worker; start several for more throughput'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--burst', action='store_true', help='Exit once no job is due')
+        parser.add_argument('--batch-size', type=int, default=10, help='Jobs claimed per poll')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to sleep when idle')
+        parser.add_argument('--name', help='Worker name recorded on claimed jobs (default: host:pid)')
+        parser.add_argument('--purge-days', type=int, default=7,
+                            help='Forget finished jobs older than this on startup; 0 keeps them')
+
+    def handle(self, *args, **options):
+        broker = get_broker()
+        if options['purge_days']:
+            purged = broker.purge(timezone.now() - timedelta(days=options['purge_days']))
+            if purged:
+                self.stdout.write(f'Purged {purged} finished jobs.')
+
+        worker = Worker(
+            broker, name=options['name'], batch_size=options['batch_size'], poll_interval=options['poll_interval'],
+        )
+        signal.signal(signal.SIGTERM, worker.stop)
+        signal.signal(signal.SIGINT, worker.stop)
+        self.stdout.write(f'Worker {worker.name} started.')
+        processed = worker.run(burst=options['burst'])
+        self.stdout.write(self.style.SUCCESS(f'Worker {worker.name} stopped after {processed} jobs.'))
@@ -0,0 +1,57 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class JobQuerySet(models.QuerySet):
+    def ready(self, now=None):
+        """Queued jobs that are due, plus running ones whose worker's lease ran out."""
+        now = now or timezone.now()
+        return self.filter(
+            Q(status=Job.QUEUED, run_at__lte=now) | Q(status=Job.RUNNING, locked_until__lt=now)
+        )
+
+
+class Job(models.Model):
+    """A unit of background work, stored by the database broker"""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100)
+    # Enqueuing a key that already exists returns the existing job
+    key = models.CharField(max_length=200, unique=True, null=True, blank=True)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = JobQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Job'
+        verbose_name_plural = 'Jobs'
+        ordering = ['-created_at']
+        indexes = [
+            # Workers poll for due jobs in run_at order
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx'),
+            # Admin date_hierarchy
+            models.Index(fields=['created_at'], name='job_created_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} ({self.status})'
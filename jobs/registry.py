@@ -0,0 +1,56 @@
+"""
+Registering job handlers and enqueuing work for them.
+
+Handlers live in each app's ``jobs.py`` and are found at startup::
+
+    @job('donations.notify_wisher')
+    def notify_wisher(donation_id):
+        ...
+
+    notify_wisher.enqueue(key=f'notify-wisher:{donation.pk}', donation_id=donation.pk)
+
+A job may run more than once (a retry after a partial failure, a worker
+that lost its lease), so handlers must be idempotent. Payloads are JSON.
+"""
+from django.db import transaction
+
+from jobs.brokers import get_broker
+
+DEFAULT_MAX_ATTEMPTS = 5
+
+registry = {}
+
+
+def job(name, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """Register a function as the handler for jobs called ``name``."""
+    def decorator(func):
+        if name in registry:
+            raise ValueError(f'Job {name!r} is already registered')
+        func.job_name = name
+        func.max_attempts = max_attempts
+        func.enqueue = lambda key=None, run_at=None, **payload: enqueue(name, key=key, run_at=run_at, **payload)
+        registry[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, key=None, run_at=None, **payload):
+    """
+    Queue a ``name`` job with ``payload`` as its keyword arguments.
+
+    Jobs with a ``key`` are enqueued at most once per key. Inside a
+    transaction the job only becomes visible when it commits: through the
+    same transaction for the database broker, on commit for others.
+    """
+    handler = registry.get(name)
+    if handler is None:
+        raise LookupError(f'No job registered as {name!r}')
+    broker = get_broker()
+
+    def send():
+        return broker.enqueue(name, payload, key=key, run_at=run_at, max_attempts=handler.max_attempts)
+
+    if broker.transactional:
+        return send()
+    transaction.on_commit(send)
+    return None
@@ -0,0 +1,93 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.registry import enqueue, job
+from jobs.worker import Worker, backoff, run_pending
+
+calls = []
+
+
+@job('tests.record', max_attempts=3)
+def record(value):
+    calls.append(value)
+
+
+@job('tests.flaky', max_attempts=3)
+def flaky(fail_times):
+    calls.append('try')
+    if calls.count('try') <= fail_times:
+        raise RuntimeError('temporary outage')
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_and_run(self):
+        record.enqueue(value='a')
+        enqueue('tests.record', value='b')
+        self.assertEqual(run_pending(), 2)
+        self.assertEqual(calls, ['a', 'b'])
+        self.assertEqual(set(Job.objects.values_list('status', flat=True)), {Job.DONE})
+
+    def test_keyed_jobs_are_enqueued_once(self):
+        first = record.enqueue(key='once', value='a')
+        second = record.enqueue(key='once', value='b')
+        self.assertEqual(first.pk, second.pk)
+        run_pending()
+        self.assertEqual(calls, ['a'])
+
+    def test_unknown_job_is_rejected(self):
+        with self.assertRaises(LookupError):
+            enqueue('tests.missing')
+
+    def test_failures_retry_with_backoff_then_succeed(self):
+        flaky.enqueue(fail_times=1)
+        run_pending()
+        queued = Job.objects.get()
+        self.assertEqual((queued.status, queued.attempts), (Job.QUEUED, 1))
+        self.assertIn('temporary outage', queued.last_error)
+        self.assertGreater(queued.run_at, timezone.now())
+        # Not due yet
+        self.assertEqual(run_pending(), 0)
+
+        Job.objects.update(run_at=timezone.now())
+        run_pending()
+        self.assertEqual(Job.objects.get().status, Job.DONE)
+
+    def test_gives_up_after_max_attempts(self):
+        flaky.enqueue(fail_times=10)
+        for _ in range(3):
+            Job.objects.update(run_at=timezone.now())
+            run_pending()
+        failed = Job.objects.get()
+        self.assertEqual((failed.status, failed.attempts), (Job.FAILED, 3))
+        self.assertEqual(calls.count('try'), 3)
+
+    def test_expired_lease_is_reclaimed(self):
+        record.enqueue(value='a')
+        claimed = Worker(name='crashed').broker.reserve('crashed', 10)
+        self.assertEqual(len(claimed), 1)
+        self.assertEqual(run_pending(), 0)
+        Job.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(Job.objects.get().attempts, 2)
+
+    def test_backoff_grows_and_is_capped(self):
+        with mock.patch('jobs.worker.random.uniform', return_value=1.0):
+            self.assertEqual([backoff(n) for n in (1, 2, 3)], [10, 20, 40])
+            self.assertEqual(backoff(50), 60 * 60)
+
+
+class TransactionalEnqueueTests(TransactionTestCase):
+    def test_job_is_discarded_with_its_transaction(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                record.enqueue(value='a')
+                raise RuntimeError
+        self.assertFalse(Job.objects.exists())
@@ -0,0 +1,84 @@
+import logging
+import os
+import random
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from jobs.brokers import get_broker
+from jobs.registry import registry
+
+logger = logging.getLogger(__name__)
+
+BACKOFF_BASE = 10
+BACKOFF_MAX = 60 * 60
+MAX_ERROR_LENGTH = 5_000
+
+
+def backoff(attempts):
+    """Seconds to wait before retry number ``attempts``: exponential, capped, jittered."""
+    delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+    # Jitter keeps jobs that failed together from retrying in lockstep
+    return delay * random.uniform(0.5, 1.0)
+
+
+class Worker:
+    """Claims jobs from the broker and runs them, retrying failures with backoff."""
+
+    def __init__(self, broker=None, name=None, batch_size=10, poll_interval=1.0):
+        self.broker = broker or get_broker()
+        self.name = name or f'{socket.gethostname()}:{os.getpid()}'
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.stopping = False
+
+    def run(self, burst=False):
+        """Work until stopped, or until nothing is due when ``burst``; returns jobs run."""
+        processed = 0
+        while not self.stopping:
+            close_old_connections()
+            jobs = self.broker.reserve(self.name, self.batch_size)
+            if not jobs:
+                if burst:
+                    break
+                time.sleep(self.poll_interval)
+                continue
+            for job in jobs:
+                self.process(job)
+                processed += 1
+        return processed
+
+    def stop(self, *args):
+        """Finish the current job, then exit; usable as a signal handler."""
+        self.stopping = True
+
+    def process(self, job):
+        """Run one claimed job; returns whether it succeeded."""
+        handler = registry.get(job.name)
+        if handler is None:
+            self.broker.fail(job, f'No job registered as {job.name!r}')
+            return False
+        try:
+            # The handler's writes commit together or not at all
+            with transaction.atomic():
+                handler(**job.payload)
+        except Exception as exc:
+            error = ''.join(traceback.format_exception(exc))[-MAX_ERROR_LENGTH:]
+            if job.attempts >= job.max_attempts:
+                logger.error('Job %s failed after %d attempts: %s', job.name, job.attempts, exc)
+                self.broker.fail(job, error)
+            else:
+                logger.warning('Job %s failed (attempt %d), will retry: %s', job.name, job.attempts, exc)
+                self.broker.retry(job, error, timezone.now() + timedelta(seconds=backoff(job.attempts)))
+            return False
+        self.broker.complete(job)
+        return True
+
+
+def run_pending(**kwargs):
+    """Run every job that is due now, then return how many ran."""
+    return Worker(**kwargs).run(burst=True)
@@ -1,12 +1,32 @@
 from django.contrib import admin
+from core.admin_mixins import LargeTableAdminMixin
 from .models import Partner, DonorProfile
 
+
+class GivingFocusFilter(admin.SimpleListFilter):
+    """Filter donors by focus area through the indexed DonorFocusArea table"""
+    title = 'giving focus'
+    parameter_name = 'focus'
+
+    def lookups(self, request, model_admin):
+        return DonorProfile.GIVING_FOCUS_CHOICES
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.with_focus(self.value())
+        return queryset
+
+
 @admin.register(Partner)
-class PartnerAdmin(admin.ModelAdmin):
-    list_display = ('organization_name', 'user', 'website', 'is_verified', 'created_at')
+class PartnerAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ('organization_name', 'user', 'website', 'is_verified', 'verified_wishers_count', 'created_at')
+    list_select_related = ('user',)
+    list_only = ('organization_name', 'user', 'user__email', 'website', 'is_verified', 'verified_wishers_count',
+                 'created_at')
+    email_search_field = 'user__email'
     list_filter = ('is_verified', 'created_at')
     search_fields = ('organization_name', 'user__email', 'website')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('verified_wishers_count', 'created_at', 'updated_at')
     date_hierarchy = 'created_at'
     
     fieldsets = (
@@ -14,7 +34,7 @@ class PartnerAdmin(admin.ModelAdmin):
             'fields': ('user', 'organization_name', 'website', 'logo')
         }),
         ('Verification', {
-            'fields': ('is_verified', 'verification_document')
+            'fields': ('is_verified', 'verification_document', 'verified_wishers_count')
         }),
         ('Description', {
             'fields': ('organization_description',)
@@ -26,9 +46,12 @@ class PartnerAdmin(admin.ModelAdmin):
     )
 
 @admin.register(DonorProfile)
-class DonorProfileAdmin(admin.ModelAdmin):
+class DonorProfileAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('user', 'get_email', 'impact_score', 'total_donations', 'visibility')
-    list_filter = ('visibility', 'created_at')
+    list_select_related = ('user',)
+    list_only = ('user', 'user__email', 'impact_score', 'total_donations', 'visibility')
+    email_search_field = 'user__email'
+    list_filter = ('visibility', GivingFocusFilter, 'created_at')
     search_fields = ('user__email', 'user__first_name', 'user__last_name')
     readonly_fields = ('created_at', 'updated_at', 'impact_score')
     date_hierarchy = 'created_at'
@@ -38,7 +61,7 @@ class DonorProfileAdmin(admin.ModelAdmin):
             'fields': ('user', 'get_email', 'visibility')
         }),
         ('Donation Preferences', {
-            'fields': ('preferred_categories',)
+            'fields': ('giving_focus', 'preferred_categories')
         }),
         ('Impact', {
             'fields': ('impact_score', 'total_donations')
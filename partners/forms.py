@@ -0,0 +1,52 @@
+from django import forms
+
+from partners.services.verification import MAX_EMAILS, parse_emails
+
+FIELD_CLASSES = ('w-full px-4 py-3 bg-background-dark/50 border border-white/10 rounded-lg focus:ring-2 '
+                 'focus:ring-primary focus:border-transparent text-white placeholder-white/40 transition-all')
+MAX_UPLOAD_BYTES = 1024 * 1024
+
+
+class BulkVerificationForm(forms.Form):
+    emails = forms.CharField(
+        label='Wisher emails',
+        required=False,
+        widget=forms.Textarea(attrs={
+            'class': f'{FIELD_CLASSES} resize-none',
+            'placeholder': 'one@example.com, two@example.com',
+            'rows': 8,
+        }),
+        help_text='Separate addresses with commas, semicolons or new lines',
+    )
+    email_file = forms.FileField(
+        label='Or upload a list',
+        required=False,
+        widget=forms.ClearableFileInput(attrs={'class': 'text-white/70 text-sm', 'accept': '.txt,.csv'}),
+        help_text=f'A .txt or .csv file of up to {MAX_EMAILS:,} email addresses',
+    )
+
+    def clean_email_file(self):
+        upload = self.cleaned_data.get('email_file')
+        if not upload:
+            return ''
+        if getattr(upload, 'rejection', None):
+            raise forms.ValidationError(upload.rejection)
+        if not upload.name.lower().endswith(('.txt', '.csv')):
+            raise forms.ValidationError('Upload a .txt or .csv file.')
+        if upload.size > MAX_UPLOAD_BYTES:
+            raise forms.ValidationError('The file is too large; split it into smaller lists.')
+        try:
+            return upload.read().decode('utf-8-sig')
+        except UnicodeDecodeError:
+            raise forms.ValidationError('The file must be UTF-8 text.')
+
+    def clean(self):
+        cleaned_data = super().clean()
+        try:
+            emails = parse_emails(f'{cleaned_data.get("emails") or ""}\n{cleaned_data.get("email_file") or ""}')
+        except ValueError as exc:
+            raise forms.ValidationError(str(exc))
+        if not emails and not self.errors:
+            raise forms.ValidationError('Enter or upload at least one email address.')
+        cleaned_data['email_list'] = emails
+        return cleaned_data
@@ -0,0 +1,18 @@
+"""
+Follow-up work for a change in wishers' verification, run by the job worker.
+
+``refresh_verified_wishers`` rebuilds from the current rows, so running it
+twice, or after a later change, is harmless.
+"""
+from donations.models.donation import Donation
+from jobs.registry import job
+from partners.services.scoring import score_donors
+from wishes.services.recommendations import index_wishers
+
+
+@job('partners.refresh_verified_wishers')
+def refresh_verified_wishers(user_ids):
+    """Rerank the wishers' pending wishes and rescore the donors who granted their wishes."""
+    index_wishers(user_ids)
+    donor_ids = Donation.objects.filter(wish__user_id__in=user_ids).order_by().values_list('donor_id', flat=True)
+    score_donors(user_ids=list(donor_ids.distinct()))
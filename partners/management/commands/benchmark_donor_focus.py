@@ -0,0 +1,88 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+
+from core.models import User
+from core.utils import rolled_back
+from partners.models import DonorProfile
+from partners.services.focus import rebuild_focus_areas
+
+FOCUS_AREAS = [area for area, _ in DonorProfile.GIVING_FOCUS_CHOICES]
+
+
+def json_contains(queryset, area):
+    """The pre-index way: look inside every row's giving_focus list."""
+    if connection.vendor == 'postgresql':
+        return queryset.filter(giving_focus__contains=[area])
+    return queryset.alias(has_focus=RawSQL(
+        'EXISTS (SELECT 1 FROM json_each(partners_donorprofile.giving_focus) WHERE value = %s)',
+        [area],
+        output_field=BooleanField(),
+    )).filter(has_focus=True)
+
+
+class Command(BaseCommand):
+    help = 'Time focus-area filtering through DonorFocusArea against scanning the JSON lists'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--donors', type=int, default=500_000, help='Number of donor profiles to seed')
+        parser.add_argument('--repeat', type=int, default=10, help='Timed runs per query')
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            self.run(options)
+        self.stdout.write('Benchmark data rolled back.')
+
+    def run(self, options):
+        rng = random.Random(options['seed'])
+        started = time.perf_counter()
+        users = User.objects.bulk_create((
+            User(email=f'bench-donor-{i}@example.com', username=f'bench-donor-{i}', first_name='Bench', country='US')
+            for i in range(options['donors'])
+        ), batch_size=5_000)
+        # Skewed interests: 'health' is common, 'shelter' rare
+        weights = [8, 5, 3, 10, 1]
+        DonorProfile.objects.bulk_create((
+            DonorProfile(
+                user=user,
+                giving_focus=sorted(set(rng.choices(FOCUS_AREAS, weights, k=rng.randint(0, 3)))),
+                preferred_categories=rng.sample(FOCUS_AREAS, rng.randint(0, 2)),
+            )
+            for user in users
+        ), batch_size=5_000)
+        self.stdout.write(f"Seeded {options['donors']} donors in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        rows = rebuild_focus_areas()
+        self.stdout.write(f'Indexed {rows} focus areas in {time.perf_counter() - started:.1f}s')
+
+        profiles = DonorProfile.objects.all()
+        for area in ['health', 'shelter']:
+            self.stdout.write(f'"{area}" ({profiles.with_focus(area).count()} donors):')
+            for label, queryset in [
+                ('with_focus()', profiles.with_focus(area)),
+                ('JSON scan', json_contains(profiles, area)),
+            ]:
+                self.time_query(f'{label} count', lambda: queryset.count(), options['repeat'])
+                self.time_query(
+                    f'{label} first 50',
+                    lambda: list(queryset.order_by('pk').values_list('pk', flat=True)[:50]),
+                    options['repeat'],
+                )
+
+    def time_query(self, label, func, repeat):
+        func()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(self.style.SUCCESS(
+            f'  {label:<26} p50 {statistics.median(timings):8.2f} ms  max {max(timings):8.2f} ms'
+        ))
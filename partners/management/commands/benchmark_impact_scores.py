@@ -0,0 +1,95 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import User
+from core.utils import rolled_back
+from donations.models import Donation
+from partners.models import DonorProfile, Partner
+from partners.services.scoring import FOCUS_AREAS, score_donors
+from wishes.models import Wish, WisherProfile
+
+
+class Command(BaseCommand):
+    help = 'Time full and incremental impact scoring on synthetic donations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--donations', type=int, default=1_000_000, help='Number of donations to seed')
+        parser.add_argument('--donors', type=int, default=100_000, help='Number of donors to spread them over')
+        parser.add_argument('--wishes', type=int, default=100_000, help='Number of wishes they grant')
+        parser.add_argument('--wishers', type=int, default=10_000, help='Number of wishers, a third of them verified')
+        parser.add_argument('--touched', type=float, default=0.01, help='Share of donors to touch before the incremental run')
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            self.run(options)
+        self.stdout.write('Benchmark data rolled back.')
+
+    def run(self, options):
+        rng = random.Random(options['seed'])
+        donations, donors, wish_count = options['donations'], options['donors'], options['wishes']
+        if donations > donors * wish_count:
+            donations = donors * wish_count
+        started = time.perf_counter()
+
+        wishers = User.objects.bulk_create([
+            User(email=f'bench-wisher-{i}@example.com', username=f'bench-wisher-{i}', first_name='Bench',
+                 country='US', role='wisher')
+            for i in range(options['wishers'])
+        ], batch_size=5_000)
+        partner_user = User.objects.create(email='bench-partner@example.com', username='bench-partner', role='partner')
+        partner = Partner.objects.create(user=partner_user, organization_name='Bench partner', is_verified=True)
+        WisherProfile.objects.bulk_create([
+            WisherProfile(user=wisher, verified_by=partner if i % 3 == 0 else None)
+            for i, wisher in enumerate(wishers)
+        ], batch_size=5_000)
+
+        categories = [category for category, _ in Wish.CATEGORY_CHOICES] + ['']
+        wishes = Wish.objects.bulk_create((
+            Wish(title=f'Benchmark wish {i}', description='Benchmark wish', category=rng.choice(categories),
+                 user=wishers[i % len(wishers)], status='fulfilled')
+            for i in range(wish_count)
+        ), batch_size=5_000)
+        wish_ids = [wish.pk for wish in wishes]
+
+        users = User.objects.bulk_create((
+            User(email=f'bench-donor-{i}@example.com', username=f'bench-donor-{i}', first_name='Bench', country='US')
+            for i in range(donors)
+        ), batch_size=5_000)
+        DonorProfile.objects.bulk_create((
+            DonorProfile(user=user, giving_focus=rng.sample(FOCUS_AREAS, rng.randint(0, 2)))
+            for user in users
+        ), batch_size=5_000)
+
+        # Donor d's k-th donation grants wish (13 d + k), so (wish, donor) stays unique
+        now = timezone.now()
+        Donation.objects.bulk_create((
+            Donation(donor_id=users[i % donors].pk, wish_id=wish_ids[(13 * (i % donors) + i // donors) % wish_count])
+            for i in range(donations)
+        ), batch_size=10_000)
+        self.spread_dates(now)
+        self.stdout.write(f'Seeded {donations} donations for {donors} donors in {time.perf_counter() - started:.1f}s')
+
+        stats = score_donors(full=True, now=now)
+        self.stdout.write(self.style.SUCCESS(f'full:        {stats}'))
+
+        touched = rng.sample([user.pk for user in users], max(1, int(donors * options['touched'])))
+        DonorProfile.objects.filter(user_id__in=touched).update(updated_at=timezone.now() + timedelta(seconds=1))
+        stats = score_donors(now=timezone.now() + timedelta(seconds=2))
+        self.stdout.write(self.style.SUCCESS(f'incremental: {stats}'))
+        stats = score_donors(now=timezone.now() + timedelta(seconds=3))
+        self.stdout.write(self.style.SUCCESS(f'no-op:       {stats}'))
+
+    def spread_dates(self, now, days=730, buckets=73):
+        """Spread the donations evenly over ``days``; auto_now_add ignores values given to bulk_create."""
+        ids = Donation.objects.order_by('id').values_list('id', flat=True)
+        first, last = ids.first(), ids.last()
+        step = (last - first) // buckets + 1
+        for bucket in range(buckets):
+            Donation.objects.filter(id__gte=first + bucket * step, id__lt=first + (bucket + 1) * step).update(
+                created_at=now - timedelta(days=days * bucket / buckets)
+            )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from partners.services.scoring import DEFAULT_BATCH_SIZE, score_donors
+
+
+class Command(BaseCommand):
+    help = 'Recompute donor impact scores (incremental by default; run with --full daily to apply decay)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rescore every donor, not only stale ones')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Donors scored per batch')
+
+    def handle(self, *args, **options):
+        stats = score_donors(full=options['full'], batch_size=max(options['batch_size'], 1))
+        self.stdout.write(self.style.SUCCESS(str(stats)))
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 16:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partners', '0002_donorprofile_display_name_donorprofile_giving_focus_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='donorprofile',
+            name='scored_at',
+            field=models.DateTimeField(blank=True, help_text='When score_donors last computed impact_score', null=True),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 6.0 on 2026-10-18 16:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Copies of partners.services.focus as it was, so later edits to it
+# cannot change what this migration does
+SOURCES = {'giving_focus': 'focus', 'preferred_categories': 'category'}
+MAX_AREA_LENGTH = 50
+
+
+def focus_area_keys(profile_id, lists):
+    return {
+        (profile_id, kind, str(area)[:MAX_AREA_LENGTH])
+        for field, kind in SOURCES.items()
+        for area in (lists.get(field) or [])
+        if isinstance(area, str) and area
+    }
+
+
+def backfill(apps, schema_editor):
+    DonorProfile = apps.get_model('partners', 'DonorProfile')
+    DonorFocusArea = apps.get_model('partners', 'DonorFocusArea')
+    rows = [
+        DonorFocusArea(profile_id=profile_id, kind=kind, area=area)
+        for pk, *lists in DonorProfile.objects.values_list('pk', *SOURCES).iterator(chunk_size=10_000)
+        for profile_id, kind, area in focus_area_keys(pk, dict(zip(SOURCES, lists)))
+    ]
+    DonorFocusArea.objects.bulk_create(rows, batch_size=10_000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partners', '0003_donorprofile_scored_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DonorFocusArea',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('focus', 'Giving focus'), ('category', 'Preferred category')], max_length=10)),
+                ('area', models.CharField(max_length=50)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='focus_areas', to='partners.donorprofile')),
+            ],
+            options={
+                'verbose_name': 'Donor Focus Area',
+                'verbose_name_plural': 'Donor Focus Areas',
+                'indexes': [models.Index(fields=['kind', 'area', 'profile'], name='donor_focus_lookup_idx')],
+                'constraints': [models.UniqueConstraint(fields=('profile', 'kind', 'area'), name='donor_focus_unique')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
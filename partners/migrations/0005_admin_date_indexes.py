@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-18 16:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partners', '0004_donorfocusarea'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donorprofile',
+            index=models.Index(fields=['created_at'], name='donor_profile_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='partner',
+            index=models.Index(fields=['created_at'], name='partner_created_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.0 on 2026-10-18 16:50
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill(apps, schema_editor):
+    Partner = apps.get_model('partners', 'Partner')
+    WisherProfile = apps.get_model('wishes', 'WisherProfile')
+    counts = (
+        WisherProfile.objects.filter(verified_by=OuterRef('pk')).order_by()
+        .values('verified_by').annotate(count=Count('pk')).values('count')
+    )
+    Partner.objects.update(verified_wishers_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partners', '0005_admin_date_indexes'),
+        ('wishes', '0007_wisherprofile_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='partner',
+            name='verified_wishers_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
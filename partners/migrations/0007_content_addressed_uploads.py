@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-10-18 16:53
+
+import core.storage
+import core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partners', '0006_partner_verified_wishers_count'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='partner',
+            name='verification_document',
+            field=models.FileField(blank=True, help_text='Upload organization verification document', null=True, storage=core.storage.document_storage, upload_to='partner_docs/', validators=[core.validators.UploadValidator(('application/pdf', 'image/jpeg', 'image/png'))]),
+        ),
+    ]
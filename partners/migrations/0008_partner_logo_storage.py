@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-10-18 16:55
+
+import core.storage
+import core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partners', '0007_content_addressed_uploads'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='partner',
+            name='logo',
+            field=models.ImageField(blank=True, null=True, storage=core.storage.document_storage, upload_to='partner_logos/', validators=[core.validators.UploadValidator(('image/jpeg', 'image/png', 'image/gif', 'image/webp'))]),
+        ),
+    ]
@@ -1,3 +1,3 @@
-from .partner import Partner, DonorProfile
+from .partner import Partner, DonorProfile, DonorFocusArea
 
-__all__ = ['Partner', 'DonorProfile']
\ No newline at end of file
+__all__ = ['Partner', 'DonorProfile', 'DonorFocusArea']
@@ -1,6 +1,9 @@
 from django.db import models
 from django.conf import settings
 
+from core.storage import document_storage
+from core.validators import DOCUMENT_TYPES, IMAGE_TYPES, UploadValidator
+
 class Partner(models.Model):
     """Model for organizations that can verify wishers"""
     user = models.OneToOneField(
@@ -11,10 +14,20 @@ class Partner(models.Model):
     organization_name = models.CharField(max_length=255)
     organization_description = models.TextField(blank=True, null=True)
     website = models.URLField(blank=True, null=True)
-    logo = models.ImageField(upload_to='partner_logos/', blank=True, null=True)
+    logo = models.ImageField(
+        upload_to='partner_logos/',
+        storage=document_storage,
+        validators=[UploadValidator(IMAGE_TYPES)],
+        blank=True,
+        null=True,
+    )
     is_verified = models.BooleanField(default=False)
+    # Kept in step by verify_wishers and the WisherProfile signals
+    verified_wishers_count = models.PositiveIntegerField(default=0, editable=False)
     verification_document = models.FileField(
         upload_to='partner_docs/',
+        storage=document_storage,
+        validators=[UploadValidator(DOCUMENT_TYPES)],
         blank=True,
         null=True,
         help_text='Upload organization verification document'
@@ -25,12 +38,34 @@ class Partner(models.Model):
     class Meta:
         verbose_name = 'Partner Organization'
         verbose_name_plural = 'Partner Organizations'
+        indexes = [
+            # Admin date_hierarchy
+            models.Index(fields=['created_at'], name='partner_created_idx'),
+        ]
 
     def __str__(self):
         return self.organization_name
 
+class DonorProfileQuerySet(models.QuerySet):
+    def with_focus(self, *areas):
+        """Donors with any of ``areas`` in giving_focus, via the DonorFocusArea index."""
+        return self._with_area(DonorFocusArea.GIVING_FOCUS, areas)
+
+    def with_preferred_category(self, *categories):
+        """Donors with any of ``categories`` in preferred_categories."""
+        return self._with_area(DonorFocusArea.PREFERRED_CATEGORY, categories)
+
+    def _with_area(self, kind, areas):
+        if len(areas) == 1:
+            # A join driven by donor_focus_lookup_idx, which yields profiles in pk order
+            return self.filter(focus_areas__kind=kind, focus_areas__area=areas[0])
+        return self.filter(pk__in=DonorFocusArea.objects.filter(kind=kind, area__in=areas).values('profile_id'))
+
+
 class DonorProfile(models.Model):
     """Extended profile for donors"""
+    IMPACT_POINTS_PER_DONATION = 10
+
     HEAR_ABOUT_CHOICES = [
         ('search', 'Search Engine (Google, Bing, etc.)'),
         ('social', 'Social Media'),
@@ -85,6 +120,11 @@ class DonorProfile(models.Model):
         default=0.0,
         help_text='Score based on donations and impact'
     )
+    scored_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='When score_donors last computed impact_score'
+    )
     visibility = models.BooleanField(
         default=True,
         help_text='Whether the donor wants to be visible to others'
@@ -96,15 +136,53 @@ class DonorProfile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = DonorProfileQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Donor Profile'
         verbose_name_plural = 'Donor Profiles'
+        indexes = [
+            # Admin date_hierarchy
+            models.Index(fields=['created_at'], name='donor_profile_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.email}'s Donor Profile"
 
     def update_impact_score(self):
-        """Update the impact score based on donations and other factors"""
-        # This can be customized based on your scoring algorithm
-        self.impact_score = self.total_donations * 10  # Example calculation
-        self.save()
+        """Rescore this donor now with the batch scoring engine"""
+        from partners.services.scoring import score_donors
+        score_donors(user_ids=[self.user_id])
+        self.refresh_from_db(fields=['impact_score', 'scored_at'])
+
+
+class DonorFocusArea(models.Model):
+    """One row per entry in a donor's giving_focus or preferred_categories, for indexed lookups"""
+    GIVING_FOCUS = 'focus'
+    PREFERRED_CATEGORY = 'category'
+    KIND_CHOICES = [
+        (GIVING_FOCUS, 'Giving focus'),
+        (PREFERRED_CATEGORY, 'Preferred category'),
+    ]
+
+    profile = models.ForeignKey(
+        DonorProfile,
+        on_delete=models.CASCADE,
+        related_name='focus_areas'
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    area = models.CharField(max_length=50)
+
+    class Meta:
+        verbose_name = 'Donor Focus Area'
+        verbose_name_plural = 'Donor Focus Areas'
+        constraints = [
+            models.UniqueConstraint(fields=['profile', 'kind', 'area'], name='donor_focus_unique'),
+        ]
+        indexes = [
+            # with_focus(): the matching profile ids straight from the index
+            models.Index(fields=['kind', 'area', 'profile'], name='donor_focus_lookup_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.profile_id}: {self.kind} {self.area}"
@@ -0,0 +1,13 @@
+from .focus import rebuild_focus_areas, sync_focus_areas
+from .scoring import ScoringStats, score_donors
+from .verification import VerificationResult, parse_emails, verify_wishers
+
+__all__ = [
+    'ScoringStats',
+    'VerificationResult',
+    'parse_emails',
+    'rebuild_focus_areas',
+    'score_donors',
+    'sync_focus_areas',
+    'verify_wishers',
+]
@@ -0,0 +1,65 @@
+"""
+Keep DonorFocusArea in step with the JSON lists on DonorProfile.
+
+Profiles saved through the ORM are synced by a post_save receiver;
+bulk_create, bulk_update and queryset update() bypass it, so follow them
+with ``rebuild_focus_areas``.
+"""
+from django.db import transaction
+
+from partners.models.partner import DonorFocusArea, DonorProfile
+
+# JSON field on DonorProfile -> DonorFocusArea.kind
+SOURCES = {
+    'giving_focus': DonorFocusArea.GIVING_FOCUS,
+    'preferred_categories': DonorFocusArea.PREFERRED_CATEGORY,
+}
+MAX_AREA_LENGTH = DonorFocusArea._meta.get_field('area').max_length
+
+
+def focus_area_keys(profile_id, lists):
+    """(profile_id, kind, area) for each string in the JSON ``lists``, keyed by field name."""
+    return {
+        (profile_id, kind, str(area)[:MAX_AREA_LENGTH])
+        for field, kind in SOURCES.items()
+        for area in (lists.get(field) or [])
+        if isinstance(area, str) and area
+    }
+
+
+def sync_focus_areas(profile):
+    """Add and remove ``profile``'s rows to match its lists; one read, at most two writes."""
+    wanted = focus_area_keys(profile.pk, {field: getattr(profile, field) for field in SOURCES})
+    current = {
+        (profile.pk, kind, area): pk
+        for pk, kind, area in DonorFocusArea.objects.filter(profile=profile).values_list('pk', 'kind', 'area')
+    }
+    stale = [pk for key, pk in current.items() if key not in wanted]
+    if stale:
+        DonorFocusArea.objects.filter(pk__in=stale).delete()
+    missing = wanted - current.keys()
+    if missing:
+        DonorFocusArea.objects.bulk_create(
+            [DonorFocusArea(profile_id=pk, kind=kind, area=area) for pk, kind, area in missing],
+            ignore_conflicts=True,
+        )
+
+
+def rebuild_focus_areas(batch_size=10_000):
+    """Recreate every row from the JSON lists; returns the number of rows written."""
+    total = 0
+    with transaction.atomic():
+        DonorFocusArea.objects.all().delete()
+        profiles = DonorProfile.objects.order_by('pk').values_list('pk', *SOURCES)
+        last_pk = 0
+        while True:
+            batch = list(profiles.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                return total
+            last_pk = batch[-1][0]
+            rows = [
+                DonorFocusArea(profile_id=profile_id, kind=kind, area=area)
+                for pk, *lists in batch
+                for profile_id, kind, area in focus_area_keys(pk, dict(zip(SOURCES, lists)))
+            ]
+            total += len(DonorFocusArea.objects.bulk_create(rows, batch_size=batch_size))
@@ -0,0 +1,55 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.services.thumbnails import queue_derivatives
+from partners.jobs import refresh_verified_wishers
+from partners.models import DonorProfile, Partner
+from partners.services.focus import sync_focus_areas
+from wishes.models import WisherProfile
+
+
+@receiver(post_save, sender=DonorProfile)
+def donor_profile_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not {'giving_focus', 'preferred_categories'} & set(update_fields):
+        return
+    sync_focus_areas(instance)
+
+
+@receiver(post_save, sender=Partner)
+def partner_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and 'logo' not in update_fields):
+        return
+    queue_derivatives(instance.logo.name)
+
+
+def _move_verified_count(partner_id, delta):
+    if partner_id is not None:
+        Partner.objects.filter(pk=partner_id).update(verified_wishers_count=F('verified_wishers_count') + delta)
+
+
+@receiver(pre_save, sender=WisherProfile)
+def wisher_profile_saving(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Bulk changes go through verify_wishers, which adjusts the counters itself
+    if raw or instance._state.adding or (update_fields is not None and 'verified_by' not in update_fields):
+        instance._previous_verifier_id = instance.verified_by_id
+        return
+    instance._previous_verifier_id = (
+        WisherProfile.objects.filter(pk=instance.pk).values_list('verified_by_id', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=WisherProfile)
+def wisher_profile_saved(sender, instance, created, raw=False, **kwargs):
+    previous = None if created else instance._previous_verifier_id
+    if raw or previous == instance.verified_by_id:
+        return
+    _move_verified_count(previous, -1)
+    _move_verified_count(instance.verified_by_id, 1)
+    if (previous is None) != (instance.verified_by_id is None):
+        refresh_verified_wishers.enqueue(user_ids=[str(instance.user_id)])
+
+
+@receiver(post_delete, sender=WisherProfile)
+def wisher_profile_deleted(sender, instance, **kwargs):
+    _move_verified_count(instance.verified_by_id, -1)
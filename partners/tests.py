@@ -1,3 +1,229 @@
+from datetime import timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import User
+from core.testing import QueryPlanAssertions, make_user
+from donations.models import Donation
+from donations.services.grants import grant_wish
+from jobs.worker import run_pending
+from partners.models import DonorFocusArea, DonorProfile, Partner
+from partners.services.focus import rebuild_focus_areas
+from partners.services.scoring import FOCUS_BONUS, HALF_LIFE_DAYS, VERIFIED_BONUS, score_donors
+from partners.services.verification import parse_emails, verify_wishers
+from wishes.models import Wish, WishRecommendation, WisherProfile
+from wishes.services.recommendations import VERIFIED_BOOST
+
+POINTS = DonorProfile.IMPACT_POINTS_PER_DONATION
+
+
+class ImpactScoringTests(TestCase):
+    def setUp(self):
+        self.wisher = make_user('wisher@example.com', role='wisher')
+        self.verified_wisher = make_user('verified@example.com', role='wisher')
+        partner = Partner.objects.create(user=make_user('partner@example.com', role='partner'),
+                                         organization_name='Helpers')
+        WisherProfile.objects.create(user=self.verified_wisher, verified_by=partner)
+        self.donor = make_user('donor@example.com')
+        DonorProfile.objects.create(user=self.donor, giving_focus=['health'])
+
+    def grant(self, title, wisher, age_days=0, category=''):
+        wish = Wish.objects.create(title=title, description='Please help', user=wisher, category=category)
+        donation = grant_wish(wish.pk, self.donor)
+        Donation.objects.filter(pk=donation.pk).update(created_at=timezone.now() - timedelta(days=age_days))
+
+    def score(self):
+        return DonorProfile.objects.get(user=self.donor).impact_score
+
+    def test_score_applies_decay_focus_and_verification(self):
+        self.grant('School books', self.wisher, category='education')
+        self.grant('Medicine for my mother', self.wisher, category='health')
+        self.grant('New roof', self.verified_wisher, age_days=HALF_LIFE_DAYS, category='shelter')
+        stats = score_donors(full=True)
+
+        self.assertEqual((stats.donors, stats.donations), (1, 3))
+        expected = POINTS + POINTS * (1 + FOCUS_BONUS) + POINTS / 2 * (1 + VERIFIED_BONUS)
+        self.assertAlmostEqual(self.score(), expected, places=1)
+
+    def test_incremental_run_only_rescores_stale_donors(self):
+        other = make_user('other@example.com')
+        DonorProfile.objects.create(user=other)
+        self.grant('School books', self.wisher)
+        self.assertEqual(score_donors().donors, 2)
+        self.assertEqual(score_donors().donors, 0)
+
+        self.grant('Wheelchair', self.wisher, category='health')
+        stats = score_donors()
+        self.assertEqual((stats.donors, stats.donations), (1, 2))
+        self.assertAlmostEqual(self.score(), POINTS + POINTS * (1 + FOCUS_BONUS), places=1)
+
+
+class DonorFocusAreaTests(QueryPlanAssertions, TestCase):
+    def setUp(self):
+        self.health = DonorProfile.objects.create(user=make_user('a@example.com'), giving_focus=['health', 'food'])
+        self.food = DonorProfile.objects.create(user=make_user('b@example.com'), giving_focus=['food'],
+                                                preferred_categories=['health'])
+
+    def test_saves_keep_the_side_table_in_sync(self):
+        self.assertEqual(set(DonorProfile.objects.with_focus('health')), {self.health})
+        self.assertEqual(set(DonorProfile.objects.with_focus('food')), {self.health, self.food})
+        self.assertEqual(set(DonorProfile.objects.with_preferred_category('health')), {self.food})
+
+        self.health.giving_focus = ['shelter']
+        self.health.save()
+        self.assertEqual(list(DonorProfile.objects.with_focus('food')), [self.food])
+        self.assertEqual(list(DonorProfile.objects.with_focus('shelter', 'children')), [self.health])
+        self.assertEqual(DonorFocusArea.objects.count(), 3)
+
+        DonorProfile.objects.filter(pk=self.food.pk).update(giving_focus=['children'])
+        self.assertEqual(rebuild_focus_areas(), 3)
+        self.assertEqual(list(DonorProfile.objects.with_focus('children')), [self.food])
+
+    def test_lookup_uses_the_index(self):
+        self.assertUsesIndex(DonorProfile.objects.with_focus('health'), 'donor_focus_lookup_idx')
+
+
+
+class ProfileAdminTests(QueryPlanAssertions, TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser(
+            email='admin@example.com', password='x', first_name='Admin', last_name='User', country='US',
+        ))
+        self.partner = Partner.objects.create(user=make_user('partner@example.com', role='partner'),
+                                              organization_name='Helpers')
+
+    def add_profiles(self, count):
+        for _ in range(count):
+            index = User.objects.count()
+            DonorProfile.objects.create(user=make_user(f'donor{index}@example.com'))
+            WisherProfile.objects.create(user=make_user(f'wisher{index}@example.com', role='wisher'),
+                                         verified_by=self.partner)
+
+    def changelist(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        self.add_profiles(1)
+        urls = ['/admin/partners/donorprofile/', '/admin/wishes/wisherprofile/', '/admin/partners/partner/',
+                '/admin/jobs/job/', '/admin/core/user/']
+        few = [self.changelist(url)[0] for url in urls]
+        self.add_profiles(20)
+        for url, count in zip(urls, few):
+            queries, response = self.changelist(url)
+            self.assertEqual(queries, count, url)
+            self.assertIsNone(response.context['cl'].full_result_count)
+        self.assertEqual(response.context['cl'].result_count, User.objects.count())
+
+    def test_full_email_search_is_an_exact_lookup(self):
+        self.add_profiles(12)
+        _, response = self.changelist('/admin/partners/donorprofile/', q='donor4@EXAMPLE.com')
+        self.assertEqual([profile.user.email for profile in response.context['cl'].result_list],
+                         ['donor4@example.com'])
+        _, response = self.changelist('/admin/partners/donorprofile/', q='donor4')
+        self.assertEqual(response.context['cl'].result_count, 1)
+
+    def test_partial_or_unmatched_email_search_falls_back_to_icontains(self):
+        self.add_profiles(3)
+        _, response = self.changelist('/admin/partners/donorprofile/', q='@example.com')
+        self.assertEqual(response.context['cl'].result_count, 3)
+        _, response = self.changelist('/admin/partners/donorprofile/', q='donor2@')
+        self.assertEqual(response.context['cl'].result_count, 1)
+        # The local part is case sensitive, so the exact lookup misses
+        _, response = self.changelist('/admin/partners/donorprofile/', q='DONOR2@example.com')
+        self.assertEqual(response.context['cl'].result_count, 1)
+
+    def test_date_hierarchy_bounds_use_index(self):
+        self.assertUsesIndex(DonorProfile.objects.order_by('created_at')[:1], 'donor_profile_created_idx')
+        self.assertUsesIndex(WisherProfile.objects.order_by('created_at')[:1], 'wisher_profile_created_idx')
+
+
+class BulkVerificationTests(TestCase):
+    def setUp(self):
+        self.partner = Partner.objects.create(user=make_user('partner@example.com', role='partner'),
+                                              organization_name='Helpers', is_verified=True)
+        self.other = Partner.objects.create(user=make_user('other@example.com', role='partner'),
+                                            organization_name='Others', is_verified=True)
+        self.profiles = [
+            WisherProfile.objects.create(user=make_user(f'wisher{index}@example.com', role='wisher'))
+            for index in range(4)
+        ]
+
+    def counts(self):
+        return list(Partner.objects.order_by('pk').values_list('verified_wishers_count', flat=True))
+
+    def test_emails_are_resolved_and_updated_in_one_statement_each(self):
+        self.profiles[3].verified_by = self.other
+        self.profiles[3].save()
+        verify_wishers(self.partner, emails=['wisher2@example.com'])
+        self.assertEqual(self.counts(), [1, 1])
+
+        emails = parse_emails('wisher0@EXAMPLE.com, wisher1@example.com;wisher2@example.com\n'
+                              'wisher3@example.com nobody@example.com wisher0@example.com')
+        with CaptureQueriesContext(connection) as queries:
+            result = verify_wishers(self.partner, emails=emails)
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "wishes_wisherprofile"')]
+        self.assertEqual(len(updates), 1)
+
+        self.assertEqual((result.requested, result.verified, result.reassigned, result.already_verified),
+                         (5, 2, 1, 1))
+        self.assertEqual(result.not_found, ['nobody@example.com'])
+        self.assertEqual(self.counts(), [4, 0])
+        self.assertEqual(WisherProfile.objects.filter(verified_by=self.partner).count(), 4)
+
+    def test_single_saves_and_deletes_keep_the_counters(self):
+        profile = self.profiles[0]
+        profile.verified_by = self.partner
+        profile.save()
+        profile.verified_by = self.other
+        profile.save()
+        profile.household_size = 3
+        profile.save(update_fields=['household_size'])
+        self.assertEqual(self.counts(), [0, 1])
+        profile.delete()
+        self.assertEqual(self.counts(), [0, 0])
+
+    def test_newly_verified_wishers_are_reranked(self):
+        wish = Wish.objects.create(title='Books', description='For school', user=self.profiles[0].user,
+                                   category='education')
+        ranked_at = WishRecommendation.objects.get(wish=wish).ranked_at
+        verify_wishers(self.partner, emails=['wisher0@example.com'])
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(WishRecommendation.objects.get(wish=wish).ranked_at, ranked_at + VERIFIED_BOOST)
+
+    def test_admin_action_verifies_the_selection(self):
+        self.client.force_login(User.objects.create_superuser(
+            email='admin@example.com', password='x', first_name='Admin', last_name='User', country='US',
+        ))
+        response = self.client.post('/admin/wishes/wisherprofile/', {
+            'action': 'verify_selected', 'partner': self.other.pk,
+            '_selected_action': [self.profiles[0].pk, self.profiles[1].pk],
+        }, follow=True)
+        self.assertContains(response, '2 wishers verified')
+        self.assertEqual(self.counts(), [0, 2])
+
+    def test_partner_view_accepts_an_uploaded_list(self):
+        self.client.force_login(self.partner.user)
+        upload = SimpleUploadedFile('wishers.csv', b'email\nwisher0@example.com\nwisher1@example.com\n')
+        response = self.client.post(reverse('partners:bulk_verify'), {'emails': 'missing@example.com',
+                                                                      'email_file': upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['result'].verified, 2)
+        self.assertEqual(response.context['not_found'], ['missing@example.com'])
+        self.assertContains(response, 'Helpers has verified 2 wishers')
 
-# Create your tests here.
+    def test_only_verified_partners_may_verify(self):
+        url = reverse('partners:bulk_verify')
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(self.profiles[0].user)
+        self.assertEqual(self.client.get(url).status_code, 403)
+        Partner.objects.filter(pk=self.partner.pk).update(is_verified=False)
+        self.client.force_login(self.partner.user)
+        self.assertEqual(self.client.get(url).status_code, 403)
@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import BulkVerificationView
+
+app_name = 'partners'
+
+urlpatterns = [
+    path('verify/', BulkVerificationView.as_view(), name='bulk_verify'),
+]
@@ -0,0 +1,5 @@
+from .bulk_verification import BulkVerificationView
+
+__all__ = [
+    'BulkVerificationView',
+]
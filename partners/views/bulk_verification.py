@@ -0,0 +1,41 @@
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.views.generic import FormView
+
+from partners.forms import BulkVerificationForm
+from partners.models import Partner
+from partners.services.verification import verify_wishers
+
+# Unmatched addresses listed back to the partner
+NOT_FOUND_SHOWN = 50
+
+
+class BulkVerificationView(LoginRequiredMixin, UserPassesTestMixin, FormView):
+    """Let a verified partner organization verify many wishers by email at once."""
+    template_name = 'partners/bulk_verify.html'
+    form_class = BulkVerificationForm
+
+    def test_func(self):
+        self.partner = Partner.objects.filter(user=self.request.user, is_verified=True).first()
+        return self.partner is not None
+
+    def handle_no_permission(self):
+        # Signed-in users who are not a verified partner get a 403; anonymous
+        # ones go to the login page
+        self.raise_exception = self.request.user.is_authenticated
+        return super().handle_no_permission()
+
+    def form_valid(self, form):
+        result = verify_wishers(self.partner, emails=form.cleaned_data['email_list'])
+        self.partner.refresh_from_db(fields=['verified_wishers_count'])
+        # Rendered rather than redirected: the summary belongs to this upload
+        not_found = result.not_found[:NOT_FOUND_SHOWN]
+        return self.render_to_response(self.get_context_data(
+            form=self.form_class(), result=result, not_found=not_found,
+            more_not_found=len(result.not_found) - len(not_found),
+        ))
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['partner'] = self.partner
+        context['title'] = 'Verify Wishers'
+        return context
@@ -0,0 +1,30 @@
+/** Theme for base.html and the pages extending it; see assets/css/app.css. */
+module.exports = {
+  darkMode: 'class',
+  // Every file that can contain class names; anything else is purged
+  content: [
+    './templates/**/*.html',
+    './*/templates/**/*.html',
+    './static/js/**/*.js',
+    // Form widgets set their classes in Python
+    './*/forms.py',
+    './*/forms/**/*.py',
+  ],
+  theme: {
+    extend: {
+      colors: {
+        'primary': '#1337ec',
+        'background-light': '#f6f6f8',
+        'background-dark': '#101322',
+      },
+      fontFamily: {
+        'display': ['Inter', 'sans-serif'],
+      },
+      borderRadius: { 'DEFAULT': '0.5rem', 'lg': '1rem', 'xl': '1.5rem', 'full': '9999px' },
+    },
+  },
+  plugins: [
+    require('@tailwindcss/forms'),
+    require('@tailwindcss/container-queries'),
+  ],
+};
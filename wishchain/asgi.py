@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'wishchain.settings')
+# Serve the read-only JSON endpoints from their async views (see ASYNC_VIEWS)
+os.environ.setdefault('WISHCHAIN_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
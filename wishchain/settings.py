@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -46,6 +47,7 @@ INSTALLED_APPS = [
     'wishes.apps.WishesConfig',
     'donations.apps.DonationsConfig',
     'partners.apps.PartnersConfig',
+    'jobs.apps.JobsConfig',
 ]
 
 # Cities Light Configuration
@@ -58,6 +60,10 @@ CITIES_LIGHT_DATA_URL = None
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Right after SecurityMiddleware, so static files get its headers but
+    # skip sessions, auth and profiling
+    'core.middleware.static.StaticFilesMiddleware',
+    'core.middleware.profiling.ProfilingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -66,6 +72,16 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Request profiling (see core/middleware/profiling.py). Budgets here
+# override @query_budget on the view; keys are namespaced URL names.
+PROFILING_SERVER_TIMING = DEBUG
+PROFILING_WINDOW = 200
+QUERY_BUDGETS = {}
+# Raise QueryBudgetExceeded instead of logging a warning. TEST_RUNNER
+# turns it on for the test suite
+QUERY_BUDGET_RAISE = os.environ.get('QUERY_BUDGET_RAISE', '0') == '1'
+TEST_RUNNER = 'core.testing.BudgetTestRunner'
+
 ROOT_URLCONF = 'wishchain.urls'
 
 import os
@@ -86,19 +102,64 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'wishchain.wsgi.application'
+ASGI_APPLICATION = 'wishchain.asgi:application'
+
+# Route the read-only JSON endpoints (wish feeds, city lookup) to their async
+# views. wishchain/asgi.py switches this on; under WSGI every async view would
+# need its own event loop per request, so the sync views stay in place there.
+ASYNC_VIEWS = os.environ.get('WISHCHAIN_ASYNC_VIEWS', '0') == '1'
 
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
+# Pick the database with DATABASE_URL (see wishchain/database.py) and set
+# DB_PROFILE=production for WAL and IMMEDIATE transactions on SQLite, or
+# persistent connections (or a pool, with DB_POOL_SIZE) on PostgreSQL.
+
+from wishchain.database import database_from_url
 
 DATABASES = {
+    'default': database_from_url(
+        os.environ.get('DATABASE_URL', 'sqlite:///db.sqlite3'),
+        profile=os.environ.get('DB_PROFILE', 'development'),
+        base_dir=BASE_DIR,
+    ),
+}
+
+
+# Cache
+# Pick the backend with CACHE_URL: locmem:// (default, per process),
+# file:///var/tmp/wishchain-cache, or redis://host:6379/0 for Redis or any
+# Redis-compatible server (Valkey, KeyDB, ...) shared by all workers.
+
+def cache_from_url(url):
+    from urllib.parse import urlsplit
+    parts = urlsplit(url)
+    if parts.scheme == 'locmem':
+        return {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': parts.netloc or 'wishchain'}
+    if parts.scheme == 'file':
+        return {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': parts.path}
+    if parts.scheme in ('redis', 'rediss'):
+        return {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': url}
+    raise ValueError(f'Unsupported CACHE_URL scheme: {parts.scheme}')
+
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        **cache_from_url(os.environ.get('CACHE_URL', 'locmem://')),
+        'KEY_PREFIX': 'wishchain',
+        'TIMEOUT': 300,
     }
 }
 
 
+# Background jobs: see jobs/brokers.py. The database broker needs no other
+# service; run workers with `python manage.py run_jobs`.
+JOBS_BROKER = 'jobs.brokers.DatabaseBroker'
+# Seconds a worker may hold a job before another worker picks it up again
+JOBS_LEASE = 5 * 60
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -142,6 +203,10 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
+# Cache lifetime of static files without a content hash in their name;
+# hashed ones are cached for a year (core/middleware/static.py)
+STATIC_MAX_AGE = int(os.environ.get('STATIC_MAX_AGE', 60))
+
 # Ensure the static directory exists
 import os
 if not os.path.exists(STATIC_ROOT):
@@ -150,3 +215,20 @@ if not os.path.exists(STATIC_ROOT):
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    # Hashed names and .gz/.br copies at collectstatic time (STATIC_MANIFEST=1);
+    # templates then need a collected tree, so development keeps plain names
+    'staticfiles': {'BACKEND': (
+        'core.storage.CompressedManifestStaticFilesStorage' if os.environ.get('STATIC_MANIFEST', '0') == '1'
+        else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+    )},
+    # ID documents, verification documents and profile images, stored once per content
+    'documents': {'BACKEND': 'core.storage.ContentAddressedStorage'},
+}
+
+# Uploads stream to a temporary file while being hashed and sniffed; none is
+# held in memory, and one past UPLOAD_MAX_SIZE is dropped mid-stream
+FILE_UPLOAD_HANDLERS = ['core.uploads.HashingUploadHandler']
+UPLOAD_MAX_SIZE = int(os.environ.get('UPLOAD_MAX_SIZE', 10 * 1024 * 1024))
@@ -24,9 +24,9 @@ urlpatterns = [
     path('', include('core.urls')),  # This will now point to core/urls/__init__.py
     path('wishes/', include('wishes.urls')),
     path('donations/', include('donations.urls')),
+    path('partners/', include('partners.urls')),
 ]
 
-# Serve static and media files in development
+# Serve media files in development; StaticFilesMiddleware serves static files
 if settings.DEBUG:
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,13 +1,32 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from core.admin_mixins import LargeTableAdminMixin
+from partners.models import Partner
+from partners.services.verification import verify_wishers
 from .models import WisherProfile
 
+
+class VerifyActionForm(ActionForm):
+    partner = forms.ModelChoiceField(
+        queryset=Partner.objects.filter(is_verified=True).order_by('organization_name'),
+        required=False,
+        help_text='Partner for "Verify selected wishers"',
+    )
+
+
 @admin.register(WisherProfile)
-class WisherProfileAdmin(admin.ModelAdmin):
+class WisherProfileAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('user', 'get_email', 'household_size', 'income_bracket', 'is_verified')
+    list_select_related = ('user',)
+    list_only = ('user', 'user__email', 'household_size', 'income_bracket', 'verified_by')
+    email_search_field = 'user__email'
     list_filter = ('income_bracket', 'created_at')
     search_fields = ('user__email', 'user__first_name', 'user__last_name')
     readonly_fields = ('created_at', 'updated_at')
     date_hierarchy = 'created_at'
+    action_form = VerifyActionForm
+    actions = ['verify_selected']
     
     fieldsets = (
         ('User Information', {
@@ -28,6 +47,18 @@ class WisherProfileAdmin(admin.ModelAdmin):
     get_email.admin_order_field = 'user__email'
     
     def is_verified(self, obj):
-        return obj.verified_by is not None
+        # The FK column; no query for the partner
+        return obj.verified_by_id is not None
     is_verified.boolean = True
     is_verified.short_description = 'Verified'
+
+    @admin.action(description='Verify selected wishers')
+    def verify_selected(self, request, queryset):
+        form = self.action_form(request.POST)
+        form.fields['action'].choices = self.get_action_choices(request)
+        partner = form.cleaned_data['partner'] if form.is_valid() else None
+        if partner is None:
+            self.message_user(request, 'Choose a verified partner to verify the wishers.', messages.ERROR)
+            return
+        result = verify_wishers(partner, profiles=queryset)
+        self.message_user(request, f'{partner}: {result}.')
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class WishesConfig(AppConfig):
     name = 'wishes'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -1,5 +1,6 @@
 from django import forms
 from wishes.models.wish import Wish
+from wishes.services.categories import guess_category
 
 class WishForm(forms.ModelForm):
     title = forms.CharField(
@@ -22,10 +23,26 @@ class WishForm(forms.ModelForm):
         help_text='Tell us more about your wish and why it\'s important to you',
     )
     
+    category = forms.ChoiceField(
+        label='Category',
+        choices=[('', 'Let us choose')] + Wish.CATEGORY_CHOICES,
+        required=False,
+        widget=forms.Select(attrs={
+            'class': 'w-full px-4 py-3 bg-background-dark/50 border border-white/10 rounded-lg focus:ring-2 focus:ring-primary focus:border-transparent text-white transition-all',
+        }),
+        help_text='Helps donors who care about this area find your wish',
+    )
+
     class Meta:
         model = Wish
-        fields = ['title', 'description']
+        fields = ['title', 'description', 'category']
         
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Add any additional initialization here
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get('category'):
+            cleaned_data['category'] = guess_category(cleaned_data.get('title'), cleaned_data.get('description'))
+        return cleaned_data
@@ -0,0 +1,102 @@
+import random
+import statistics
+import time
+from itertools import zip_longest
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from core.models import User
+from core.utils import rolled_back
+from wishes.models import Wish
+from wishes.services.search import match_filter, search_wishes
+
+NOUNS = [
+    'books', 'laptop', 'bicycle', 'uniform', 'shoes', 'medicine', 'glasses', 'piano', 'guitar', 'tablet',
+    'blanket', 'stove', 'wheelchair', 'backpack', 'calculator', 'football', 'sewing', 'microscope', 'tent',
+    'printer', 'radio', 'paint', 'crutches', 'hearing', 'violin', 'keyboard', 'camera', 'tools', 'seeds',
+]
+WORDS = [
+    'school', 'family', 'daughter', 'son', 'community', 'winter', 'village', 'clinic', 'student', 'teacher',
+    'market', 'garden', 'water', 'lessons', 'exam', 'repair', 'new', 'warm', 'small', 'business', 'start',
+    'help', 'children', 'library', 'music', 'church', 'farm', 'sports', 'team', 'night', 'study', 'health',
+]
+SYLLABLES = [c + v for c in 'bdfgklmnprstvz' for v in 'aeiou']
+QUERIES = ['school', 'books', 'school books', 'microscope clinic', 'wheel', 'violin lessons winter', 'zzzunmatched']
+
+
+def vocabulary(rng, size):
+    """Real words at the head of a Zipf-weighted vocabulary padded with made-up words."""
+    words = [word for pair in zip_longest(WORDS, NOUNS) for word in pair if word]
+    while len(words) < size:
+        word = ''.join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))
+        if word not in words:
+            words.append(word)
+    weights = [1 / (rank + 10) for rank in range(len(words))]
+    return words, weights
+
+
+class Command(BaseCommand):
+    help = 'Time full-text wish search against icontains on synthetic wishes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wishes', type=int, default=100_000, help='Number of wishes to seed (try 1000000)')
+        parser.add_argument('--users', type=int, default=1_000, help='Number of wishers to spread them over')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for the synthetic text')
+        parser.add_argument('--vocabulary', type=int, default=20_000, help='Distinct words in the synthetic text')
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            self.run(options)
+        self.stdout.write('Benchmark data rolled back.')
+
+    def run(self, options):
+        rng = random.Random(options['seed'])
+        self.stdout.write(f"Seeding {options['wishes']} wishes for {options['users']} users...")
+        users = User.objects.bulk_create([
+            User(email=f'bench-{i}@example.com', username=f'bench-{i}', first_name='Bench', country='US')
+            for i in range(options['users'])
+        ])
+        words, weights = vocabulary(rng, options['vocabulary'])
+        started = time.perf_counter()
+        Wish.objects.bulk_create(
+            (
+                Wish(
+                    title=' '.join(rng.choices(words, weights, k=rng.randint(2, 4))).capitalize(),
+                    description=' '.join(rng.choices(words, weights, k=rng.randint(8, 30))),
+                    user=users[i % len(users)],
+                    status='pending' if i % 3 else 'fulfilled',
+                )
+                for i in range(options['wishes'])
+            ),
+            batch_size=5_000,
+        )
+        self.stdout.write(f'  seeded and indexed in {time.perf_counter() - started:.1f}s')
+
+        strategies = [
+            ('ranked full-text search', lambda query: list(search_wishes(query))),
+            ('icontains, newest first', lambda query: list(
+                Wish.objects.for_cards()
+                .filter(Q(title__icontains=query) | Q(description__icontains=query))
+                .order_by('-created_at', '-id')[:24]
+            )),
+        ]
+        for query in QUERIES:
+            matches = match_filter(Wish.objects.all(), query).count()
+            self.stdout.write(f'"{query}" ({matches} matching wishes):')
+            for label, func in strategies:
+                self.time_strategy(label, lambda: func(query), options['repeat'])
+
+    def time_strategy(self, label, func, repeat):
+        rows = len(func())
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p95 = timings[max(0, round(len(timings) * 0.95) - 1)]
+        self.stdout.write(self.style.SUCCESS(
+            f'  {label:<24} {rows:>3} rows  p50 {statistics.median(timings):8.2f} ms  p95 {p95:8.2f} ms'
+        ))
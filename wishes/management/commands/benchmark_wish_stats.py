@@ -0,0 +1,75 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.models import User
+from core.utils import rolled_back
+from wishes.models import Wish
+from wishes.services.stats import aggregate_status_counts, get_status_counts, rebuild_counter
+
+
+class Command(BaseCommand):
+    help = 'Compare wish status counting strategies on a synthetic wish table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wishes', type=int, default=100_000, help='Number of wishes to seed')
+        parser.add_argument('--users', type=int, default=1_000, help='Number of wishers to spread them over')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per strategy')
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            self.run(options)
+        self.stdout.write('Benchmark data rolled back.')
+
+    def run(self, options):
+        self.stdout.write(f"Seeding {options['wishes']} wishes for {options['users']} users...")
+        users = User.objects.bulk_create([
+            User(email=f'bench-{i}@example.com', username=f'bench-{i}', first_name='Bench', country='US')
+            for i in range(options['users'])
+        ])
+        statuses = ['pending', 'pending', 'fulfilled', 'expired']
+        Wish.objects.bulk_create(
+            (
+                Wish(
+                    title=f'Benchmark wish {i}',
+                    description='Synthetic wish used for benchmarking',
+                    user=users[i % len(users)],
+                    status=statuses[i % len(statuses)],
+                )
+                for i in range(options['wishes'])
+            ),
+            batch_size=5_000,
+        )
+        user = users[0]
+        rebuild_counter()
+        rebuild_counter(user.pk)
+
+        for scope, wishes, counter_user in [
+            ('wisher', Wish.objects.filter(user=user), user),
+            ('site', Wish.objects.all(), None),
+        ]:
+            self.stdout.write(f'{scope} dashboard:')
+            strategies = [
+                ('separate COUNT queries', lambda: (
+                    wishes.count(),
+                    wishes.filter(status='pending').count(),
+                    wishes.filter(status='fulfilled').count(),
+                )),
+                ('conditional aggregation', lambda: aggregate_status_counts(wishes)),
+                ('denormalized counters', lambda: get_status_counts(counter_user)),
+            ]
+            for label, func in strategies:
+                self.time_strategy(label, func, options['repeat'])
+
+    def time_strategy(self, label, func, repeat):
+        with CaptureQueriesContext(connection) as queries:
+            func()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        elapsed_ms = (time.perf_counter() - started) * 1000 / repeat
+        self.stdout.write(self.style.SUCCESS(
+            f'  {label:<26} {len(queries):>2} queries  {elapsed_ms:8.3f} ms/call'
+        ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from wishes.services.categories import categorize_wishes
+from wishes.services.recommendations import rebuild_recommendations
+
+
+class Command(BaseCommand):
+    help = 'Recreate the recommendation index (after bulk wisher verifications or imports)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--categorize', action='store_true',
+                            help='First guess a category for uncategorized wishes')
+
+    def handle(self, *args, **options):
+        if options['categorize']:
+            self.stdout.write(f'{categorize_wishes()} wishes categorized')
+        self.stdout.write(self.style.SUCCESS(f'{rebuild_recommendations()} recommendations indexed'))
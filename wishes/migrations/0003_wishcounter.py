@@ -0,0 +1,32 @@
+# Generated by Django 6.0 on 2026-10-18 15:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wishes', '0002_wish'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WishCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text='"global" for the site-wide row, "user:<id>" for a wisher', max_length=64, unique=True)),
+                ('pending', models.IntegerField(default=0)),
+                ('fulfilled', models.IntegerField(default=0)),
+                ('expired', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='wish_counter', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Wish Counter',
+                'verbose_name_plural': 'Wish Counters',
+            },
+        ),
+    ]
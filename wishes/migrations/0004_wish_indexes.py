@@ -0,0 +1,31 @@
+# Generated by Django 6.0 on 2026-10-18 15:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wishes', '0003_wishcounter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='wish',
+            index=models.Index(fields=['-created_at', '-id'], name='wish_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wish',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='wish_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wish',
+            index=models.Index(fields=['user', '-created_at'], name='wish_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wish',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['-created_at', '-id'], name='wish_pending_created_idx'),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 6.0 on 2026-10-18 16:23
+
+import re
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Copies of wishes.services.categories.CATEGORY_KEYWORDS and
+# recommendations.VERIFIED_BOOST as they were, so later edits to those
+# modules cannot change what this migration does
+CATEGORY_KEYWORDS = {
+    'children': {'child', 'children', 'kid', 'kids', 'baby', 'daughter', 'son', 'orphan', 'orphans', 'toys'},
+    'education': {'school', 'book', 'books', 'laptop', 'tuition', 'uniform', 'student', 'study', 'exam',
+                  'lessons', 'calculator', 'library', 'teacher', 'university', 'college'},
+    'food': {'food', 'meal', 'meals', 'groceries', 'stove', 'seeds', 'farm', 'garden', 'water', 'kitchen'},
+    'health': {'medicine', 'medical', 'clinic', 'wheelchair', 'glasses', 'hearing', 'crutches', 'health',
+               'surgery', 'doctor', 'hospital', 'therapy'},
+    'shelter': {'shelter', 'rent', 'roof', 'house', 'housing', 'blanket', 'blankets', 'tent', 'bed', 'home'},
+}
+VERIFIED_BOOST = timedelta(days=7)
+
+
+def guess_category(*texts):
+    words = re.findall(r'\w+', ' '.join(text or '' for text in texts).lower())
+    hits = {
+        category: sum(word in keywords for word in words)
+        for category, keywords in CATEGORY_KEYWORDS.items()
+    }
+    best = max(hits, key=hits.get)
+    return best if hits[best] else ''
+
+
+def backfill(apps, schema_editor):
+    """Guess categories for existing wishes and index the pending ones."""
+    Wish = apps.get_model('wishes', 'Wish')
+    WishRecommendation = apps.get_model('wishes', 'WishRecommendation')
+    wishes = Wish.objects.only('id', 'title', 'description', 'status', 'created_at', 'user_id').iterator(chunk_size=2_000)
+    verified = set(
+        apps.get_model('wishes', 'WisherProfile').objects
+        .filter(verified_by__isnull=False).values_list('user_id', flat=True)
+    )
+    categorized, rows = [], []
+    for wish in wishes:
+        wish.category = guess_category(wish.title, wish.description)
+        if not wish.category:
+            continue
+        categorized.append(wish)
+        if wish.status == 'pending':
+            boost = VERIFIED_BOOST if wish.user_id in verified else timedelta(0)
+            rows.append(WishRecommendation(focus_area=wish.category, wish=wish, ranked_at=wish.created_at + boost))
+    Wish.objects.bulk_update(categorized, ['category'], batch_size=2_000)
+    WishRecommendation.objects.bulk_create(rows, batch_size=2_000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wishes', '0005_wish_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wish',
+            name='category',
+            field=models.CharField(blank=True, choices=[('children', 'Children'), ('education', 'Education'), ('food', 'Food'), ('health', 'Health'), ('shelter', 'Shelter')], default='', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='WishRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('focus_area', models.CharField(choices=[('children', 'Children'), ('education', 'Education'), ('food', 'Food'), ('health', 'Health'), ('shelter', 'Shelter')], max_length=20)),
+                ('ranked_at', models.DateTimeField(help_text='Sort key: the wish creation time, moved forward for verified wishers')),
+                ('wish', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='wishes.wish')),
+            ],
+            options={
+                'verbose_name': 'Wish Recommendation',
+                'verbose_name_plural': 'Wish Recommendations',
+                'indexes': [models.Index(fields=['focus_area', '-ranked_at', '-id'], name='wish_rec_focus_rank_idx')],
+                'constraints': [models.UniqueConstraint(fields=('wish', 'focus_area'), name='wish_rec_unique_wish_focus')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-18 16:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wishes', '0006_wish_category_recommendations'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='wisherprofile',
+            index=models.Index(fields=['created_at'], name='wisher_profile_created_idx'),
+        ),
+    ]
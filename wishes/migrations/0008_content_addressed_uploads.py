@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-10-18 16:53
+
+import core.storage
+import core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wishes', '0007_wisherprofile_created_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='wisherprofile',
+            name='id_document',
+            field=models.FileField(blank=True, help_text='Upload a government-issued ID for verification', null=True, storage=core.storage.document_storage, upload_to='id_documents/', validators=[core.validators.UploadValidator(('application/pdf', 'image/jpeg', 'image/png'))]),
+        ),
+    ]
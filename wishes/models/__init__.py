@@ -1,4 +1,6 @@
 from .wisher_profile import WisherProfile
 from .wish import Wish
+from .wish_counter import WishCounter
+from .wish_recommendation import WishRecommendation
 
-__all__ = ['Wish', 'WisherProfile']
\ No newline at end of file
+__all__ = ['Wish', 'WishCounter', 'WishRecommendation', 'WisherProfile']
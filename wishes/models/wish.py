@@ -1,12 +1,36 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 
+
+class WishQuerySet(models.QuerySet):
+    # Columns rendered by donations/partials/wish_cards.html
+    CARD_FIELDS = ('id', 'title', 'description', 'status', 'category', 'created_at', 'user__id', 'user__first_name',
+                   'user__profile_image')
+    # Columns rendered by wishes/dashboard.html; the owner is already known
+    DASHBOARD_FIELDS = ('id', 'title', 'description', 'status', 'created_at', 'user_id')
+
+    def for_cards(self):
+        """Wish cards with the author's name joined in, one query per page."""
+        return self.select_related('user').only(*self.CARD_FIELDS)
+
+    def for_dashboard(self):
+        return self.only(*self.DASHBOARD_FIELDS)
+
+
 class Wish(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('fulfilled', 'Fulfilled'),
         ('expired', 'Expired'),
     ]
+    # Same keys as DonorProfile.GIVING_FOCUS_CHOICES, so wishes match donor focus areas
+    CATEGORY_CHOICES = [
+        ('children', 'Children'),
+        ('education', 'Education'),
+        ('food', 'Food'),
+        ('health', 'Health'),
+        ('shelter', 'Shelter'),
+    ]
     
     title = models.CharField(max_length=200)
     description = models.TextField()
@@ -14,10 +38,34 @@ class Wish(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, blank=True, default='')
+
+    objects = WishQuerySet.as_manager()
     
     def __str__(self):
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so saves can report status transitions
+        if 'status' in field_names:
+            instance._loaded_status = values[field_names.index('status')]
+        return instance
         
     class Meta:
         verbose_name_plural = 'Wishes'
         ordering = ['-created_at']
+        indexes = [
+            # Donate feed, newest first, with and without a status filter
+            models.Index(fields=['-created_at', '-id'], name='wish_created_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='wish_status_created_idx'),
+            # Wisher dashboard
+            models.Index(fields=['user', '-created_at'], name='wish_user_created_idx'),
+            # Only pending wishes can be granted; keep their index small
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='wish_pending_created_idx',
+                condition=models.Q(status='pending'),
+            ),
+        ]
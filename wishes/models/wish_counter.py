@@ -0,0 +1,40 @@
+from django.db import models
+from django.conf import settings
+
+
+class WishCounter(models.Model):
+    """Denormalized wish counts per status, kept for all wishes and per wisher"""
+    GLOBAL_KEY = 'global'
+
+    key = models.CharField(
+        max_length=64,
+        unique=True,
+        help_text='"global" for the site-wide row, "user:<id>" for a wisher'
+    )
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='wish_counter'
+    )
+    pending = models.IntegerField(default=0)
+    fulfilled = models.IntegerField(default=0)
+    expired = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Wish Counter'
+        verbose_name_plural = 'Wish Counters'
+
+    def __str__(self):
+        return f"{self.key}: {self.total} wishes"
+
+    @property
+    def total(self):
+        return self.pending + self.fulfilled + self.expired
+
+    @classmethod
+    def key_for(cls, user_id=None):
+        """Return the counter key for a wisher, or the global key."""
+        return f"user:{user_id}" if user_id else cls.GLOBAL_KEY
@@ -0,0 +1,26 @@
+from django.db import models
+
+from wishes.models.wish import Wish
+
+
+class WishRecommendation(models.Model):
+    """Pending wishes per donor focus area, in recommendation order"""
+    focus_area = models.CharField(max_length=20, choices=Wish.CATEGORY_CHOICES)
+    wish = models.ForeignKey(Wish, on_delete=models.CASCADE, related_name='recommendations')
+    ranked_at = models.DateTimeField(
+        help_text='Sort key: the wish creation time, moved forward for verified wishers'
+    )
+
+    class Meta:
+        verbose_name = 'Wish Recommendation'
+        verbose_name_plural = 'Wish Recommendations'
+        constraints = [
+            models.UniqueConstraint(fields=['wish', 'focus_area'], name='wish_rec_unique_wish_focus'),
+        ]
+        indexes = [
+            # "Recommended for you": a range scan per focus area, best first
+            models.Index(fields=['focus_area', '-ranked_at', '-id'], name='wish_rec_focus_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.focus_area}: wish {self.wish_id}"
@@ -1,5 +1,7 @@
 from django.db import models
 from django.conf import settings
+from core.storage import document_storage
+from core.validators import DOCUMENT_TYPES, UploadValidator
 from partners.models import Partner
 
 class WisherProfile(models.Model):
@@ -31,6 +33,8 @@ class WisherProfile(models.Model):
     )
     id_document = models.FileField(
         upload_to='id_documents/',
+        storage=document_storage,
+        validators=[UploadValidator(DOCUMENT_TYPES)],
         null=True,
         blank=True,
         help_text='Upload a government-issued ID for verification'
@@ -41,6 +45,10 @@ class WisherProfile(models.Model):
     class Meta:
         verbose_name = 'Wisher Profile'
         verbose_name_plural = 'Wisher Profiles'
+        indexes = [
+            # Admin date_hierarchy
+            models.Index(fields=['created_at'], name='wisher_profile_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.email}'s Wisher Profile"
@@ -48,4 +56,4 @@ class WisherProfile(models.Model):
     @property
     def is_verified(self):
         """Check if wisher is verified by a partner"""
-        return self.verified_by is not None
+        return self.verified_by_id is not None
@@ -0,0 +1,19 @@
+from .feed import FeedPage, InvalidCursor, aget_wish_feed, get_wish_feed
+from .recommendations import aget_recommended_wishes, get_recommended_wishes, rebuild_recommendations
+from .search import SearchPage, asearch_wishes, search_wishes
+from .stats import aggregate_status_counts, get_status_counts
+
+__all__ = [
+    'FeedPage',
+    'InvalidCursor',
+    'get_wish_feed',
+    'aget_wish_feed',
+    'get_recommended_wishes',
+    'aget_recommended_wishes',
+    'rebuild_recommendations',
+    'SearchPage',
+    'search_wishes',
+    'asearch_wishes',
+    'aggregate_status_counts',
+    'get_status_counts',
+]
@@ -0,0 +1,44 @@
+import re
+
+from wishes.models.wish import Wish
+
+# Words that place a wish in a category when the wisher did not pick one
+CATEGORY_KEYWORDS = {
+    'children': {'child', 'children', 'kid', 'kids', 'baby', 'daughter', 'son', 'orphan', 'orphans', 'toys'},
+    'education': {'school', 'book', 'books', 'laptop', 'tuition', 'uniform', 'student', 'study', 'exam',
+                  'lessons', 'calculator', 'library', 'teacher', 'university', 'college'},
+    'food': {'food', 'meal', 'meals', 'groceries', 'stove', 'seeds', 'farm', 'garden', 'water', 'kitchen'},
+    'health': {'medicine', 'medical', 'clinic', 'wheelchair', 'glasses', 'hearing', 'crutches', 'health',
+               'surgery', 'doctor', 'hospital', 'therapy'},
+    'shelter': {'shelter', 'rent', 'roof', 'house', 'housing', 'blanket', 'blankets', 'tent', 'bed', 'home'},
+}
+
+
+def guess_category(*texts):
+    """Return the category whose keywords appear most in ``texts``, or ''."""
+    words = re.findall(r'\w+', ' '.join(text or '' for text in texts).lower())
+    hits = {
+        category: sum(word in keywords for word in words)
+        for category, keywords in CATEGORY_KEYWORDS.items()
+    }
+    best = max(hits, key=hits.get)
+    return best if hits[best] else ''
+
+
+def categorize_wishes(batch_size=2_000, queryset=None):
+    """Fill in the category of uncategorized wishes from their text; returns the count changed."""
+    queryset = (queryset if queryset is not None else Wish.objects.all()).filter(category='')
+    changed = 0
+    last_id = 0
+    while True:
+        wishes = list(queryset.filter(pk__gt=last_id).order_by('pk').only('id', 'title', 'description')[:batch_size])
+        if not wishes:
+            return changed
+        last_id = wishes[-1].pk
+        guessed = []
+        for wish in wishes:
+            wish.category = guess_category(wish.title, wish.description)
+            if wish.category:
+                guessed.append(wish)
+        Wish.objects.bulk_update(guessed, ['category'])
+        changed += len(guessed)
@@ -0,0 +1,123 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from core.cache import get_or_compute, versioned_key
+from wishes.models.wish import Wish
+
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+# The first page is cached until a wish changes; author names and
+# avatars can lag by this much
+FIRST_PAGE_TIMEOUT = 60
+
+
+class InvalidCursor(ValueError):
+    """Raised when a feed cursor cannot be decoded."""
+
+
+class FeedPage:
+    """One page of the wish feed plus the cursor for the page after it."""
+
+    def __init__(self, wishes, next_cursor=None):
+        self.wishes = wishes
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.wishes)
+
+    def __len__(self):
+        return len(self.wishes)
+
+
+def encode_cursor(obj, field='created_at'):
+    """Encode the (created_at, id) position of a wish (or any row) as an opaque cursor."""
+    raw = f"{getattr(obj, field).isoformat()}|{obj.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return the (created_at, id) tuple stored in a cursor."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        created_at, pk = raw.rsplit('|', 1)
+        created_at = parse_datetime(created_at)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor(cursor)
+    if not isinstance(created_at, datetime):
+        raise InvalidCursor(cursor)
+    return created_at, pk
+
+
+def clamp_page_size(value, default=DEFAULT_PAGE_SIZE):
+    """Parse a user supplied page size, keeping it within MAX_PAGE_SIZE."""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(value, MAX_PAGE_SIZE))
+
+
+def filter_wishes(queryset, status=None):
+    """Apply the feed's status filter in SQL."""
+    valid_statuses = {choice for choice, _ in Wish.STATUS_CHOICES}
+    if status in valid_statuses:
+        queryset = queryset.filter(status=status)
+    return queryset
+
+
+def feed_queryset(status=None, cursor=None, queryset=None):
+    """The feed query for one page, before the limit is applied."""
+    if queryset is None:
+        queryset = Wish.objects.for_cards()
+    queryset = filter_wishes(queryset, status=status)
+
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+        )
+    return queryset.order_by('-created_at', '-id')
+
+
+def feed_page(wishes, limit):
+    """Build a FeedPage from up to ``limit + 1`` rows."""
+    if len(wishes) > limit:
+        wishes = wishes[:limit]
+        return FeedPage(wishes, next_cursor=encode_cursor(wishes[-1]))
+    return FeedPage(wishes)
+
+
+def get_wish_feed(status=None, cursor=None, limit=DEFAULT_PAGE_SIZE, queryset=None):
+    """
+    Return a FeedPage of wishes ordered newest first.
+
+    Pagination is keyset based: the cursor carries the (created_at, id) of the
+    last wish on the previous page, so every page costs one indexed range scan
+    no matter how deep the donor has scrolled. The first page of the plain
+    feed, which every visit to the donate page opens with, is cached in the
+    'wishes' namespace.
+    """
+    def load():
+        # Fetch one extra row to learn whether another page exists.
+        return feed_page(list(feed_queryset(status, cursor, queryset)[:limit + 1]), limit)
+
+    if cursor or queryset is not None:
+        return load()
+    status = status if status in {choice for choice, _ in Wish.STATUS_CHOICES} else ''
+    return get_or_compute(versioned_key('feed', ('wishes',), status, limit), load, FIRST_PAGE_TIMEOUT)
+
+
+async def aget_wish_feed(status=None, cursor=None, limit=DEFAULT_PAGE_SIZE, queryset=None):
+    """Async version of ``get_wish_feed``; it always reads the database."""
+    queryset = feed_queryset(status, cursor, queryset)
+    return feed_page([wish async for wish in queryset[:limit + 1]], limit)
@@ -0,0 +1,139 @@
+"""
+The "recommended for you" index: one WishRecommendation row per pending
+wish in its category's focus area.
+
+Rows are written when a wish becomes pending and removed when it leaves
+that status, from the wish_status_changed signal, so reading a donor's
+recommendations is a single range scan of wish_rec_focus_rank_idx with the
+wish cards joined in. Verified wishers rank as if their wish were
+VERIFIED_BOOST newer; when a wisher's verification changes, the
+``partners.refresh_verified_wishers`` job reranks their rows through
+``index_wishers``.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+
+from wishes.models.wish import Wish, WishQuerySet
+from wishes.models.wish_recommendation import WishRecommendation
+from wishes.services.feed import DEFAULT_PAGE_SIZE, FeedPage, decode_cursor, encode_cursor
+
+VERIFIED_BOOST = timedelta(days=7)
+FOCUS_AREAS = {category for category, _ in Wish.CATEGORY_CHOICES}
+
+
+def _rows_for(wishes):
+    return [
+        WishRecommendation(
+            focus_area=wish['category'],
+            wish_id=wish['id'],
+            ranked_at=wish['created_at'] + (VERIFIED_BOOST if wish['verified_by'] else timedelta(0)),
+        )
+        for wish in wishes
+        if wish['category'] in FOCUS_AREAS
+    ]
+
+
+def _indexable(queryset):
+    return queryset.filter(status='pending').values(
+        'id', 'category', 'created_at', verified_by=F('user__wisher_profile__verified_by_id'),
+    )
+
+
+def index_wish(wish_id):
+    """Bring one wish's rows up to date with its status and category."""
+    with transaction.atomic():
+        WishRecommendation.objects.filter(wish_id=wish_id).delete()
+        WishRecommendation.objects.bulk_create(_rows_for(_indexable(Wish.objects.filter(pk=wish_id))))
+
+
+def index_wishers(user_ids):
+    """Rerank the pending wishes of ``user_ids``, e.g. after their verification changed."""
+    wishes = Wish.objects.filter(user_id__in=user_ids)
+    with transaction.atomic():
+        WishRecommendation.objects.filter(wish__in=wishes).delete()
+        return len(WishRecommendation.objects.bulk_create(_rows_for(_indexable(wishes))))
+
+
+def apply_status_change(wish_id, old_status, new_status):
+    """Keep the index in step with a wish_status_changed event."""
+    if new_status == 'pending':
+        index_wish(wish_id)
+    elif old_status == 'pending' and new_status is not None:
+        # Deleted wishes take their rows with them through the cascade
+        WishRecommendation.objects.filter(wish_id=wish_id).delete()
+
+
+def rebuild_recommendations(batch_size=5_000):
+    """Recreate the whole index from the wish table; returns the number of rows."""
+    total = 0
+    with transaction.atomic():
+        WishRecommendation.objects.all().delete()
+        last_id = 0
+        while True:
+            wishes = list(_indexable(Wish.objects.filter(pk__gt=last_id)).order_by('pk')[:batch_size])
+            if not wishes:
+                return total
+            last_id = wishes[-1]['id']
+            total += len(WishRecommendation.objects.bulk_create(_rows_for(wishes)))
+
+
+def _focus_profile(user):
+    from partners.models import DonorProfile
+
+    return DonorProfile.objects.filter(user=user).values('giving_focus', 'preferred_categories')
+
+
+def _merge_focus(profile):
+    if not profile:
+        return []
+    return sorted(set(profile['giving_focus'] or []) | set(profile['preferred_categories'] or []))
+
+
+def donor_focus_areas(user):
+    """The focus areas a donor picked, from their giving focus and preferred categories."""
+    return _merge_focus(_focus_profile(user).first())
+
+
+async def adonor_focus_areas(user):
+    """Async version of ``donor_focus_areas``."""
+    return _merge_focus(await _focus_profile(user).afirst())
+
+
+def _recommended_queryset(focus_areas, cursor):
+    queryset = WishRecommendation.objects.filter(focus_area__in=focus_areas).select_related('wish__user').only(
+        'id', 'ranked_at', *(f'wish__{field}' for field in WishQuerySet.CARD_FIELDS),
+    )
+    if cursor:
+        ranked_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(ranked_at__lt=ranked_at) | Q(ranked_at=ranked_at, pk__lt=pk))
+    return queryset.order_by('-ranked_at', '-id')
+
+
+def _recommended_page(rows, limit):
+    next_cursor = encode_cursor(rows[limit - 1], field='ranked_at') if len(rows) > limit else None
+    return FeedPage([row.wish for row in rows[:limit]], next_cursor=next_cursor)
+
+
+def get_recommended_wishes(focus_areas, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Return a FeedPage of pending wishes in ``focus_areas``, best ranked first.
+
+    One query: the index rows joined to their wish and its author. Raises
+    InvalidCursor for a cursor that cannot be decoded.
+    """
+    focus_areas = [area for area in focus_areas or [] if area in FOCUS_AREAS]
+    if not focus_areas:
+        return FeedPage([])
+    queryset = _recommended_queryset(focus_areas, cursor)
+    return _recommended_page(list(queryset[:limit + 1]), limit)
+
+
+async def aget_recommended_wishes(focus_areas, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """Async version of ``get_recommended_wishes``."""
+    focus_areas = [area for area in focus_areas or [] if area in FOCUS_AREAS]
+    if not focus_areas:
+        return FeedPage([])
+    queryset = _recommended_queryset(focus_areas, cursor)
+    return _recommended_page([row async for row in queryset[:limit + 1]], limit)
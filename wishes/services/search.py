@@ -0,0 +1,261 @@
+"""
+Full-text search over wish titles and descriptions.
+
+SQLite uses an external-content FTS5 table kept current by triggers;
+PostgreSQL a generated, weighted ``tsvector`` column with a GIN index.
+Both are maintained by the database itself, so ``save()``, ``bulk_create``
+and ``update()`` are indexed alike. Other backends fall back to
+``icontains`` matching ordered by recency.
+"""
+import re
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+
+from wishes.models.wish import Wish
+
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+# Ranked pagination is offset based; don't let clients page forever
+MAX_PAGE = 50
+MAX_TERMS = 8
+# Only the newest matches are scored; see _ranked_ids
+RANK_WINDOW = 2000
+# Title matches count ten times as much as description matches
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+FTS_TABLE = 'wishes_wish_fts'
+
+SQLITE_INSTALL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description,
+        content='wishes_wish', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON wishes_wish BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON wishes_wish BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF title, description ON wishes_wish BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+SQLITE_UNINSTALL = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_update',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_delete',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_insert',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+SQLITE_TRIGGERS = {f'{FTS_TABLE}_insert', f'{FTS_TABLE}_delete', f'{FTS_TABLE}_update'}
+
+POSTGRES_INSTALL = [
+    """
+    ALTER TABLE wishes_wish ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    'CREATE INDEX IF NOT EXISTS wish_search_vector_idx ON wishes_wish USING GIN (search_vector)',
+]
+POSTGRES_UNINSTALL = [
+    'DROP INDEX IF EXISTS wish_search_vector_idx',
+    'ALTER TABLE wishes_wish DROP COLUMN IF EXISTS search_vector',
+]
+
+
+class SearchPage:
+    """One page of ranked search results."""
+
+    def __init__(self, wishes, page, has_next):
+        self.wishes = wishes
+        self.page = page
+        self.has_next = has_next
+
+    @property
+    def next_page(self):
+        return self.page + 1 if self.has_next else None
+
+    @property
+    def next_cursor(self):
+        # Lets the donate feed page through results like a keyset cursor
+        return str(self.next_page) if self.has_next else None
+
+    def __iter__(self):
+        return iter(self.wishes)
+
+    def __len__(self):
+        return len(self.wishes)
+
+
+def install_search_index(using=None):
+    """Create the search index for the current backend and fill it."""
+    conn = using or connection
+    with conn.cursor() as cursor:
+        if conn.vendor == 'sqlite':
+            for statement in SQLITE_INSTALL:
+                cursor.execute(statement)
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        elif conn.vendor == 'postgresql':
+            for statement in POSTGRES_INSTALL:
+                cursor.execute(statement)
+
+
+def repair_search_index(using=None):
+    """
+    Restore the SQLite triggers if a migration dropped them.
+
+    Django alters SQLite tables by rebuilding them, which silently drops
+    their triggers; the FTS table is then repopulated from wishes_wish.
+    """
+    conn = using or connection
+    if conn.vendor != 'sqlite':
+        return False
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT type, name FROM sqlite_master WHERE name = %s OR (type = 'trigger' AND tbl_name = 'wishes_wish')",
+            [FTS_TABLE],
+        )
+        rows = cursor.fetchall()
+    if (
+        ('table', FTS_TABLE) not in rows
+        or SQLITE_TRIGGERS <= {name for kind, name in rows if kind == 'trigger'}
+    ):
+        return False
+    install_search_index(conn)
+    return True
+
+
+def uninstall_search_index(using=None):
+    conn = using or connection
+    statements = {'sqlite': SQLITE_UNINSTALL, 'postgresql': POSTGRES_UNINSTALL}.get(conn.vendor, [])
+    with conn.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def search_terms(query):
+    """Split free text into at most MAX_TERMS word tokens."""
+    return re.findall(r'\w+', query or '')[:MAX_TERMS]
+
+
+def fts5_match(terms):
+    """Build an FTS5 MATCH expression: every term required, the last as a prefix."""
+    quoted = ['"%s"' % term for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def match_filter(queryset, query):
+    """Restrict ``queryset`` to wishes matching ``query`` (order is left alone)."""
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+    if connection.vendor == 'sqlite':
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [fts5_match(terms)]
+        ))
+    if connection.vendor == 'postgresql':
+        return queryset.alias(search_match=RawSQL(
+            "wishes_wish.search_vector @@ websearch_to_tsquery('english', %s)",
+            [' '.join(terms)],
+            output_field=BooleanField(),
+        )).filter(search_match=True)
+    text = ' '.join(terms)
+    return queryset.filter(Q(title__icontains=text) | Q(description__icontains=text))
+
+
+def _ranked_ids(terms, status, limit, offset):
+    # Score only the newest RANK_WINDOW matches: the scan stops early in id
+    # order, so a term found in half the table costs no more than a rare one.
+    # The window is the same for every page, so pages never overlap.
+    status_sql = 'AND w.status = %s' if status else ''
+    status_params = [status] if status else []
+    if connection.vendor == 'sqlite':
+        sql = f"""
+            SELECT id FROM (
+                SELECT f.rowid AS id, bm25({FTS_TABLE}, %s, %s) AS score
+                FROM {FTS_TABLE} f JOIN wishes_wish w ON w.id = f.rowid
+                WHERE {FTS_TABLE} MATCH %s {status_sql}
+                ORDER BY f.rowid DESC LIMIT %s
+            ) ORDER BY score, id DESC
+            LIMIT %s OFFSET %s
+        """
+        params = [TITLE_WEIGHT, DESCRIPTION_WEIGHT, fts5_match(terms)] + status_params
+    else:
+        sql = f"""
+            SELECT id FROM (
+                SELECT w.id, ts_rank(w.search_vector, q) AS score
+                FROM wishes_wish w, websearch_to_tsquery('english', %s) q
+                WHERE w.search_vector @@ q {status_sql}
+                ORDER BY w.id DESC LIMIT %s
+            ) ranked ORDER BY score DESC, id DESC
+            LIMIT %s OFFSET %s
+        """
+        params = [' '.join(terms)] + status_params
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params + [RANK_WINDOW, limit, offset])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_wishes(query, status=None, page=1, limit=DEFAULT_PAGE_SIZE):
+    """
+    Return a SearchPage of wishes matching ``query``, best match first.
+
+    Ranking covers the newest RANK_WINDOW matches, which keeps very common
+    terms cheap; paging stops at the end of that window. Costs two queries:
+    the ranked ids from the index, then the cards.
+    """
+    valid_statuses = {choice for choice, _ in Wish.STATUS_CHOICES}
+    status = status if status in valid_statuses else None
+    page = min(max(page, 1), MAX_PAGE)
+    limit = min(max(limit, 1), MAX_PAGE_SIZE)
+    terms = search_terms(query)
+    if not terms:
+        return SearchPage([], page, has_next=False)
+
+    offset = (page - 1) * limit
+    if offset >= RANK_WINDOW:
+        return SearchPage([], page, has_next=False)
+    # One row past the page tells whether there is a next one, unless the
+    # window ends first
+    fetch = min(limit + 1, RANK_WINDOW - offset)
+    if connection.vendor in ('sqlite', 'postgresql'):
+        ids = _ranked_ids(terms, status, fetch, offset)
+    else:
+        queryset = match_filter(Wish.objects.all(), query)
+        if status:
+            queryset = queryset.filter(status=status)
+        ids = list(queryset.order_by('-created_at', '-id').values_list('id', flat=True)[offset:offset + fetch])
+
+    has_next = len(ids) > limit
+    ids = ids[:limit]
+    wishes = Wish.objects.for_cards().in_bulk(ids)
+    return SearchPage([wishes[pk] for pk in ids if pk in wishes], page, has_next=has_next and page < MAX_PAGE)
+
+
+async def asearch_wishes(query, status=None, page=1, limit=DEFAULT_PAGE_SIZE):
+    """
+    Async version of ``search_wishes``.
+
+    The ranking query is raw SQL, which has no async API, so the whole
+    search runs on the ORM's worker thread.
+    """
+    return await sync_to_async(search_wishes)(query, status, page, limit)
@@ -0,0 +1,84 @@
+from django.db import IntegrityError
+from django.db.models import Count, F, Q
+
+from wishes.models.wish import Wish
+from wishes.models.wish_counter import WishCounter
+
+STATUSES = [status for status, _ in Wish.STATUS_CHOICES]
+
+
+def _with_total(counts):
+    counts = {status: counts.get(status) or 0 for status in STATUSES}
+    counts['total'] = sum(counts.values())
+    return counts
+
+
+def aggregate_status_counts(queryset=None):
+    """
+    Count wishes per status with a single conditional-aggregation query.
+
+    Returns a dict with one key per status plus 'total'.
+    """
+    if queryset is None:
+        queryset = Wish.objects.all()
+    counts = queryset.aggregate(**{
+        status: Count('id', filter=Q(status=status)) for status in STATUSES
+    })
+    return _with_total(counts)
+
+
+def rebuild_counter(user_id=None):
+    """Recompute a counter row from the wish table and store it."""
+    queryset = Wish.objects.all()
+    if user_id:
+        queryset = queryset.filter(user_id=user_id)
+    counts = aggregate_status_counts(queryset)
+    WishCounter.objects.update_or_create(
+        key=WishCounter.key_for(user_id),
+        defaults={
+            'user_id': user_id,
+            **{status: counts[status] for status in STATUSES},
+        },
+    )
+    return counts
+
+
+def get_status_counts(user=None):
+    """
+    Return wish counts per status for a wisher, or for the whole site.
+
+    Reads the denormalized WishCounter row, so a dashboard pays one indexed
+    lookup. The row is seeded from the wish table the first time it is read.
+    """
+    user_id = getattr(user, 'pk', user)
+    row = WishCounter.objects.filter(
+        key=WishCounter.key_for(user_id)
+    ).values(*STATUSES).first()
+    if row is None:
+        try:
+            return rebuild_counter(user_id)
+        except IntegrityError:
+            # Another request seeded the row first
+            return get_status_counts(user_id)
+    return _with_total(row)
+
+
+def apply_status_change(user_id, old_status, new_status):
+    """
+    Move one wish between statuses in the global and per-wisher counters.
+
+    Pass old_status=None for a new wish and new_status=None for a deleted
+    one. Both rows are updated with one UPDATE; rows that were never seeded
+    are skipped because seeding reads the wish table directly.
+    """
+    changes = {}
+    if old_status in STATUSES:
+        changes[old_status] = F(old_status) - 1
+    if new_status in STATUSES:
+        changes[new_status] = F(new_status) + 1
+    if not changes or old_status == new_status:
+        return
+    keys = [WishCounter.key_for()]
+    if user_id:
+        keys.append(WishCounter.key_for(user_id))
+    WishCounter.objects.filter(key__in=keys).update(**changes)
@@ -0,0 +1,75 @@
+from django.db import connections
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import Signal, receiver
+
+from core.cache import bump_namespace
+from wishes.models.wish import Wish
+from wishes.services import recommendations, stats
+from wishes.services.search import repair_search_index
+
+# Sent whenever a wish is created, deleted or moves between statuses.
+# Arguments: wish_id, user_id, old_status (None on create), new_status
+# (None on delete). Code that changes status with a queryset update()
+# must send it itself.
+wish_status_changed = Signal()
+
+
+@receiver(post_save, sender=Wish)
+def wish_saved(sender, instance, created, **kwargs):
+    if created:
+        old_status = None
+    elif hasattr(instance, '_loaded_status'):
+        old_status = instance._loaded_status
+    else:
+        # Loaded without its status (e.g. via only()), so the previous value
+        # is unknown; rebuild_counter() can resync the counters if needed.
+        old_status = instance.status
+    if old_status != instance.status:
+        wish_status_changed.send(
+            sender=Wish,
+            wish_id=instance.pk,
+            user_id=instance.user_id,
+            old_status=old_status,
+            new_status=instance.status,
+        )
+    else:
+        # Other edits change what public pages show too; status moves
+        # bump through invalidate_wish_pages instead
+        bump_namespace('wishes')
+        if instance.status == 'pending':
+            # The category may have been edited
+            recommendations.index_wish(instance.pk)
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=Wish)
+def wish_deleted(sender, instance, **kwargs):
+    wish_status_changed.send(
+        sender=Wish,
+        wish_id=instance.pk,
+        user_id=instance.user_id,
+        old_status=instance.status,
+        new_status=None,
+    )
+
+
+@receiver(wish_status_changed)
+def update_wish_counters(sender, user_id, old_status, new_status, **kwargs):
+    stats.apply_status_change(user_id, old_status, new_status)
+
+
+@receiver(wish_status_changed)
+def update_recommendations(sender, wish_id, old_status, new_status, **kwargs):
+    recommendations.apply_status_change(wish_id, old_status, new_status)
+
+
+@receiver(wish_status_changed)
+def invalidate_wish_pages(sender, **kwargs):
+    # Covers queryset update()s, which send no post_save
+    bump_namespace('wishes')
+
+
+@receiver(post_migrate)
+def restore_search_triggers(sender, app_config, using, **kwargs):
+    if app_config.label == 'wishes':
+        repair_search_index(connections[using])
@@ -1,3 +1,214 @@
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
 
-# Create your tests here.
+from core.models import User
+from core.testing import QueryPlanAssertions
+from donations.services.grants import grant_wish
+from partners.models import Partner
+from wishes.forms import WishForm
+from wishes.models import Wish, WisherProfile, WishRecommendation
+from wishes.services.recommendations import get_recommended_wishes, rebuild_recommendations
+from wishes.services.search import FTS_TABLE, repair_search_index, search_wishes
+from wishes.services.stats import aggregate_status_counts, get_status_counts
+
+
+class WishStatsTests(TestCase):
+    def setUp(self):
+        self.wisher = User.objects.create_user(
+            email='wisher@example.com', password='pass', first_name='Ada', country='NG'
+        )
+        self.other = User.objects.create_user(
+            email='other@example.com', password='pass', first_name='Bo', country='KE'
+        )
+
+    def create_wish(self, user, status='pending'):
+        return Wish.objects.create(title='Books', description='School books', user=user, status=status)
+
+    def test_counters_follow_creates_status_changes_and_deletes(self):
+        # Seed both counter rows before any wishes exist
+        get_status_counts()
+        get_status_counts(self.wisher)
+
+        wish = self.create_wish(self.wisher)
+        self.create_wish(self.wisher, status='fulfilled')
+        self.create_wish(self.other)
+        wish.status = 'fulfilled'
+        wish.save()
+        self.create_wish(self.wisher).delete()
+
+        self.assertEqual(get_status_counts(self.wisher), aggregate_status_counts(Wish.objects.filter(user=self.wisher)))
+        self.assertEqual(get_status_counts(), aggregate_status_counts())
+        self.assertEqual(get_status_counts(), {'pending': 1, 'fulfilled': 2, 'expired': 0, 'total': 3})
+
+    def test_counter_read_is_a_single_query(self):
+        self.create_wish(self.wisher)
+        get_status_counts(self.wisher)
+        with self.assertNumQueries(1):
+            counts = get_status_counts(self.wisher)
+        self.assertEqual(counts['pending'], 1)
+
+    def test_aggregate_is_a_single_query(self):
+        self.create_wish(self.wisher)
+        self.create_wish(self.wisher, status='expired')
+        with self.assertNumQueries(1):
+            counts = aggregate_status_counts()
+        self.assertEqual(counts, {'pending': 1, 'fulfilled': 0, 'expired': 1, 'total': 2})
+
+
+class WishIndexTests(QueryPlanAssertions, TestCase):
+    """The feed and dashboard queries are answered from the composite indexes."""
+
+    def setUp(self):
+        self.wisher = User.objects.create_user(
+            email='wisher@example.com', password=None, first_name='Ada', country='NG'
+        )
+
+    def test_feed_by_status_uses_status_index(self):
+        queryset = Wish.objects.filter(status='fulfilled').order_by('-created_at', '-id')[:25]
+        self.assertUsesIndex(queryset, 'wish_status_created_idx')
+        self.assertNoSort(queryset)
+
+    def test_pending_feed_uses_an_index_without_sorting(self):
+        queryset = Wish.objects.filter(status='pending').order_by('-created_at', '-id')[:25]
+        self.assertUsesIndex(queryset, 'wish_pending_created_idx', 'wish_status_created_idx')
+        self.assertNoSort(queryset)
+
+    def test_unfiltered_feed_reads_in_index_order(self):
+        queryset = Wish.objects.order_by('-created_at', '-id')[:25]
+        self.assertUsesIndex(queryset, 'wish_created_idx')
+        self.assertNoSort(queryset)
+
+    def test_dashboard_uses_user_index(self):
+        queryset = Wish.objects.filter(user=self.wisher).order_by('-created_at')
+        self.assertUsesIndex(queryset, 'wish_user_created_idx')
+        self.assertNoSort(queryset)
+
+
+class WishSearchTests(TestCase):
+    def setUp(self):
+        self.wisher = User.objects.create_user(
+            email='wisher@example.com', password=None, first_name='Ada', country='NG'
+        )
+
+    def create_wish(self, title, description='', status='pending'):
+        return Wish.objects.create(title=title, description=description, user=self.wisher, status=status)
+
+    def titles(self, query, **kwargs):
+        return [wish.title for wish in search_wishes(query, **kwargs)]
+
+    def test_title_matches_rank_above_description_matches(self):
+        self.create_wish('Winter coat', 'Something warm, maybe books too')
+        self.create_wish('School books', 'Textbooks for the new term')
+        self.create_wish('Bicycle', 'To ride to school')
+        self.assertEqual(self.titles('books'), ['School books', 'Winter coat'])
+
+    def test_every_term_must_match_and_last_is_a_prefix(self):
+        self.create_wish('School books', 'For my daughter')
+        self.create_wish('School uniform')
+        self.assertEqual(self.titles('school boo'), ['School books'])
+        self.assertEqual(self.titles('  '), [])
+
+    def test_index_follows_saves_updates_and_deletes(self):
+        wish = self.create_wish('Laptop', 'For coding classes')
+        wish.title = 'Tablet'
+        wish.save()
+        self.assertEqual(self.titles('laptop'), [])
+        self.assertEqual(self.titles('tablet'), ['Tablet'])
+        Wish.objects.filter(pk=wish.pk).update(description='For drawing classes')
+        self.assertEqual(self.titles('drawing'), ['Tablet'])
+        wish.delete()
+        self.assertEqual(self.titles('tablet'), [])
+
+    def test_status_filter_and_pagination(self):
+        for i in range(5):
+            self.create_wish(f'Football {i}')
+        self.create_wish('Football boots', status='fulfilled')
+        first = search_wishes('football', status='pending', limit=3)
+        second = search_wishes('football', status='pending', page=2, limit=3)
+        self.assertEqual((len(first), first.has_next, first.next_cursor), (3, True, '2'))
+        self.assertEqual((len(second), second.has_next), (2, False))
+        self.assertNotIn('Football boots', [wish.title for wish in list(first) + list(second)])
+
+    def test_pages_stop_at_the_end_of_the_rank_window(self):
+        for i in range(7):
+            self.create_wish(f'Football {i}')
+        with mock.patch('wishes.services.search.RANK_WINDOW', 5):
+            pages = [search_wishes('football', page=page, limit=2) for page in range(1, 5)]
+        self.assertEqual([(len(page), page.has_next) for page in pages],
+                         [(2, True), (2, True), (1, False), (0, False)])
+        titles = [wish.title for page in pages for wish in page]
+        self.assertEqual(len(set(titles)), 5)
+
+    def test_search_is_two_queries(self):
+        self.create_wish('Guitar', 'Music lessons')
+        with self.assertNumQueries(2):
+            wishes = search_wishes('guitar').wishes
+            self.assertEqual(wishes[0].user.first_name, 'Ada')
+
+    def test_accents_are_folded(self):
+        self.create_wish('Café equipment', 'Espresso machine')
+        self.create_wish('Garden tools')
+        self.assertEqual(self.titles('cafe'), ['Café equipment'])
+
+    def test_repair_restores_triggers_dropped_by_a_table_rebuild(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite only')
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TRIGGER {FTS_TABLE}_insert')
+        self.create_wish('Sewing machine')
+        self.assertTrue(repair_search_index())
+        self.assertFalse(repair_search_index())
+        self.assertEqual(self.titles('sewing'), ['Sewing machine'])
+
+
+class WishRecommendationTests(QueryPlanAssertions, TestCase):
+    def setUp(self):
+        self.wisher = User.objects.create_user(email='wisher@example.com', password=None, first_name='Ada',
+                                               country='NG', role='wisher')
+        self.verified = User.objects.create_user(email='verified@example.com', password=None, first_name='Bo',
+                                                 country='KE', role='wisher')
+        partner_user = User.objects.create_user(email='partner@example.com', password=None, country='KE',
+                                                role='partner')
+        WisherProfile.objects.create(
+            user=self.verified,
+            verified_by=Partner.objects.create(user=partner_user, organization_name='Helpers'),
+        )
+
+    def titles(self, *areas, **kwargs):
+        return [wish.title for wish in get_recommended_wishes(areas, **kwargs)]
+
+    def test_index_follows_creates_grants_and_edits(self):
+        Wish.objects.create(title='Glasses', description='Reading', user=self.verified, category='health')
+        medicine = Wish.objects.create(title='Medicine', description='Clinic', user=self.wisher, category='health')
+        books = Wish.objects.create(title='Books', description='School', user=self.wisher, category='education')
+        Wish.objects.create(title='Bicycle', description='Commute', user=self.wisher)
+        # The verified wisher's older wish ranks first
+        self.assertEqual(self.titles('health'), ['Glasses', 'Medicine'])
+        self.assertEqual(self.titles('health', 'education'), ['Glasses', 'Books', 'Medicine'])
+
+        grant_wish(medicine.pk, User.objects.create_user(email='donor@example.com', password=None, country='US'))
+        books.category = 'children'
+        books.save()
+        self.assertEqual(self.titles('health', 'education'), ['Glasses'])
+        self.assertEqual(self.titles('children'), ['Books'])
+
+        self.assertEqual(rebuild_recommendations(), 2)
+        self.assertEqual(WishRecommendation.objects.count(), 2)
+
+    def test_feed_is_one_indexed_query(self):
+        for i in range(5):
+            Wish.objects.create(title=f'Wish {i}', description='Food', user=self.wisher, category='food')
+        with self.assertNumQueries(1):
+            page = get_recommended_wishes(['food'], limit=2)
+            [wish.user.first_name for wish in page]
+        self.assertEqual(self.titles('food', cursor=page.next_cursor, limit=2), ['Wish 2', 'Wish 1'])
+        queryset = WishRecommendation.objects.filter(focus_area='food').order_by('-ranked_at', '-id')
+        self.assertUsesIndex(queryset, 'wish_rec_focus_rank_idx')
+        self.assertNoSort(queryset)
+
+    def test_form_guesses_missing_category(self):
+        form = WishForm(data={'title': 'A wheelchair for my father', 'description': 'He cannot walk'})
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.cleaned_data['category'], 'health')
@@ -1,7 +1,11 @@
 from django.views.generic import TemplateView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from wishes.models.wish import Wish
+from core.middleware.profiling import query_budget
+from wishes.services.stats import get_status_counts
 
+
+@query_budget(6)
 class WishDashboardView(LoginRequiredMixin, TemplateView):
     """View for the wisher's dashboard."""
     template_name = 'wishes/dashboard.html'
@@ -9,12 +13,13 @@ class WishDashboardView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         user = self.request.user
-        wishes = Wish.objects.filter(user=user)
+        wishes = Wish.objects.filter(user=user).for_dashboard()
+        counts = get_status_counts(user)
         
         context.update({
             'wishes': wishes.order_by('-created_at'),
-            'total_wishes': wishes.count(),
-            'pending_wishes': wishes.filter(status='pending').count(),
-            'fulfilled_wishes': wishes.filter(status='fulfilled').count(),
+            'total_wishes': counts['total'],
+            'pending_wishes': counts['pending'],
+            'fulfilled_wishes': counts['fulfilled'],
         })
         return context